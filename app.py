@@ -3,19 +3,30 @@ load_dotenv()
 
 import re
 import os
-from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, session, make_response, g
+from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, session, make_response, g, Response, stream_with_context
 import sqlite3
 import random
 import threading
 import requests
-from urllib.parse import urlparse, quote_plus
-from datetime import datetime
+from difflib import SequenceMatcher
+from urllib.parse import urlparse, quote_plus, parse_qsl, urlencode
+from datetime import datetime, timedelta
 import time
 from flasgger import Swagger, swag_from
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 import json
+import hashlib
+import uuid
+import atexit
+import signal
 import csv
 import io
-from queue import Queue
+import itertools
+from queue import Queue, Empty, Full
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 from contextlib import contextmanager
 
 # Removed unused authentication imports - app is now auth-free
@@ -23,6 +34,11 @@ from contextlib import contextmanager
 # Version
 VERSION = "0.9"
 
+# Upstream base URLs (override to point at a local stand-in such as fake_upstream.py)
+OMDB_BASE_URL = os.getenv('OMDB_BASE_URL', 'http://www.omdbapi.com').rstrip('/')
+YOUTUBE_BASE_URL = os.getenv('YOUTUBE_BASE_URL', 'https://www.youtube.com').rstrip('/')
+YOUTUBE_API_BASE_URL = os.getenv('YOUTUBE_API_BASE_URL', 'https://www.googleapis.com/youtube/v3').rstrip('/')
+
 
 # Database file path - unified logic for Docker and local development
 def get_db_path():
@@ -214,6 +230,122 @@ def migrate_db():
     conn.commit()
     print("✅ Database indexes created for performance")
 
+    # Create negative cache for OMDb lookups that found nothing
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS omdb_miss_cache (
+            title_key TEXT PRIMARY KEY,
+            reason TEXT,
+            missed_at TEXT,
+            expires_at TEXT
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_omdb_miss_expires ON omdb_miss_cache(expires_at)')
+    conn.commit()
+    print("✅ OMDb miss cache table ready")
+
+    # Create shared OMDb result cache keyed by normalized query (title + optional year)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS omdb_result_cache (
+            query_key TEXT PRIMARY KEY,
+            title_key TEXT,
+            year TEXT,
+            info_json TEXT,
+            fetched_at TEXT
+        )
+    ''')
+    cursor.execute("PRAGMA table_info(movie_info_cache)")
+    cache_columns = [col[1] for col in cursor.fetchall()]
+    if "omdb_query_key" not in cache_columns:
+        cursor.execute("ALTER TABLE movie_info_cache ADD COLUMN omdb_query_key TEXT")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_omdb_query_key ON movie_info_cache(omdb_query_key)')
+    conn.commit()
+    print("✅ Shared OMDb result cache table ready")
+
+    # IMDb ID of the resolved film, so refreshes are a single i= lookup
+    if "imdb_id" not in cache_columns:
+        cursor.execute("ALTER TABLE movie_info_cache ADD COLUMN imdb_id TEXT")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_imdb_id ON movie_info_cache(imdb_id)')
+    conn.commit()
+
+    # Durable background task queue (survives restarts)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT,
+            task_group TEXT,
+            priority INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 5,
+            run_after TEXT,
+            leased_by TEXT,
+            lease_until TEXT,
+            last_error TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks(status, priority, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_group ON tasks(task_group)')
+    conn.commit()
+    print("✅ Task queue table ready")
+
+    # Availability history and adaptive re-verification schedule
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS availability_checks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            movie_id INTEGER NOT NULL,
+            checked_at TEXT NOT NULL,
+            available INTEGER,
+            method TEXT,
+            detail TEXT,
+            FOREIGN KEY (movie_id) REFERENCES movies (id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_availability_movie ON availability_checks(movie_id, id)')
+    cursor.execute("PRAGMA table_info(movies)")
+    movie_columns = [column[1] for column in cursor.fetchall()]
+    if "verify_streak" not in movie_columns:
+        cursor.execute("ALTER TABLE movies ADD COLUMN verify_streak INTEGER DEFAULT 0")
+    if "next_verify_at" not in movie_columns:
+        cursor.execute("ALTER TABLE movies ADD COLUMN next_verify_at TEXT")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_movies_next_verify_at ON movies(next_verify_at)')
+    conn.commit()
+    print("✅ Availability history table ready")
+
+    # Ledger of outbound upstream calls (quota accounting)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS upstream_calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            upstream TEXT NOT NULL,
+            endpoint TEXT,
+            status INTEGER,
+            bytes INTEGER,
+            latency_ms REAL,
+            cached INTEGER DEFAULT 0,
+            lane TEXT,
+            called_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_upstream_calls_upstream_time ON upstream_calls(upstream, called_at)')
+    conn.commit()
+    print("✅ Upstream call ledger table ready")
+
+    # Cross-process leases for library-wide jobs (several workers or containers sharing this database)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            job_id TEXT,
+            acquired_at TEXT,
+            heartbeat_at TEXT,
+            expires_at TEXT NOT NULL
+        )
+    ''')
+    conn.commit()
+    print("✅ Job lease table ready")
+
     conn.close()
 
 # Initialize database if it doesn't exist
@@ -340,16 +472,24 @@ def fetch_all_movies(user_id=None):
     return [dict(movie) for movie in movies]
 
 # Add a new movie (global)
-def add_movie(title, url, verified=False, user_id=None, duration=None):
+def add_movie(title, url, verified=False, user_id=None, duration=None, age_restricted=None):
     conn = get_db_connection()
     cur = conn.cursor()
     last_verified = datetime.now().isoformat() if verified else None
     video_id = extract_youtube_video_id(url)
-    cur.execute('INSERT INTO movies (title, url, verified, last_verified, user_id, video_id, duration) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                (title, url, int(verified), last_verified, None, video_id, duration))
+    if age_restricted is None:
+        cur.execute('INSERT INTO movies (title, url, verified, last_verified, user_id, video_id, duration) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (title, url, int(verified), last_verified, None, video_id, duration))
+    else:
+        # Age status already known (e.g. from import probes) - store it in the same write
+        cur.execute('INSERT INTO movies (title, url, verified, last_verified, user_id, video_id, duration, age_restricted, age_checked_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (title, url, int(verified), last_verified, None, video_id, duration,
+                     int(age_restricted), datetime.now().isoformat()))
     conn.commit()
     movie_id = cur.lastrowid
     conn.close()
+    event_bus.publish('library.changed', {'action': 'added', 'movie_id': movie_id, 'title': title, 'url': url})
     return movie_id
 
 # Update a movie
@@ -362,6 +502,7 @@ def update_movie(movie_id, title, url, verified, user_id=None, duration=None):
                  (title, url, int(verified), last_verified, video_id, duration, movie_id))
     conn.commit()
     conn.close()
+    event_bus.publish('library.changed', {'action': 'updated', 'movie_id': movie_id, 'title': title, 'url': url})
 
 # Cache movie information
 def save_movie_info_cache(movie_id, movie_info):
@@ -375,8 +516,9 @@ def save_movie_info_cache(movie_id, movie_info):
         # Insert new cache
         cursor.execute('''
             INSERT INTO movie_info_cache 
-            (movie_id, plot, year, director, actors, genre, runtime, imdb_rating, poster, found_with, cached_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (movie_id, plot, year, director, actors, genre, runtime, imdb_rating, poster, found_with, cached_at,
+             omdb_query_key, imdb_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             movie_id,
             movie_info.get('plot', ''),
@@ -388,7 +530,9 @@ def save_movie_info_cache(movie_id, movie_info):
             movie_info.get('imdb_rating', ''),
             movie_info.get('poster', ''),
             movie_info.get('found_with', ''),
-            datetime.now().isoformat()
+            datetime.now().isoformat(),
+            movie_info.get('omdb_query_key'),
+            movie_info.get('imdb_id') or None
         ))
         conn.commit()
         conn.close()
@@ -399,13 +543,13 @@ def save_movie_info_cache(movie_id, movie_info):
         return False
 
 # Retrieve cached movie information
-def get_movie_info_cache(movie_id, max_age_hours=24):
+def get_movie_info_cache(movie_id, max_age_hours=24, allow_stale=False):
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT plot, year, director, actors, genre, runtime, imdb_rating, poster, found_with, cached_at
+            SELECT plot, year, director, actors, genre, runtime, imdb_rating, poster, found_with, cached_at, imdb_id
             FROM movie_info_cache 
             WHERE movie_id = ?
         ''', (movie_id,))
@@ -420,7 +564,8 @@ def get_movie_info_cache(movie_id, max_age_hours=24):
         cached_at = datetime.fromisoformat(row[9])
         age_hours = (datetime.now() - cached_at).total_seconds() / 3600
         
-        if age_hours > max_age_hours:
+        stale = age_hours > max_age_hours
+        if stale and not allow_stale:
             print(f"🕒 Cache expired for movie ID {movie_id} (age: {age_hours:.1f} hours)")
             return None
             
@@ -436,12 +581,119 @@ def get_movie_info_cache(movie_id, max_age_hours=24):
             'poster': row[7],
             'found_with': row[8],
             'cached_at': row[9],
+            'imdb_id': row[10],
+            'stale': stale,
             'from_cache': True
         }
     except Exception as e:
         print(f"❌ Failed to retrieve cached info: {e}")
         return None
 
+# Negative cache for OMDb misses
+OMDB_MISS_TTL_HOURS = float(os.getenv('OMDB_MISS_TTL_HOURS', '24'))
+
+def normalize_title_key(title):
+    """Normalize a title into a stable cache key (case and whitespace insensitive)"""
+    return re.sub(r'\s+', ' ', (title or '')).strip().lower()
+
+def save_omdb_miss(title, reason, ttl_hours=None):
+    """Remember that an OMDb lookup for this title found nothing"""
+    try:
+        ttl_hours = OMDB_MISS_TTL_HOURS if ttl_hours is None else ttl_hours
+        now = datetime.now()
+        conn = get_db_connection()
+        conn.execute('''
+            INSERT OR REPLACE INTO omdb_miss_cache (title_key, reason, missed_at, expires_at)
+            VALUES (?, ?, ?, ?)
+        ''', (normalize_title_key(title), reason, now.isoformat(), (now + timedelta(hours=ttl_hours)).isoformat()))
+        conn.commit()
+        conn.close()
+        print(f"🚫 Recorded OMDb miss for '{title}' ({reason}, ttl {ttl_hours}h)")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to record OMDb miss: {e}")
+        return False
+
+def get_omdb_miss(title):
+    """Return the recorded miss for this title if it has not expired yet"""
+    try:
+        conn = get_db_connection()
+        row = conn.execute('SELECT reason, missed_at, expires_at FROM omdb_miss_cache WHERE title_key = ?',
+                           (normalize_title_key(title),)).fetchone()
+        conn.close()
+
+        if not row or row[2] <= datetime.now().isoformat():
+            return None
+
+        return {'reason': row[0], 'missed_at': row[1], 'expires_at': row[2]}
+    except Exception as e:
+        print(f"❌ Failed to read OMDb miss cache: {e}")
+        return None
+
+def clear_omdb_miss(*titles):
+    """Forget recorded misses so the next lookup goes back to OMDb"""
+    try:
+        conn = get_db_connection()
+        for title in titles:
+            conn.execute('DELETE FROM omdb_miss_cache WHERE title_key = ?', (normalize_title_key(title),))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"❌ Failed to clear OMDb miss cache: {e}")
+        return False
+
+# Shared OMDb result cache (content-addressed by normalized query)
+OMDB_RESULT_TTL_HOURS = float(os.getenv('OMDB_RESULT_TTL_HOURS', '168'))
+OMDB_INFO_FIELDS = ['plot', 'year', 'director', 'actors', 'genre', 'runtime', 'imdb_rating', 'poster', 'found_with',
+                    'imdb_id']
+
+def omdb_query_key(title, year=None):
+    """Build the shared cache key for an OMDb query: normalized title plus optional year"""
+    return f"{normalize_title_key(title)}|{year or ''}"
+
+def save_omdb_result(query_key, movie_info):
+    """Store a successful OMDb result so other movies with the same query can reuse it"""
+    try:
+        title_key, _, year = query_key.partition('|')
+        info = {field: movie_info.get(field, '') for field in OMDB_INFO_FIELDS}
+        conn = get_db_connection()
+        conn.execute('''
+            INSERT OR REPLACE INTO omdb_result_cache (query_key, title_key, year, info_json, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (query_key, title_key, year, json.dumps(info), datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"❌ Failed to store shared OMDb result: {e}")
+        return False
+
+def get_omdb_result(query_key, fresh_since=None):
+    """Return a shared OMDb result if it is within the TTL (and newer than fresh_since, if given)"""
+    try:
+        conn = get_db_connection()
+        row = conn.execute('SELECT info_json, fetched_at FROM omdb_result_cache WHERE query_key = ?',
+                           (query_key,)).fetchone()
+        conn.close()
+
+        if not row:
+            return None
+
+        fetched_at = datetime.fromisoformat(row[1])
+        if datetime.now() - fetched_at > timedelta(hours=OMDB_RESULT_TTL_HOURS):
+            return None
+        if fresh_since and fetched_at < fresh_since:
+            return None
+
+        info = json.loads(row[0])
+        info['omdb_query_key'] = query_key
+        info['from_shared_cache'] = True
+        return info
+    except Exception as e:
+        print(f"❌ Failed to read shared OMDb result: {e}")
+        return None
+
 # Update age restriction status
 def update_age_restriction_status(movie_id, is_age_restricted):
     """Update the age restriction status for a movie"""
@@ -467,24 +719,1636 @@ def delete_movie(movie_id, user_id=None):
     conn.execute('DELETE FROM movies WHERE id = ?', (movie_id,))
     conn.commit()
     conn.close()
+    event_bus.publish('library.changed', {'action': 'deleted', 'movie_id': movie_id})
+
+# Optional on-disk HTTP response cache beneath all outbound GETs
+class HTTPDiskCache:
+    """
+    Size-bounded on-disk cache of raw upstream responses, keyed by URL.
+    Fresh entries (within ttl_seconds) are served directly; stale entries with an ETag or
+    Last-Modified are revalidated with a conditional request. In replay mode only cached
+    responses are served and misses raise ConnectionError, so parsers can be re-run offline.
+    """
+    SECRET_PARAMS = ('key', 'apikey')
+    CACHEABLE_STATUSES = (200, 404)
+
+    def __init__(self, cache_dir, ttl_seconds=86400, max_bytes=512 * 1024 * 1024, replay_only=False):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.replay_only = replay_only
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_url(self, url, params=None):
+        """Full request URL with API keys stripped, used as the cache key"""
+        prepared = requests.Request('GET', url, params=params).prepare().url
+        parsed = urlparse(prepared)
+        query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k not in self.SECRET_PARAMS]
+        return parsed._replace(query=urlencode(query)).geturl()
+
+    def _paths(self, key_url):
+        digest = hashlib.sha256(key_url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, digest[:2], digest)
+        return base + '.json', base + '.body'
+
+    def _load(self, key_url):
+        meta_path, body_path = self._paths(key_url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            return meta, body
+        except (OSError, ValueError):
+            return None, None
+
+    def _store(self, key_url, response, body):
+        meta_path, body_path = self._paths(key_url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            'url': key_url,
+            'status_code': response.status_code,
+            'headers': {k: v for k, v in response.headers.items()
+                        if k.lower() in ('content-type', 'etag', 'last-modified', 'cache-control')},
+            'stored_at': time.time()
+        }
+        with open(body_path, 'wb') as f:
+            f.write(body)
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(body)
+            if self._total_bytes is None or self._total_bytes > self.max_bytes:
+                self._evict()
+        return meta
+
+    def _touch(self, key_url, meta):
+        meta['stored_at'] = time.time()
+        meta_path, _ = self._paths(key_url)
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+
+    def _evict(self):
+        """Recount the cache size and drop least recently stored entries until it fits in max_bytes (caller holds _lock)"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.body'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # replaced or removed while walking
+                    total += stat.st_size
+                    entries.append((stat.st_mtime, path, stat.st_size))
+        for _, body_path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (body_path, body_path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+        self._total_bytes = total
+
+    @staticmethod
+    def _response(meta, body):
+        response = requests.Response()
+        response.status_code = meta['status_code']
+        response.headers.update(meta['headers'])
+        response.headers['X-Disk-Cache'] = 'HIT'
+        response.url = meta['url']
+        response._content = body
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        key_url = self.cache_url(url, params)
+        meta, body = self._load(key_url)
+
+        if self.replay_only:
+            if meta is None:
+                raise requests.exceptions.ConnectionError(f"Not in replay cache: {key_url}")
+            return self._response(meta, body)
+
+        if meta and time.time() - meta['stored_at'] <= self.ttl_seconds:
+            return self._response(meta, body)
+
+        # Stale or missing: revalidate with validators when we have them
+        request_headers = dict(headers or {})
+        if meta:
+            # Header names are case-insensitive, and entries keep whatever case the upstream sent
+            validators = requests.structures.CaseInsensitiveDict(meta['headers'])
+            if validators.get('ETag'):
+                request_headers['If-None-Match'] = validators['ETag']
+            if validators.get('Last-Modified'):
+                request_headers['If-Modified-Since'] = validators['Last-Modified']
+
+        response = requests.get(url, params=params, headers=request_headers, **kwargs)
+        if response.status_code == 304 and meta:
+            response.close()
+            self._touch(key_url, meta)
+            revalidated = self._response(meta, body)
+            revalidated.headers['X-Disk-Cache'] = 'REVALIDATED'  # served from disk, but the upstream was asked
+            return revalidated
+
+        # Cache definitive answers only: content and "gone" (not auth errors, rate limits or server errors)
+        if response.status_code in self.CACHEABLE_STATUSES:
+            body = response.content
+            return self._response(self._store(key_url, response, body), body)
+        return response
+
+http_disk_cache = None
+if os.getenv('HTTP_CACHE_DIR'):
+    http_disk_cache = HTTPDiskCache(
+        os.getenv('HTTP_CACHE_DIR'),
+        ttl_seconds=float(os.getenv('HTTP_CACHE_TTL', '86400')),
+        max_bytes=int(os.getenv('HTTP_CACHE_MAX_BYTES', str(512 * 1024 * 1024))),
+        replay_only=os.getenv('HTTP_CACHE_MODE', 'normal').lower() == 'replay'
+    )
+    print(f"🗃️ HTTP disk cache enabled at {http_disk_cache.cache_dir}"
+          f"{' (replay only)' if http_disk_cache.replay_only else ''}")
+
+# Persisted ledger of outbound upstream calls, with rolling 24h totals for quota planning
+UPSTREAM_LEDGER_RETENTION_DAYS = int(os.getenv('UPSTREAM_LEDGER_RETENTION_DAYS', '7'))
+OMDB_DAILY_LIMIT = int(os.getenv('OMDB_DAILY_LIMIT', '1000'))
+OMDB_INTERACTIVE_RESERVE = int(os.getenv('OMDB_INTERACTIVE_RESERVE', '100'))
+OMDB_CALLS_PER_TITLE_REFRESH = 3  # search + detail fetch, plus a variant now and then
+OMDB_QUERY_ENDPOINTS = {'i': 'id', 's': 'search', 't': 'title'}
+
+def classify_upstream_call(url, params=None):
+    """Map a request URL onto (upstream, endpoint) without keeping query strings (they may hold API keys)"""
+    parsed = urlparse(url)
+    if url.startswith(OMDB_BASE_URL):
+        query = dict(parse_qsl(parsed.query), **(params or {}))
+        return 'omdb', next((name for key, name in OMDB_QUERY_ENDPOINTS.items() if key in query), 'other')
+    if url.startswith(YOUTUBE_API_BASE_URL):
+        return 'youtube_api', url[len(YOUTUBE_API_BASE_URL):].split('?')[0] or '/'
+    if url.startswith(YOUTUBE_BASE_URL) or 'youtube.com' in parsed.netloc or 'youtu.be' in parsed.netloc:
+        return 'youtube', '/' + parsed.path.strip('/').split('/')[0]
+    return parsed.netloc, parsed.path or '/'
+
+class UpstreamLedger:
+    """Records every outbound call (upstream, endpoint, status, bytes, latency) in the upstream_calls table"""
+    WINDOW = timedelta(hours=24)
+
+    def __init__(self, retention_days=7):
+        self.retention_days = retention_days
+        self._recorded = 0
+
+    def track(self, url, call, params=None, stream=False):
+        """Run `call` (which performs the request), record the outcome and return the response"""
+        started = time.monotonic()
+        try:
+            response = call()
+        except requests.exceptions.RequestException:
+            self.record(url, None, None, started, params)
+            raise
+        nbytes = None
+        cache_state = response.headers.get('X-Disk-Cache')
+        try:
+            nbytes = int(response.headers.get('Content-Length')) if stream else len(response.content)
+        except (TypeError, ValueError):
+            pass
+        self.record(url, response.status_code, nbytes, started, params, cached=cache_state == 'HIT')
+        return response
+
+    def record(self, url, status, nbytes, started, params=None, cached=False):
+        upstream, endpoint = classify_upstream_call(url, params)
+        now = datetime.now()
+        try:
+            conn = get_db_connection()
+            try:
+                conn.execute('INSERT INTO upstream_calls (upstream, endpoint, status, bytes, latency_ms, cached, lane, called_at) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                             (upstream, endpoint, status, nbytes, round((time.monotonic() - started) * 1000, 1),
+                              int(cached), lane_name(current_priority()), now.isoformat()))
+                self._recorded += 1
+                if self._recorded % 1000 == 1:
+                    cutoff = (now - timedelta(days=self.retention_days)).isoformat()
+                    conn.execute('DELETE FROM upstream_calls WHERE called_at < ?', (cutoff,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not record upstream call to {upstream}: {e}")
+
+    def used(self, upstream):
+        """Calls that reached the upstream in the last 24 hours (disk cache hits don't count)"""
+        since = (datetime.now() - self.WINDOW).isoformat()
+        conn = get_db_connection()
+        try:
+            return conn.execute('SELECT COUNT(*) FROM upstream_calls WHERE upstream = ? AND called_at >= ? AND cached = 0',
+                                (upstream, since)).fetchone()[0]
+        finally:
+            conn.close()
+
+    def seconds_until_free(self, upstream, limit, calls_needed=1):
+        """Seconds until the rolling window has room for calls_needed more calls under limit (0 if it has now)"""
+        since = datetime.now() - self.WINDOW
+        conn = get_db_connection()
+        try:
+            rows = conn.execute('SELECT called_at FROM upstream_calls WHERE upstream = ? AND called_at >= ? AND cached = 0 '
+                                'ORDER BY called_at', (upstream, since.isoformat())).fetchall()
+        finally:
+            conn.close()
+        excess = len(rows) + calls_needed - limit
+        if excess <= 0:
+            return 0
+        if excess > len(rows):
+            return None  # needs more than a whole window; cannot be satisfied
+        expires = datetime.fromisoformat(rows[excess - 1][0]) + self.WINDOW
+        return max(1.0, (expires - datetime.now()).total_seconds())
+
+    def totals(self, hours=24, by_endpoint=False):
+        """Per-upstream totals over the last `hours`: calls, cached, errors, bytes and average latency"""
+        since = (datetime.now() - timedelta(hours=hours)).isoformat()
+        group = 'upstream, endpoint' if by_endpoint else 'upstream'
+        conn = get_db_connection()
+        try:
+            rows = conn.execute(f'''
+                SELECT {group}, COUNT(*) AS calls, SUM(cached) AS cached,
+                       SUM(CASE WHEN status IS NULL OR status >= 400 THEN 1 ELSE 0 END) AS errors,
+                       SUM(bytes) AS bytes, ROUND(AVG(CASE WHEN cached = 0 THEN latency_ms END), 1) AS avg_latency_ms
+                FROM upstream_calls WHERE called_at >= ? GROUP BY {group} ORDER BY {group}
+            ''', (since,)).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
 
-# Fetch movie information from OMDb API (IMDb data)
-def fetch_movie_info(title, timeout=10):
+    def daily(self, days=None):
+        """Calls per calendar day and upstream over the retention period"""
+        since = (datetime.now() - timedelta(days=days or self.retention_days)).date().isoformat()
+        conn = get_db_connection()
+        try:
+            rows = conn.execute('''
+                SELECT substr(called_at, 1, 10) AS day, upstream, COUNT(*) - SUM(cached) AS calls, SUM(cached) AS cached
+                FROM upstream_calls WHERE called_at >= ? GROUP BY day, upstream ORDER BY day, upstream
+            ''', (since,)).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+upstream_ledger = UpstreamLedger(UPSTREAM_LEDGER_RETENTION_DAYS)
+
+def omdb_budget():
+    """Rolling-window OMDb usage against OMDB_DAILY_LIMIT; bulk work stops OMDB_INTERACTIVE_RESERVE calls short"""
+    used = upstream_ledger.used('omdb')
+    bulk_limit = max(0, OMDB_DAILY_LIMIT - OMDB_INTERACTIVE_RESERVE)
+    return {'limit': OMDB_DAILY_LIMIT, 'interactive_reserve': OMDB_INTERACTIVE_RESERVE, 'used_24h': used,
+            'remaining': max(0, OMDB_DAILY_LIMIT - used), 'bulk_remaining': max(0, bulk_limit - used)}
+
+def omdb_bulk_wait(calls_needed):
+    """Seconds background work must wait before spending calls_needed OMDb calls (0 = go ahead)"""
+    wait = upstream_ledger.seconds_until_free('omdb', max(0, OMDB_DAILY_LIMIT - OMDB_INTERACTIVE_RESERVE), calls_needed)
+    return upstream_ledger.WINDOW.total_seconds() if wait is None else wait
+
+def http_get(url, **kwargs):
+    """Outbound GET used by all upstream calls; goes through the disk cache when enabled and is recorded in the ledger"""
+    fetch = http_disk_cache.get if http_disk_cache else requests.get
+    return upstream_ledger.track(url, lambda: fetch(url, **kwargs), kwargs.get('params'), kwargs.get('stream', False))
+
+# Priority lanes for upstream work: interactive (user requests, add/edit), prefetch, bulk (library-wide jobs)
+PRIORITY_INTERACTIVE = 10
+PRIORITY_PREFETCH = 5
+PRIORITY_BULK = 0
+
+upstream_lane = threading.local()
+
+def current_priority():
+    """Lane of the work running on this thread; request threads default to interactive"""
+    return getattr(upstream_lane, 'priority', PRIORITY_INTERACTIVE)
+
+def lane_name(priority):
+    if priority >= PRIORITY_INTERACTIVE:
+        return 'interactive'
+    return 'prefetch' if priority > PRIORITY_BULK else 'bulk'
+
+@contextmanager
+def priority_lane(priority):
+    previous = getattr(upstream_lane, 'priority', None)
+    upstream_lane.priority = priority
+    try:
+        yield
+    finally:
+        if previous is None:
+            del upstream_lane.priority
+        else:
+            upstream_lane.priority = previous
+
+def in_lane(priority, target):
+    """Wrap a job or executor target so its upstream calls run in the given lane"""
+    def run(*args, **kwargs):
+        with priority_lane(priority):
+            return target(*args, **kwargs)
+    return run
+
+def submit_in_lane(executor, fn, *args, **kwargs):
+    """executor.submit that carries the caller's lane over to the worker thread"""
+    return executor.submit(in_lane(current_priority(), fn), *args, **kwargs)
+
+class PriorityLimiter:
+    """
+    Concurrency limit for one upstream. A freed slot goes to the highest-priority waiter (oldest first
+    within a lane), and bulk work may hold at most bulk_limit slots so interactive calls never queue
+    behind a library-wide job.
+    """
+    def __init__(self, name, limit, bulk_limit=None):
+        self.name = name
+        self.limit = max(1, limit)
+        self.bulk_limit = max(1, min(self.limit, self.limit - 1 if bulk_limit is None else bulk_limit))
+        self.in_use = 0
+        self.bulk_in_use = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def _eligible(self, entry):
+        return self.in_use < self.limit and (-entry[0] > PRIORITY_BULK or self.bulk_in_use < self.bulk_limit)
+
+    def _next_waiter(self):
+        return next((entry for entry in sorted(self._waiters) if self._eligible(entry)), None)
+
+    @contextmanager
+    def slot(self, priority=None):
+        priority = current_priority() if priority is None else priority
+        bulk = priority <= PRIORITY_BULK
+        entry = (-priority, next(self._sequence))
+        with self._cond:
+            self._waiters.append(entry)
+            while self._next_waiter() != entry:
+                self._cond.wait()
+            self._waiters.remove(entry)
+            self.in_use += 1
+            self.bulk_in_use += bulk
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_use -= 1
+                self.bulk_in_use -= bulk
+                self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            waiting = {}
+            for negative_priority, _ in self._waiters:
+                lane = lane_name(-negative_priority)
+                waiting[lane] = waiting.get(lane, 0) + 1
+            return {'limit': self.limit, 'bulk_limit': self.bulk_limit, 'in_use': self.in_use,
+                    'bulk_in_use': self.bulk_in_use, 'waiting': waiting}
+
+YOUTUBE_MAX_CONCURRENCY = int(os.getenv('YOUTUBE_MAX_CONCURRENCY', '4'))
+youtube_limiter = PriorityLimiter('youtube', YOUTUBE_MAX_CONCURRENCY,
+                                  int(os.getenv('YOUTUBE_BULK_MAX_CONCURRENCY', str(max(1, YOUTUBE_MAX_CONCURRENCY - 1)))))
+
+# In-process event bus behind the /api/events Server-Sent Events stream
+EVENTS_HISTORY_SIZE = int(os.getenv('EVENTS_HISTORY_SIZE', '500'))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+EVENTS_QUEUE_SIZE = 1000
+JOB_PROGRESS_EVENT_INTERVAL = 0.5
+
+class EventBus:
+    """Fan-out of events to SSE subscribers, with a short history so reconnecting clients can catch up"""
+    def __init__(self, history_size=500):
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, data):
+        with self._lock:
+            event = {'id': self._next_id, 'type': event_type, 'data': data, 'time': datetime.now().isoformat()}
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except Full:
+                pass  # A slow client misses events; it can resync from the REST endpoints
+        return event
+
+    def subscribe(self, last_event_id=None):
+        """Register a subscriber queue, pre-filled with history newer than last_event_id"""
+        subscriber = Queue(maxsize=EVENTS_QUEUE_SIZE)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id:
+                        subscriber.put_nowait(event)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stats(self):
+        with self._lock:
+            return {'subscribers': len(self._subscribers), 'last_event_id': self._next_id - 1}
+
+event_bus = EventBus(EVENTS_HISTORY_SIZE)
+
+# Bounded background job executor with a job registry
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_HISTORY_SIZE = int(os.getenv('JOB_HISTORY_SIZE', '200'))
+JOB_DRAIN_TIMEOUT = float(os.getenv('JOB_DRAIN_TIMEOUT', '30'))
+
+class JobSkipped(Exception):
+    """Raised by a job target that decided not to run (e.g. another process holds its lease)"""
+
+class Job:
+    """A tracked background job: status, progress counters and timings"""
+    def __init__(self, name, meta=None, key=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.key = key
+        self.meta = meta or {}
+        self.status = 'queued'
+        self.total = None
+        self.done = 0
+        self.failed = 0
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.stop_requested = threading.Event()
+        self.rerun_requested = False
+        self.future = None
+        self._lock = threading.Lock()
+        self._last_progress_event = 0.0
+
+    def set_total(self, total):
+        with self._lock:
+            self.total = total
+
+    def advance(self, ok=True):
+        """Count one finished unit of work; progress events are throttled"""
+        with self._lock:
+            self.done += 1
+            if not ok:
+                self.failed += 1
+            now = time.monotonic()
+            publish = self.done == self.total or now - self._last_progress_event >= JOB_PROGRESS_EVENT_INTERVAL
+            if publish:
+                self._last_progress_event = now
+        if publish:
+            self.publish('job.progress')
+
+    def publish(self, event_type):
+        event_bus.publish(event_type, self.to_dict())
+
+    def should_stop(self):
+        """Long jobs check this between units so shutdown never interrupts a write"""
+        return self.stop_requested.is_set()
+
+    def to_dict(self):
+        with self._lock:
+            finished = self.finished_at or datetime.now()
+            return {
+                'id': self.id,
+                'name': self.name,
+                'key': self.key,
+                'status': self.status,
+                'total': self.total,
+                'done': self.done,
+                'failed': self.failed,
+                'error': self.error,
+                'meta': self.meta,
+                'created_at': self.created_at.isoformat(),
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+                'queued_seconds': round(((self.started_at or finished) - self.created_at).total_seconds(), 3),
+                'run_seconds': round((finished - self.started_at).total_seconds(), 3) if self.started_at else None
+            }
+
+class JobRegistry:
+    """
+    Runs background jobs on a shared bounded pool and keeps recent jobs for the status API.
+    pools: {name: workers} for dedicated executors, so jobs that must not queue behind
+    long-running ones (e.g. the interactive task drain) get threads of their own.
+    """
+    def __init__(self, max_workers=4, history_size=200, pools=None):
+        self.max_workers = max_workers
+        self.history_size = history_size
+        self.accepting = True
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self.pools = dict(pools or {})
+        self._pools = {name: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'job-{name}')
+                       for name, workers in self.pools.items()}
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name, target, **meta):
+        """Queue target(job) and return the Job; raises RuntimeError once shutdown has begun"""
+        return self.single_flight(None, name, target, **meta)[0]
+
+    def single_flight(self, key, name, target, rerun=False, pool=None, **meta):
+        """
+        Like submit, but while a job with the same key is queued or running, return that job instead
+        of starting another one. With rerun=True the running job runs its target once more when it
+        finishes, so work queued after its last check is not missed. `pool` names a dedicated
+        executor to run on instead of the shared one. Returns: (job, started)
+        """
+        with self._lock:
+            if not self.accepting:
+                raise RuntimeError('Server is shutting down; job not accepted')
+            active = self._active.get(key) if key else None
+            if active and not active.finished_at:
+                active.rerun_requested = active.rerun_requested or rerun
+                return active, False
+            job = Job(name, meta, key)
+            self._jobs[job.id] = job
+            if key:
+                self._active[key] = job
+            self._prune()
+            job.publish('job.queued')
+            job.future = (self._pools[pool] if pool else self._executor).submit(self._run, job, target)
+        return job, True
+
+    def _run(self, job, target):
+        if job.should_stop():
+            job.status, job.finished_at = 'cancelled', datetime.now()
+            job.publish('job.finished')
+            return
+        job.status, job.started_at = 'running', datetime.now()
+        job.publish('job.started')
+        try:
+            while True:
+                target(job)
+                with self._lock:
+                    if not job.rerun_requested or job.should_stop():
+                        job.status = 'cancelled' if job.should_stop() else 'succeeded'
+                        job.finished_at = datetime.now()
+                        break
+                    job.rerun_requested = False
+        except JobSkipped as e:
+            job.status, job.error = 'skipped', str(e)
+            print(f"⏭️ Job {job.name} ({job.id}) skipped: {e}")
+        except Exception as e:
+            job.status, job.error = 'failed', str(e)
+            print(f"❌ Job {job.name} ({job.id}) failed: {e}")
+        finally:
+            job.finished_at = job.finished_at or datetime.now()
+            job.publish('job.finished')
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at]
+        for job_id in finished[:max(0, len(self._jobs) - self.history_size)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self, key):
+        """The queued or running job for a single-flight key, else None"""
+        with self._lock:
+            job = self._active.get(key)
+            return job if job and not job.finished_at else None
+
+    def list(self, status=None):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs) if not status or job.status == status]
+
+    def wait(self, job_id, timeout=None):
+        """Block until a job finishes (used by tests and shutdown); returns the Job or None"""
+        job = self.get(job_id)
+        if job and job.future:
+            wait([job.future], timeout=timeout)
+        return job
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {'workers': self.max_workers, 'accepting': self.accepting, 'by_status': counts,
+                'pools': self.pools}
+
+    def shutdown(self, timeout=None):
+        """Stop accepting jobs, cancel queued ones and give running ones time to finish their current unit"""
+        timeout = JOB_DRAIN_TIMEOUT if timeout is None else timeout
+        with self._lock:
+            if not self.accepting:
+                return
+            self.accepting = False
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.stop_requested.set()
+        running = [job.future for job in jobs if job.future and not job.future.done()]
+        if running:
+            print(f"⏳ Draining {len(running)} background job(s) (up to {timeout:.0f}s)")
+        _, still_running = wait(running, timeout=timeout)
+        if still_running:
+            print(f"⚠️ {len(still_running)} background job(s) still running at shutdown")
+        for executor in [self._executor, *self._pools.values()]:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for job in jobs:
+            if job.future and job.future.cancelled():
+                job.status, job.finished_at = 'cancelled', datetime.now()
+
+job_registry = JobRegistry(JOB_WORKERS, JOB_HISTORY_SIZE, pools={'interactive': 1})
+atexit.register(job_registry.shutdown)
+
+# Cross-process leases: library-wide jobs run in at most one process sharing the database
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '60'))
+
+class JobLeases:
+    """
+    Named leases in the job_leases table. A holder renews its lease with heartbeats; a lease whose
+    holder stopped heartbeating (crash, kill -9) expires after lease_seconds and can be taken over.
+    """
+    def __init__(self, lease_seconds=60):
+        self.lease_seconds = lease_seconds
+        node = os.uname().nodename if hasattr(os, 'uname') else 'local'
+        # Containers all run as PID 1, so the owner ID also carries a per-process random part
+        self.owner = f"{node}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._held = set()
+        self._lock = threading.Lock()
+
+    def acquire(self, name, job_id=None):
+        """Take the lease unless another live holder (process or thread) has it; returns True on success"""
+        with self._lock:
+            if name in self._held:
+                return False
+            now = datetime.now()
+            conn = get_db_connection()
+            conn.isolation_level = None
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                row = conn.execute('SELECT owner, expires_at FROM job_leases WHERE name = ?', (name,)).fetchone()
+                if row and row['owner'] != self.owner and row['expires_at'] > now.isoformat():
+                    conn.execute('COMMIT')
+                    return False
+                if row and row['owner'] != self.owner:
+                    print(f"🔓 Taking over expired lease '{name}' from {row['owner']}")
+                conn.execute('INSERT OR REPLACE INTO job_leases (name, owner, job_id, acquired_at, heartbeat_at, expires_at) '
+                             'VALUES (?, ?, ?, ?, ?, ?)',
+                             (name, self.owner, job_id, now.isoformat(), now.isoformat(),
+                              (now + timedelta(seconds=self.lease_seconds)).isoformat()))
+                conn.execute('COMMIT')
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                raise
+            finally:
+                conn.close()
+            self._held.add(name)
+            return True
+
+    def heartbeat(self, name):
+        """Extend a held lease; False means it expired and was taken over, so the work must stop"""
+        now = datetime.now()
+        conn = get_db_connection()
+        try:
+            updated = conn.execute('UPDATE job_leases SET heartbeat_at = ?, expires_at = ? WHERE name = ? AND owner = ?',
+                                   (now.isoformat(), (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+                                    name, self.owner)).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        if not updated:
+            with self._lock:
+                self._held.discard(name)
+        return bool(updated)
+
+    def release(self, name):
+        with self._lock:
+            self._held.discard(name)
+        conn = get_db_connection()
+        try:
+            conn.execute('DELETE FROM job_leases WHERE name = ? AND owner = ?', (name, self.owner))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def held_elsewhere(self, name):
+        """The live lease row when another process holds `name`, else None"""
+        conn = get_db_connection()
+        try:
+            row = conn.execute('SELECT * FROM job_leases WHERE name = ? AND owner != ? AND expires_at > ?',
+                               (name, self.owner, datetime.now().isoformat())).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def list(self):
+        now = datetime.now().isoformat()
+        conn = get_db_connection()
+        try:
+            rows = conn.execute('SELECT * FROM job_leases ORDER BY name').fetchall()
+        finally:
+            conn.close()
+        return [dict(row, mine=row['owner'] == self.owner, expired=row['expires_at'] <= now) for row in rows]
+
+job_leases = JobLeases(JOB_LEASE_SECONDS)
+
+def keep_lease_alive(name, job, stopped):
+    """
+    Heartbeat a job's lease until the job ends; losing the lease asks the job to stop.
+    A failed heartbeat (e.g. "database is locked") is retried on the next beat, but once the
+    lease may have expired without a successful renewal the job is stopped as well.
+    """
+    renewed_at = time.monotonic()
+    while not stopped.wait(job_leases.lease_seconds / 3):
+        try:
+            if not job_leases.heartbeat(name):
+                print(f"⚠️ Lost lease '{name}'; stopping job {job.id}")
+                job.stop_requested.set()
+                return
+            renewed_at = time.monotonic()
+        except sqlite3.Error as e:
+            if time.monotonic() - renewed_at >= job_leases.lease_seconds:
+                print(f"⚠️ Could not renew lease '{name}' before it expired ({e}); stopping job {job.id}")
+                job.stop_requested.set()
+                return
+            print(f"⚠️ Heartbeat for lease '{name}' failed ({e}); retrying")
+
+def run_exclusively(lease_name, target):
+    """Wrap a job target so it only runs while this process holds the named lease"""
+    def run(job):
+        if not job_leases.acquire(lease_name, job.id):
+            holder = job_leases.held_elsewhere(lease_name)
+            raise JobSkipped(f"{lease_name} is running in {holder['owner'] if holder else 'another worker'}")
+        stopped = threading.Event()
+        threading.Thread(target=keep_lease_alive, args=(lease_name, job, stopped), daemon=True).start()
+        try:
+            target(job)
+        finally:
+            stopped.set()
+            job_leases.release(lease_name)
+    return run
+
+def running_elsewhere_response(lease_name, what):
+    """Response for a library-wide request whose job holds its lease in another process, else None"""
+    holder = job_leases.held_elsewhere(lease_name)
+    if not holder:
+        return None
+    return jsonify({'success': True, 'job_id': None, 'attached': True, 'running_in': holder['owner'],
+                    'message': f"{what} is already running in another worker ({holder['owner']})"})
+
+# Durable SQLite-backed task queue with leases, retries and dead-lettering
+TASK_WORKERS = int(os.getenv('TASK_WORKERS', '2'))
+TASK_LEASE_SECONDS = int(os.getenv('TASK_LEASE_SECONDS', '120'))
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', '5'))
+TASK_RETRY_BASE_SECONDS = float(os.getenv('TASK_RETRY_BASE_SECONDS', '30'))
+TASK_PRIORITY_INTERACTIVE = PRIORITY_INTERACTIVE
+TASK_PRIORITY_PREFETCH = PRIORITY_PREFETCH
+TASK_PRIORITY_BULK = PRIORITY_BULK
+
+class TaskRetry(Exception):
+    """
+    Raised by a task handler for transient failures (rate limits, timeouts) that should be retried.
+    payload: what the retry should run with, when steps that already succeeded must not run again.
+    """
+    def __init__(self, message, payload=None):
+        super().__init__(message)
+        self.payload = payload
+
+class TaskDefer(Exception):
+    """Raised by a task handler that cannot run yet (e.g. quota exhausted); rescheduled without using an attempt"""
+    def __init__(self, message, seconds):
+        super().__init__(message)
+        self.seconds = seconds
+
+class TaskQueue:
+    """Persistent queue in the tasks table. Leased tasks whose lease expires (e.g. after a crash) are picked up again."""
+    def __init__(self, lease_seconds=120, max_attempts=5, retry_base_seconds=30):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.worker_id = f"{os.uname().nodename if hasattr(os, 'uname') else 'local'}:{os.getpid()}"
+        self.bulk_paused_until = 0.0
+
+    def pause_bulk(self, seconds):
+        """Hold back bulk and prefetch tasks (e.g. after an upstream rate limit); interactive tasks still run"""
+        self.bulk_paused_until = max(self.bulk_paused_until, time.monotonic() + seconds)
+        print(f"⏸️ Bulk tasks paused for {seconds:.0f}s")
+
+    def bulk_paused_for(self):
+        return max(0.0, self.bulk_paused_until - time.monotonic())
+
+    def enqueue(self, kind, payload, group=None, priority=TASK_PRIORITY_BULK, max_attempts=None):
+        return self.enqueue_many(kind, [payload], group, priority, max_attempts)[0]
+
+    def enqueue_many(self, kind, payloads, group=None, priority=TASK_PRIORITY_BULK, max_attempts=None):
+        """Insert tasks in one transaction; returns their IDs"""
+        now = datetime.now().isoformat()
+        conn = get_db_connection()
+        try:
+            ids = [conn.execute(
+                'INSERT INTO tasks (kind, payload, task_group, priority, status, max_attempts, run_after, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (kind, json.dumps(payload), group, priority, 'pending', max_attempts or self.max_attempts, now, now, now)
+            ).lastrowid for payload in payloads]
+            conn.commit()
+            return ids
+        finally:
+            conn.close()
+
+    def lease(self, min_priority=TASK_PRIORITY_BULK):
+        """Claim the next runnable task (highest priority, oldest first) at or above min_priority; returns a dict or None"""
+        now = datetime.now()
+        conn = get_db_connection()
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            if self.bulk_paused_for():
+                min_priority = max(min_priority, TASK_PRIORITY_INTERACTIVE)
+            row = conn.execute('''
+                SELECT * FROM tasks
+                WHERE ((status = 'pending' AND run_after <= ?) OR (status = 'leased' AND lease_until < ?))
+                  AND priority >= ?
+                ORDER BY priority DESC, id
+                LIMIT 1
+            ''', (now.isoformat(), now.isoformat(), min_priority)).fetchone()
+            if not row:
+                conn.execute('COMMIT')
+                return None
+            lease_until = (now + timedelta(seconds=self.lease_seconds)).isoformat()
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, leased_by = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                (self.worker_id, lease_until, now.isoformat(), row['id'])
+            )
+            conn.execute('COMMIT')
+            task = dict(row)
+            task['attempts'] += 1
+            task['payload'] = json.loads(task['payload'] or '{}')
+            return task
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def complete(self, task_id):
+        self._update(task_id, "status = 'done', leased_by = NULL, lease_until = NULL, last_error = NULL")
+
+    def fail(self, task, error, payload=None):
+        """Schedule a retry with exponential backoff (with a new payload, if given), or dead-letter the task once attempts run out"""
+        if payload is not None:
+            self._update(task['id'], "payload = ?", json.dumps(payload))
+        if task['attempts'] >= task['max_attempts']:
+            print(f"☠️ Task {task['id']} ({task['kind']}) dead-lettered after {task['attempts']} attempts: {error}")
+            self._update(task['id'], "status = 'dead', leased_by = NULL, lease_until = NULL, last_error = ?", str(error))
+            event_bus.publish('task.dead', {'task_id': task['id'], 'kind': task['kind'], 'group': task['task_group'],
+                                            'attempts': task['attempts'], 'error': str(error)})
+            return
+        delay = min(self.retry_base_seconds * 2 ** (task['attempts'] - 1), 3600)
+        run_after = (datetime.now() + timedelta(seconds=delay)).isoformat()
+        self._update(task['id'], "status = 'pending', leased_by = NULL, lease_until = NULL, last_error = ?, run_after = ?",
+                     str(error), run_after)
+
+    def defer(self, task, seconds, reason):
+        """Put a leased task back without counting the attempt, runnable again after `seconds`"""
+        run_after = (datetime.now() + timedelta(seconds=seconds)).isoformat()
+        self._update(task['id'], "status = 'pending', attempts = attempts - 1, leased_by = NULL, lease_until = NULL, "
+                     "last_error = ?, run_after = ?", str(reason), run_after)
+
+    def retry_dead(self, task_id=None):
+        """Move dead-lettered tasks (all, or one) back to pending; returns how many were revived"""
+        conn = get_db_connection()
+        try:
+            sql = "UPDATE tasks SET status = 'pending', attempts = 0, run_after = ?, updated_at = ? WHERE status = 'dead'"
+            now = datetime.now().isoformat()
+            params = [now, now]
+            if task_id is not None:
+                sql += ' AND id = ?'
+                params.append(task_id)
+            count = conn.execute(sql, params).rowcount
+            conn.commit()
+            return count
+        finally:
+            conn.close()
+
+    def _update(self, task_id, assignments, *params):
+        conn = get_db_connection()
+        try:
+            conn.execute(f'UPDATE tasks SET {assignments}, updated_at = ? WHERE id = ?',
+                         (*params, datetime.now().isoformat(), task_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def counts(self, group=None):
+        """Task counts by status (optionally for one group)"""
+        conn = get_db_connection()
+        try:
+            sql = 'SELECT status, COUNT(*) FROM tasks'
+            params = ()
+            if group:
+                sql += ' WHERE task_group = ?'
+                params = (group,)
+            return {status: count for status, count in conn.execute(sql + ' GROUP BY status', params).fetchall()}
+        finally:
+            conn.close()
+
+    def active_group(self, kind):
+        """Group of the oldest unfinished task of this kind, if any"""
+        conn = get_db_connection()
+        try:
+            row = conn.execute("SELECT task_group FROM tasks WHERE kind = ? AND status IN ('pending', 'leased') "
+                               "ORDER BY id LIMIT 1", (kind,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def next_due_in(self):
+        """Seconds until a waiting task becomes runnable (backoff, bulk pause or lease expiry); None if nothing waits"""
+        conn = get_db_connection()
+        try:
+            row = conn.execute("SELECT MIN(CASE WHEN status = 'pending' THEN run_after ELSE lease_until END) "
+                               "FROM tasks WHERE status IN ('pending', 'leased')").fetchone()
+        finally:
+            conn.close()
+        if not row or not row[0]:
+            return None
+        due = max(0.0, (datetime.fromisoformat(row[0]) - datetime.now()).total_seconds())
+        return max(due, self.bulk_paused_for())
+
+    def has_pending(self):
+        conn = get_db_connection()
+        try:
+            return conn.execute("SELECT 1 FROM tasks WHERE status IN ('pending', 'leased') LIMIT 1").fetchone() is not None
+        finally:
+            conn.close()
+
+    def dead_letters(self, limit=50):
+        conn = get_db_connection()
+        try:
+            rows = conn.execute("SELECT id, kind, payload, task_group, attempts, last_error, updated_at FROM tasks "
+                                "WHERE status = 'dead' ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+            return [dict(row, payload=json.loads(row['payload'] or '{}')) for row in rows]
+        finally:
+            conn.close()
+
+task_queue = TaskQueue(TASK_LEASE_SECONDS, TASK_MAX_ATTEMPTS, TASK_RETRY_BASE_SECONDS)
+
+def run_task(task):
+    """Dispatch one leased task to its handler and record the outcome"""
+    handler = TASK_HANDLERS.get(task['kind'])
+    try:
+        if not handler:
+            raise ValueError(f"No handler for task kind '{task['kind']}'")
+        with priority_lane(task['priority']):
+            handler(task['payload'])
+        task_queue.complete(task['id'])
+        return True
+    except TaskDefer as e:
+        task_queue.defer(task, e.seconds, e)
+        return True
+    except Exception as e:
+        print(f"❌ Task {task['id']} ({task['kind']}) attempt {task['attempts']} failed: {e}")
+        task_queue.fail(task, e, getattr(e, 'payload', None))
+        return False
+
+task_wakeup = {'timer': None, 'at': None}
+task_wakeup_lock = threading.Lock()
+
+def schedule_task_wakeup(delay):
+    """Kick the drain workers again after `delay` seconds (earliest request wins)"""
+    due_at = time.monotonic() + delay
+    with task_wakeup_lock:
+        if task_wakeup['at'] and task_wakeup['at'] <= due_at and task_wakeup['timer'].is_alive():
+            return
+        if task_wakeup['timer']:
+            task_wakeup['timer'].cancel()
+        timer = threading.Timer(delay, lambda: job_registry.accepting and kick_task_queue())
+        timer.daemon = True
+        task_wakeup.update(timer=timer, at=due_at)
+        timer.start()
+
+def drain_tasks(job=None, min_priority=TASK_PRIORITY_BULK):
+    """Run leased tasks until none are runnable (or shutdown is requested)"""
+    processed = 0
+    while not (job and job.should_stop()):
+        task = task_queue.lease(min_priority)
+        if not task:
+            # Tasks waiting on backoff, a bulk pause or an expired lease get a timed wake-up
+            due = task_queue.next_due_in()
+            if due is not None:
+                schedule_task_wakeup(max(due, 1.0))
+            break
+        ok = run_task(task)
+        processed += 1
+        if job:
+            job.advance(ok)
+    return processed
+
+def kick_task_queue(priority=TASK_PRIORITY_BULK):
+    """
+    Make sure TASK_WORKERS drain jobs are running; returns the job that will pick up work of `priority`.
+    Interactive work also gets its own drain job on a dedicated executor, so it never waits for the
+    shared workers to finish their current bulk tasks, nor for hours-long library jobs to free a thread.
+    """
+    jobs = [job_registry.single_flight(f'tasks:drain:{i}', 'drain_tasks', drain_tasks, rerun=True)[0]
+            for i in range(TASK_WORKERS)]
+    if priority >= TASK_PRIORITY_INTERACTIVE:
+        return job_registry.single_flight('tasks:drain:interactive', 'drain_tasks',
+                                          lambda job: drain_tasks(job, TASK_PRIORITY_INTERACTIVE),
+                                          rerun=True, pool='interactive')[0]
+    return jobs[0]
+
+def enqueue_task(kind, payload, group=None, priority=TASK_PRIORITY_INTERACTIVE):
+    """Persist a task and start draining; returns (task_id, drain job)"""
+    task_id = task_queue.enqueue(kind, payload, group, priority)
+    return task_id, kick_task_queue(priority)
+
+def resume_tasks():
+    """On boot, pick up tasks left pending (or with expired leases) by a previous run"""
+    if task_queue.has_pending():
+        counts = task_queue.counts()
+        print(f"🔁 Resuming {counts.get('pending', 0)} pending task(s) ({counts.get('leased', 0)} leased before restart)")
+        kick_task_queue()
+
+OMDB_BULK_DELAY = float(os.getenv('OMDB_BULK_DELAY', '0.1'))
+OMDB_RATE_LIMIT_PAUSE = float(os.getenv('OMDB_RATE_LIMIT_PAUSE', '60'))
+
+def is_transient_failure(message):
+    """True when a failed OMDb lookup should be retried later rather than accepted as 'not found'"""
+    return getattr(message, 'transient', False)
+
+def publish_movie_enriched(movie_id, title, step, success, info=None):
+    """Tell event subscribers that a background enrichment step for a movie finished"""
+    event = {'movie_id': movie_id, 'title': title, 'step': step, 'success': bool(success)}
+    if step == 'info' and success and isinstance(info, dict):
+        event['info'] = {field: info.get(field) for field in OMDB_INFO_FIELDS}
+    event_bus.publish('movie.enriched', event)
+
+def enrich_movie_task(payload):
+    """Fetch OMDb info for a movie and optionally re-verify its URL and age restriction"""
+    movie_id, title, url = payload['movie_id'], payload['title'], payload['url']
+    conn = get_db_connection()
+    exists = conn.execute('SELECT 1 FROM movies WHERE id = ?', (movie_id,)).fetchone()
+    conn.close()
+    if not exists:
+        print(f"⏭️ Movie {movie_id} was deleted; skipping enrichment")
+        return
+
+    # Clear existing cache if the title changed (since we'll search with the new title)
+    if payload.get('previous_title'):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM movie_info_cache WHERE movie_id = ?', (movie_id,))
+        conn.commit()
+        conn.close()
+        clear_omdb_miss(payload['previous_title'], title)
+        print(f"🗑️ Cleared cache for movie {movie_id} due to title change")
+
+    print(f"🎬 Fetching OMDb info for: {title}")
+    success, info = fetch_movie_info(title, duration=payload.get('duration'))
+    retry_info = not success and is_transient_failure(info)
+    if success and isinstance(info, dict):
+        save_movie_info_cache(movie_id, info)
+        print(f"✅ Cached OMDb info for: {title}")
+    elif retry_info:
+        print(f"⏳ OMDb lookup for {title} failed transiently; will retry after the URL checks")
+    else:
+        print(f"❌ Failed to fetch OMDb info for: {title}")
+    if not retry_info:
+        publish_movie_enriched(movie_id, title, 'info', success, info)
+
+    if payload.get('verify'):
+        is_valid, message = validate_url(url)
+        conn = get_db_connection()
+        movie = conn.execute('SELECT * FROM movies WHERE id = ?', (movie_id,)).fetchone()
+        if movie:
+            record_availability_check(conn, movie, None if availability_unknown(message) else is_valid, 'probe', message)
+            conn.commit()
+        conn.close()
+        if is_valid:
+            print(f"✅ URL re-verified for: {title}")
+        else:
+            print(f"❌ URL verification failed for: {title} - {message}")
+        publish_movie_enriched(movie_id, title, 'verified', is_valid)
+
+    if payload.get('check_age'):
+        is_age_restricted, message = check_age_restriction(url)
+        conn = get_db_connection()
+        conn.execute('UPDATE movies SET age_restricted = ?, age_checked_at = ? WHERE id = ?',
+                     (int(is_age_restricted), datetime.now().isoformat(), movie_id))
+        conn.commit()
+        conn.close()
+        print(f"{'🔞' if is_age_restricted else '👍'} Age restriction check for {title}: {message}")
+        event_bus.publish('movie.enriched', {'movie_id': movie_id, 'title': title, 'step': 'age_check',
+                                             'success': True, 'age_restricted': is_age_restricted})
+
+    # The URL checks above never wait on OMDb; a retry only repeats the OMDb lookup
+    if retry_info:
+        raise TaskRetry(f"OMDb lookup for '{title}' failed transiently",
+                        payload=dict(payload, verify=False, check_age=False, previous_title=None))
+
+def refresh_movie_info_task(payload):
+    """Refresh one movie's cached OMDb info in place (library-wide refresh or stale revalidation)"""
+    movie_id, title, imdb_id = payload['movie_id'], payload['title'], payload.get('imdb_id')
+    fresh_since = datetime.fromisoformat(payload['fresh_since'])
+
+    # Already replaced in this run (e.g. the process stopped before the task was marked done)
+    conn = get_db_connection()
+    row = conn.execute('SELECT cached_at FROM movie_info_cache WHERE movie_id = ?', (movie_id,)).fetchone()
+    conn.close()
+    if row and row[0] and datetime.fromisoformat(row[0]) >= fresh_since:
+        return
+
+    # Background refreshes stay inside the daily OMDb budget and resume as the rolling window frees up
+    if current_priority() < PRIORITY_INTERACTIVE:
+        wait = omdb_bulk_wait(1 if imdb_id else OMDB_CALLS_PER_TITLE_REFRESH)
+        if wait:
+            task_queue.pause_bulk(wait)
+            raise TaskDefer(f"OMDb budget used up; refresh of '{title}' resumes in {wait / 3600:.1f}h", wait)
+
+    time.sleep(OMDB_BULK_DELAY)
+    if imdb_id:
+        # Films sharing an IMDb ID are fetched once per refresh run
+        id_key = omdb_query_key(f"imdb:{imdb_id}")
+        info = get_omdb_result(id_key, fresh_since)
+        success = bool(info)
+        if not success:
+            success, info = fetch_movie_info_by_id(imdb_id)
+            if success:
+                save_omdb_result(id_key, info)
+        if success and payload.get('query_key'):
+            info = dict(info, omdb_query_key=payload['query_key'])
+            save_omdb_result(payload['query_key'], info)
+    else:
+        # Results fetched earlier in this run are shared; older ones are refetched
+        success, info = fetch_movie_info(title, fresh_since=fresh_since, duration=payload.get('duration'))
+
+    if success and isinstance(info, dict):
+        save_movie_info_cache(movie_id, info)
+        print(f"✅ Cached info for: {title}")
+        publish_movie_enriched(movie_id, title, 'info', True, info)
+    elif is_transient_failure(info):
+        # Back the whole bulk lane off instead of letting every queued refresh hit the limit too
+        task_queue.pause_bulk(OMDB_RATE_LIMIT_PAUSE)
+        raise TaskRetry(f"OMDb lookup for '{title}' failed transiently; keeping the cached entry")
+    else:
+        print(f"❌ Failed to fetch info for: {title}; keeping the cached entry")
+
+def revalidate_movie_info(movie_id, title, duration=None):
+    """Queue a background refresh for one expired cache entry unless one is already queued"""
+    group = f"revalidate:{movie_id}"
+    queued = task_queue.counts(group)
+    if queued.get('pending') or queued.get('leased'):
+        return False
+    conn = get_db_connection()
+    row = conn.execute('SELECT imdb_id, omdb_query_key FROM movie_info_cache WHERE movie_id = ?', (movie_id,)).fetchone()
+    conn.close()
+    # A kind of its own, so a pending revalidation is never mistaken for a library-wide refresh run
+    enqueue_task('revalidate_movie_info', {
+        'movie_id': movie_id, 'title': title, 'duration': duration,
+        'imdb_id': row[0] if row else None, 'query_key': row[1] if row else None,
+        'fresh_since': datetime.now().isoformat()
+    }, group=group, priority=TASK_PRIORITY_PREFETCH)
+    return True
+
+TASK_HANDLERS = {
+    'enrich_movie': enrich_movie_task,
+    'refresh_movie_info': refresh_movie_info_task,
+    'revalidate_movie_info': refresh_movie_info_task,
+}
+
+def is_definitive_omdb_miss(search_attempts):
+    """True when every attempt got a real "not found" answer (no rate limits, timeouts or server errors)"""
+    if not search_attempts:
+        return False
+    for attempt in search_attempts:
+        error = attempt.get('error') or ''
+        if attempt.get('status_code') != 200 or not error:
+            return False
+        if any(word in error.lower() for word in ['limit', 'too many', 'invalid']):
+            return False
+    return True
+
+# OMDb query derivation from YouTube-style titles
+TITLE_YEAR_PATTERN = re.compile(r'[\(\[]?\b(19[0-9]{2}|20[0-9]{2})\b[\)\]]?')
+TITLE_NOISE_PATTERNS = [
+    re.compile(r'\s*[|•].*$'),  # "Title | Channel Name"
+    re.compile(r'\[[^\]]*\]'),  # [HD], [Eng Sub]
+    re.compile(r'\((?:[^)]*\b(?:full|hd|4k|trailer|sub|dub|movie|film|remastered|version)\b[^)]*)\)', re.IGNORECASE),
+    re.compile(r'\b(?:full\s+(?:movie|film)|official\s+(?:trailer|video)|trailer|free\s+movie|watch\s+online|'
+               r'english\s+sub(?:title)?s?|eng\s+subs?|with\s+subtitles|hd|uhd|4k|1080p|720p|480p|remastered)\b',
+               re.IGNORECASE),
+]
+OMDB_MIN_TITLE_SCORE = 0.6
+
+def parse_title_hints(title):
+    """
+    Split a YouTube-style title into an OMDb query and a release year hint.
+    "The Matrix (1999) Full Movie HD" -> ("The Matrix", "1999")
+    """
+    cleaned = title or ''
+    for pattern in TITLE_NOISE_PATTERNS:
+        cleaned = pattern.sub(' ', cleaned)
+
+    year = None
+    year_matches = list(TITLE_YEAR_PATTERN.finditer(cleaned))
+    # Keep titles that are only a year ("1917") and years that start the title ("2001: A Space Odyssey")
+    if year_matches and year_matches[-1].start() > 0:
+        match = year_matches[-1]
+        year = match.group(1)
+        cleaned = cleaned[:match.start()] + ' ' + cleaned[match.end():]
+
+    cleaned = re.sub(r'\s+', ' ', cleaned).strip(' -:–—,')
+    return (cleaned or (title or '').strip()), year
+
+def duration_to_seconds(duration):
+    """Parse "H:MM:SS" / "M:SS" durations; None when unknown"""
+    if not duration or not re.fullmatch(r'\d+(?::\d{1,2}){1,2}', str(duration)):
+        return None
+    seconds = 0
+    for part in str(duration).split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+def score_omdb_candidate(candidate, query, year=None, duration_seconds=None):
+    """Score an OMDb candidate against the query title, year hint and video duration (higher is better)"""
+    score = SequenceMatcher(None, normalize_title_key(query), normalize_title_key(candidate.get('Title'))).ratio()
+
+    candidate_year = (candidate.get('Year') or '')[:4]
+    if year and candidate_year.isdigit():
+        gap = abs(int(candidate_year) - int(year))
+        score += 0.3 if gap == 0 else 0.1 if gap == 1 else -0.2
+
+    runtime = re.match(r'(\d+)\s*min', candidate.get('Runtime') or '')
+    if duration_seconds and runtime:
+        runtime_seconds = int(runtime.group(1)) * 60
+        drift = abs(runtime_seconds - duration_seconds) / runtime_seconds
+        score += 0.3 if drift <= 0.15 else -0.3 if drift > 0.5 else 0
+    return score
+
+def omdb_info_from_data(data, found_with):
+    """Map an OMDb detail response onto the movie info fields"""
+    return {
+        'plot': data.get('Plot', 'No plot available'),
+        'year': data.get('Year', 'Unknown'),
+        'director': data.get('Director', 'Unknown'),
+        'actors': data.get('Actors', 'Unknown'),
+        'genre': data.get('Genre', 'Unknown'),
+        'runtime': data.get('Runtime', 'Unknown'),
+        'imdb_rating': data.get('imdbRating', 'N/A'),
+        'poster': data.get('Poster', ''),
+        'imdb_id': data.get('imdbID', ''),
+        'found_with': found_with
+    }
+
+# Fetch movie information, reusing shared results and remembered misses before calling OMDb
+def fetch_movie_info(title, timeout=10, use_miss_cache=True, year=None, fresh_since=None, duration=None):
+    search_title, hinted_year = parse_title_hints(title)
+    year = year or hinted_year
+    query_key = omdb_query_key(search_title, year)
+    shared_info = get_omdb_result(query_key, fresh_since)
+    if shared_info:
+        print(f"💾 Using shared OMDb result for '{title}'")
+        return True, shared_info
+
+    if use_miss_cache:
+        miss = get_omdb_miss(title)
+        if miss:
+            print(f"🚫 Skipping OMDb lookup for '{title}' - cached miss until {miss['expires_at']}")
+            return False, f"Movie not found (cached miss: {miss['reason']}, retry after {miss['expires_at']})"
+
+    success, info = query_omdb(title, timeout, year, duration)
+    if success and isinstance(info, dict):
+        save_omdb_result(query_key, info)
+        info['omdb_query_key'] = query_key
+    return success, info
+
+# Concurrent OMDb title-variant probing
+OMDB_MAX_CONCURRENCY = int(os.getenv('OMDB_MAX_CONCURRENCY', '4'))
+omdb_limiter = PriorityLimiter('omdb', OMDB_MAX_CONCURRENCY,
+                               int(os.getenv('OMDB_BULK_MAX_CONCURRENCY', str(max(1, OMDB_MAX_CONCURRENCY - 1)))))
+# More threads than slots: queued probes wait inside the limiter, where lanes are ordered, not in FIFO executor order
+omdb_executor = ThreadPoolExecutor(max_workers=OMDB_MAX_CONCURRENCY * 4, thread_name_prefix='omdb')
+OMDB_VARIANT_STAGGER = float(os.getenv('OMDB_VARIANT_STAGGER', '0.5'))
+
+class VariantCutoff:
+    """Shared by the concurrent probes of one lookup: variants ranked below a decisive answer are not sent"""
+    def __init__(self, count):
+        self.rank = count
+        self._lock = threading.Lock()
+
+    def decided(self, rank):
+        with self._lock:
+            self.rank = min(self.rank, rank)
+
+    def outranked(self, rank):
+        with self._lock:
+            return rank > self.rank
+
+def omdb_title_attempt(search_title, attempt_number, api_key, year_param='', timeout=10, cutoff=None, rank=0):
+    """
+    Run one OMDb t= lookup. Concurrent calls share OMDB_MAX_CONCURRENCY slots, higher lanes first.
+    With a cutoff, the variant is only sent if no higher-ranked variant has answered decisively by the
+    time it gets its slot; a decisive answer is recorded before the slot is released.
+    Returns: (attempt_info, (success, info or error) for a decisive answer, else None)
+    """
+    with omdb_limiter.slot():
+        if cutoff and cutoff.outranked(rank):
+            return {'attempt_number': attempt_number, 'search_term': search_title, 'url': '', 'status_code': None,
+                    'response_headers': {}, 'response_data': {}, 'error': 'Skipped: a higher-ranked variant answered'}, None
+        attempt_info, outcome = omdb_title_request(search_title, attempt_number, api_key, year_param, timeout)
+        if outcome and cutoff:
+            cutoff.decided(rank)
+        return attempt_info, outcome
+
+def omdb_title_request(search_title, attempt_number, api_key, year_param='', timeout=10):
+    """Send one OMDb t= lookup (the caller holds an OMDb slot); same return value as omdb_title_attempt"""
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    attempt_info = {
+        'attempt_number': attempt_number,
+        'search_term': search_title,
+        'url': '',
+        'status_code': None,
+        'response_headers': {},
+        'response_data': {},
+        'error': None
+    }
+
+    if api_key:
+        api_url = f"{OMDB_BASE_URL}/?t={search_title}&type=movie{year_param}&apikey={api_key}"
+    else:
+        api_url = f"{OMDB_BASE_URL}/?t={search_title}&type=movie{year_param}"
+
+    attempt_info['url'] = redacted_omdb_url(api_url)
+    print(f"🌐 API Call #{attempt_number}: {attempt_info['url']}")
+
+    try:
+        response = http_get(api_url, headers=headers, timeout=timeout)
+        attempt_info['status_code'] = response.status_code
+        attempt_info['response_headers'] = dict(response.headers)
+
+        print(f"📡 Response Status: {response.status_code}")
+        print(f"📋 Response Headers: {dict(response.headers)}")
+
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                attempt_info['response_data'] = data
+                print(f"📝 Response Data: {data}")
+
+                if data.get('Response') == 'True':
+                    print(f"✅ Found movie with search term: '{search_title}'")
+                    return attempt_info, (True, {
+                        'plot': data.get('Plot', 'No plot available'),
+                        'year': data.get('Year', 'Unknown'),
+                        'director': data.get('Director', 'Unknown'),
+                        'actors': data.get('Actors', 'Unknown'),
+                        'genre': data.get('Genre', 'Unknown'),
+                        'runtime': data.get('Runtime', 'Unknown'),
+                        'imdb_rating': data.get('imdbRating', 'N/A'),
+                        'poster': data.get('Poster', ''),
+                        'imdb_id': data.get('imdbID', ''),
+                        'found_with': search_title
+                    })
+                else:
+                    error_msg = data.get('Error', 'Unknown error')
+                    attempt_info['error'] = error_msg
+                    print(f"❌ Search #{attempt_number} failed: {error_msg}")
+
+                    # Check for specific error types
+                    if 'Invalid API key' in error_msg:
+                        return attempt_info, (False, "Invalid API key. Please check your OMDB_API_KEY environment variable.")
+                    elif 'Request limit reached' in error_msg:
+                        print("🚫 Rate limit reached!")
+                        attempt_info['error'] = f"Rate limit reached: {error_msg}"
+                    elif 'Too many requests' in error_msg:
+                        print("🚫 Too many requests!")
+                        attempt_info['error'] = f"Too many requests: {error_msg}"
+
+            except ValueError as json_error:
+                attempt_info['error'] = f"Invalid JSON response: {json_error}"
+                attempt_info['response_data'] = response.text[:500]  # First 500 chars
+                print(f"❌ Invalid JSON response: {json_error}")
+                print(f"📄 Raw response: {response.text[:200]}")
+
+        elif response.status_code == 401:
+            attempt_info['error'] = "Unauthorized - Invalid API key"
+            print(f"🔐 Unauthorized (401) - Invalid API key")
+            # If we get 401, try without API key as fallback
+            if api_key:
+                print(f"🔄 Trying without API key as fallback...")
+                fallback_url = f"{OMDB_BASE_URL}/?t={search_title}&type=movie{year_param}"
+                try:
+                    fallback_response = http_get(fallback_url, headers=headers, timeout=timeout)
+                    if fallback_response.status_code == 200:
+                        fallback_data = fallback_response.json()
+                        if fallback_data.get('Response') == 'True':
+                            print(f"✅ Found movie with fallback (no API key): '{search_title}'")
+                            return attempt_info, (True, {
+                                'plot': fallback_data.get('Plot', 'No plot available'),
+                                'year': fallback_data.get('Year', 'Unknown'),
+                                'director': fallback_data.get('Director', 'Unknown'),
+                                'actors': fallback_data.get('Actors', 'Unknown'),
+                                'genre': fallback_data.get('Genre', 'Unknown'),
+                                'runtime': fallback_data.get('Runtime', 'Unknown'),
+                                'imdb_rating': fallback_data.get('imdbRating', 'N/A'),
+                                'poster': fallback_data.get('Poster', ''),
+                                'imdb_id': fallback_data.get('imdbID', ''),
+                                'found_with': f"{search_title} (fallback)",
+                                'note': 'Found using free tier after API key failed'
+                            })
+                except Exception as fallback_error:
+                    print(f"❌ Fallback also failed: {fallback_error}")
+        elif response.status_code == 429:
+            attempt_info['error'] = "Rate limited (429)"
+            print(f"🚫 Rate limited (429)")
+        elif response.status_code >= 500:
+            attempt_info['error'] = f"Server error ({response.status_code})"
+            print(f"💥 Server error ({response.status_code})")
+        else:
+            attempt_info['error'] = f"HTTP {response.status_code}: {response.text[:200]}"
+            print(f"❌ HTTP Error {response.status_code}: {response.text[:200]}")
+
+    except requests.exceptions.RequestException as req_error:
+        attempt_info['error'] = f"Request exception: {req_error}"
+        print(f"🔌 Request error: {req_error}")
+
+    return attempt_info, None
+
+def fetch_movie_info_by_id(imdb_id, timeout=10):
+    """Refetch metadata for an already resolved film with a single i= lookup"""
+    attempt_info, data = omdb_call({'i': imdb_id}, 1, os.getenv('OMDB_API_KEY'), timeout)
+    if data and data.get('Response') == 'True':
+        return True, omdb_info_from_data(data, f"imdb: {imdb_id}")
+    return False, OmdbFailure(attempt_info['error'] or 'Unknown error', is_transient_omdb_attempt(attempt_info))
+
+# Query OMDb API (IMDb data): ranked s= search first, then several title variations
+def omdb_call(params, attempt_number, api_key, timeout=10):
+    """
+    Run one OMDb request (s= search or i= detail lookup) within the shared concurrency limit.
+    Returns: (attempt_info, parsed JSON for a 200 response, else None)
+    """
+    params = dict(params, type='movie', **({'apikey': api_key} if api_key else {}))
+    api_url = f"{OMDB_BASE_URL}/?{urlencode(params)}"
+    attempt_info = {
+        'attempt_number': attempt_number,
+        'search_term': params.get('s') or params.get('i') or params.get('t'),
+        'url': redacted_omdb_url(api_url),
+        'status_code': None,
+        'response_headers': {},
+        'response_data': {},
+        'error': None
+    }
+    print(f"🌐 API Call #{attempt_number}: {attempt_info['url']}")
+
+    with omdb_limiter.slot():
+        try:
+            response = http_get(api_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=timeout)
+        except requests.exceptions.RequestException as req_error:
+            attempt_info['error'] = f"Request exception: {req_error}"
+            print(f"🔌 Request error: {req_error}")
+            return attempt_info, None
+
+    attempt_info['status_code'] = response.status_code
+    attempt_info['response_headers'] = dict(response.headers)
+    if response.status_code != 200:
+        attempt_info['error'] = "Rate limited (429)" if response.status_code == 429 else f"HTTP {response.status_code}"
+        try:
+            # A 401 carries OMDb's reason: "Invalid API key!" or "Request limit reached!"
+            upstream_error = response.json().get('Error')
+        except (ValueError, AttributeError):
+            upstream_error = None
+        if isinstance(upstream_error, str):
+            attempt_info['error'] += f": {upstream_error}"
+        print(f"❌ OMDb returned {response.status_code}")
+        return attempt_info, None
+    try:
+        data = response.json()
+    except ValueError as json_error:
+        attempt_info['error'] = f"Invalid JSON response: {json_error}"
+        return attempt_info, None
+
+    attempt_info['response_data'] = data
+    if data.get('Response') != 'True':
+        attempt_info['error'] = data.get('Error', 'Unknown error')
+    return attempt_info, data
+
+class OmdbFailure(str):
+    """Error message of a failed OMDb lookup that also records whether trying again later could succeed"""
+    def __new__(cls, message, transient=False):
+        failure = super().__new__(cls, message)
+        failure.transient = transient
+        return failure
+
+def omdb_failure(message, debug_info, transient=None):
+    """Failed lookup result; transient unless every attempt got a real answer from OMDb"""
+    if transient is None:
+        transient = any(is_transient_omdb_attempt(attempt) for attempt in debug_info['search_attempts'])
+    return OmdbFailure(f"{message}. Debug info: {debug_info}", transient)
+
+def redacted_omdb_url(api_url):
+    """OMDb request URL with the API key masked, for debug info and logs"""
+    return re.sub(r'([?&]apikey=)[^&]*', r'\1***', api_url)
+
+def is_transient_omdb_attempt(attempt_info):
+    """True when an attempt failed for reasons unrelated to the title: network error, 429, 5xx or OMDb's request limit"""
+    status_code = attempt_info.get('status_code')
+    if status_code is None or status_code == 429 or status_code >= 500:
+        return True
+    error = (attempt_info.get('error') or '').lower()
+    return 'request limit' in error or 'too many requests' in error
+
+def search_omdb(query, year, duration, api_key, debug_info, timeout=10):
+    """
+    Resolve a title with OMDb's s= search (up to 10 candidates per call), scored against
+    title, year and runtime versus the video duration. Costs one search call (two when the
+    year hint finds nothing) plus one detail call per candidate inspected.
+    Returns: (success, info or error) for a decisive answer, (None, error) when OMDb is rate limiting
+    or unreachable (no point firing t= variants at it), else None to fall back to t= variants
+    """
+    attempts = debug_info['search_attempts']
+    duration_seconds = duration_to_seconds(duration)
+
+    candidates = None
+    for search_year in dict.fromkeys([year, None]):
+        params = {'s': query, **({'y': search_year} if search_year else {})}
+        attempt_info, data = omdb_call(params, len(attempts) + 1, api_key, timeout)
+        attempts.append(attempt_info)
+        if is_transient_omdb_attempt(attempt_info):
+            return None, attempt_info['error']
+        if data is None or 'Invalid API key' in (attempt_info['error'] or ''):
+            return None
+        if data.get('Response') == 'True':
+            candidates = data.get('Search') or []
+            break
+        if 'not found' not in (attempt_info['error'] or '').lower():
+            return None  # e.g. "Too many results." - let the exact t= lookup decide
+
+    if candidates is None:
+        return False, f"Movie not found: '{query}'"
+
+    ranked = sorted(((score_omdb_candidate(c, query, year), c) for c in candidates
+                     if c.get('imdbID') and score_omdb_candidate(c, query) >= OMDB_MIN_TITLE_SCORE),
+                    key=lambda scored: scored[0], reverse=True)
+    if not ranked:
+        return None
+
+    # Inspect the runner-up only when it is a close call the duration can settle
+    inspect = [candidate for score, candidate in ranked[:2]
+               if score >= ranked[0][0] - 0.15 and (duration_seconds or candidate is ranked[0][1])]
+    best_score, best_data = None, None
+    for candidate in inspect:
+        attempt_info, data = omdb_call({'i': candidate['imdbID'], 'plot': 'short'}, len(attempts) + 1, api_key, timeout)
+        attempts.append(attempt_info)
+        if is_transient_omdb_attempt(attempt_info):
+            return None, attempt_info['error']
+        if not data or data.get('Response') != 'True':
+            continue
+        score = score_omdb_candidate(data, query, year, duration_seconds)
+        if best_score is None or score > best_score:
+            best_score, best_data = score, data
+
+    if not best_data:
+        return None
+    print(f"✅ Found movie via search: '{best_data.get('Title')}' ({best_data.get('Year')}) score {best_score:.2f}")
+    return True, omdb_info_from_data(best_data, f"search: {query}")
+
+def query_omdb(title, timeout=10, year=None, duration=None):
     debug_info = {
         'search_attempts': [],
         'api_key_present': bool(os.getenv('OMDB_API_KEY')),
         'original_title': title
     }
-    
+
     try:
         # Get API key from environment variable
         api_key = os.getenv('OMDB_API_KEY')
         
         print(f"🔍 Searching for movie: '{title}'")
         print(f"🔑 API Key present: {'Yes' if api_key else 'No'}")
+
+        # Ranked search with the cleaned title and year hint resolves most titles in one or two calls
+        query, hinted_year = parse_title_hints(title)
+        year = year or hinted_year
+        outcome = search_omdb(query, year, duration, api_key, debug_info, timeout)
+        if outcome:
+            success, result = outcome
+            if success:
+                result['debug_info'] = debug_info
+                return True, result
+            if success is None:
+                print(f"🚫 OMDb search failed ({result}); not trying title variants")
+                return False, omdb_failure(f"OMDb unavailable: {result}", debug_info, transient=True)
+            if is_definitive_omdb_miss(debug_info['search_attempts']):
+                save_omdb_miss(title, debug_info['search_attempts'][-1]['error'])
+                return False, omdb_failure(result, debug_info, transient=False)
         
         # Try multiple search strategies
         search_titles = [
+            query,  # Title without year and uploader noise
             title,  # Original title
             title.strip(),  # Remove whitespace
             re.sub(r'\s+', ' ', title),  # Normalize whitespace
@@ -496,201 +2360,278 @@ def fetch_movie_info(title, timeout=10):
         if cleaned_title and cleaned_title not in search_titles:
             search_titles.append(cleaned_title)
         
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        
-        for i, search_title in enumerate(search_titles):
-            if not search_title.strip():
-                continue
-                
-            attempt_info = {
-                'attempt_number': i + 1,
-                'search_term': search_title,
-                'url': '',
-                'status_code': None,
-                'response_headers': {},
-                'response_data': {},
-                'error': None
-            }
-            
-            if api_key:
-                api_url = f"http://www.omdbapi.com/?t={search_title}&type=movie&apikey={api_key}"
-            else:
-                api_url = f"http://www.omdbapi.com/?t={search_title}&type=movie"
-            
-            attempt_info['url'] = api_url
-            print(f"🌐 API Call #{i+1}: {api_url}")
-            
-            try:
-                response = requests.get(api_url, headers=headers, timeout=timeout)
-                attempt_info['status_code'] = response.status_code
-                attempt_info['response_headers'] = dict(response.headers)
-                
-                print(f"📡 Response Status: {response.status_code}")
-                print(f"📋 Response Headers: {dict(response.headers)}")
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        attempt_info['response_data'] = data
-                        print(f"📝 Response Data: {data}")
-                        
-                        if data.get('Response') == 'True':
-                            print(f"✅ Found movie with search term: '{search_title}'")
-                            debug_info['search_attempts'].append(attempt_info)
-                            return True, {
-                                'plot': data.get('Plot', 'No plot available'),
-                                'year': data.get('Year', 'Unknown'),
-                                'director': data.get('Director', 'Unknown'),
-                                'actors': data.get('Actors', 'Unknown'),
-                                'genre': data.get('Genre', 'Unknown'),
-                                'runtime': data.get('Runtime', 'Unknown'),
-                                'imdb_rating': data.get('imdbRating', 'N/A'),
-                                'poster': data.get('Poster', ''),
-                                'found_with': search_title,
-                                'debug_info': debug_info
-                            }
-                        else:
-                            error_msg = data.get('Error', 'Unknown error')
-                            attempt_info['error'] = error_msg
-                            print(f"❌ Search #{i+1} failed: {error_msg}")
-                            
-                            # Check for specific error types
-                            if 'Invalid API key' in error_msg:
-                                debug_info['search_attempts'].append(attempt_info)
-                                return False, "Invalid API key. Please check your OMDB_API_KEY environment variable."
-                            elif 'Request limit reached' in error_msg:
-                                print("🚫 Rate limit reached!")
-                                attempt_info['error'] = f"Rate limit reached: {error_msg}"
-                            elif 'Too many requests' in error_msg:
-                                print("🚫 Too many requests!")
-                                attempt_info['error'] = f"Too many requests: {error_msg}"
-                            
-                    except ValueError as json_error:
-                        attempt_info['error'] = f"Invalid JSON response: {json_error}"
-                        attempt_info['response_data'] = response.text[:500]  # First 500 chars
-                        print(f"❌ Invalid JSON response: {json_error}")
-                        print(f"📄 Raw response: {response.text[:200]}")
-                        
-                elif response.status_code == 401:
-                    attempt_info['error'] = "Unauthorized - Invalid API key"
-                    print(f"🔐 Unauthorized (401) - Invalid API key")
-                    # If we get 401, try without API key as fallback
-                    if api_key:
-                        print(f"🔄 Trying without API key as fallback...")
-                        fallback_url = f"http://www.omdbapi.com/?t={search_title}&type=movie"
-                        try:
-                            fallback_response = requests.get(fallback_url, headers=headers, timeout=timeout)
-                            if fallback_response.status_code == 200:
-                                fallback_data = fallback_response.json()
-                                if fallback_data.get('Response') == 'True':
-                                    print(f"✅ Found movie with fallback (no API key): '{search_title}'")
-                                    return True, {
-                                        'plot': fallback_data.get('Plot', 'No plot available'),
-                                        'year': fallback_data.get('Year', 'Unknown'),
-                                        'director': fallback_data.get('Director', 'Unknown'),
-                                        'actors': fallback_data.get('Actors', 'Unknown'),
-                                        'genre': fallback_data.get('Genre', 'Unknown'),
-                                        'runtime': fallback_data.get('Runtime', 'Unknown'),
-                                        'imdb_rating': fallback_data.get('imdbRating', 'N/A'),
-                                        'poster': fallback_data.get('Poster', ''),
-                                        'found_with': f"{search_title} (fallback)",
-                                        'debug_info': debug_info,
-                                        'note': 'Found using free tier after API key failed'
-                                    }
-                        except Exception as fallback_error:
-                            print(f"❌ Fallback also failed: {fallback_error}")
-                elif response.status_code == 429:
-                    attempt_info['error'] = "Rate limited (429)"
-                    print(f"🚫 Rate limited (429)")
-                elif response.status_code >= 500:
-                    attempt_info['error'] = f"Server error ({response.status_code})"
-                    print(f"💥 Server error ({response.status_code})")
-                else:
-                    attempt_info['error'] = f"HTTP {response.status_code}: {response.text[:200]}"
-                    print(f"❌ HTTP Error {response.status_code}: {response.text[:200]}")
-                    
-            except requests.exceptions.RequestException as req_error:
-                attempt_info['error'] = f"Request exception: {req_error}"
-                print(f"🔌 Request error: {req_error}")
-                
-            debug_info['search_attempts'].append(attempt_info)
-            
-            # Small delay between requests to be respectful
-            time.sleep(0.1)
-        
+        # Deduplicate variants (most differ only in whitespace), keeping priority order
+        search_titles = [t for t in dict.fromkeys(re.sub(r'\s+', ' ', t).strip() for t in search_titles) if t]
+        year_param = f"&y={year}" if year else ""
+
+        # Probe variants in priority order, each with OMDB_VARIANT_STAGGER seconds' head start on the next
+        # (a variant that answers sooner lets the next one go at once). The highest-priority decisive answer
+        # wins and the variants it outranks are never sent, so a title the first variant resolves costs one call.
+        offset = len(debug_info['search_attempts']) + 1
+        cutoff = VariantCutoff(len(search_titles))
+        futures = []
+        try:
+            for rank, search_title in enumerate(search_titles):
+                if cutoff.outranked(rank):
+                    break
+                futures.append(submit_in_lane(omdb_executor, omdb_title_attempt, search_title, offset + rank,
+                                              api_key, year_param, timeout, cutoff, rank))
+                pending = [future for future in futures if not future.done()]
+                if pending and rank + 1 < len(search_titles):
+                    wait(pending, timeout=OMDB_VARIANT_STAGGER, return_when=FIRST_COMPLETED)
+            for future in futures:
+                attempt_info, outcome = future.result()
+                debug_info['search_attempts'].append(attempt_info)
+                if outcome:
+                    success, result = outcome
+                    if success:
+                        result['debug_info'] = debug_info
+                    return success, result
+        finally:
+            cutoff.decided(-1)
+            for future in futures:
+                future.cancel()
+
         # Check if all attempts failed due to invalid API key
         invalid_key_attempts = [attempt for attempt in debug_info['search_attempts'] 
                               if attempt.get('status_code') == 401]
         
         if len(invalid_key_attempts) > 0 and api_key:
             print("🔑 API key appears to be invalid or expired")
-            return False, f"Invalid or expired API key. Please get a new key from http://www.omdbapi.com/ or remove the OMDB_API_KEY environment variable to use the free tier. Debug info: {debug_info}"
-        
+            return False, omdb_failure("Invalid or expired API key. Please get a new key from http://www.omdbapi.com/ or remove the OMDB_API_KEY environment variable to use the free tier", debug_info, transient=False)
+
+        # Remember definitive misses so repeat lookups don't hit OMDb again
+        if is_definitive_omdb_miss(debug_info['search_attempts']):
+            save_omdb_miss(title, debug_info['search_attempts'][-1]['error'])
+
         # If no API key, show helpful message
         if not api_key:
             print("⚠️ No API key found - using free tier")
-            return False, f"Movie not found. Consider getting a free API key from http://www.omdbapi.com/ for better search results. Debug info: {debug_info}"
+            return False, omdb_failure("Movie not found. Consider getting a free API key from http://www.omdbapi.com/ for better search results", debug_info)
         
         print("❌ All search variations failed")
-        return False, f"Movie not found after trying {len(search_titles)} search variations. Debug info: {debug_info}"
+        return False, omdb_failure(f"Movie not found after trying {len(search_titles)} search variations", debug_info)
             
     except requests.exceptions.Timeout:
         print("⏰ Request timeout")
-        return False, f"Request timeout. Debug info: {debug_info}"
+        return False, omdb_failure("Request timeout", debug_info, transient=True)
     except requests.exceptions.ConnectionError:
         print("🔌 Connection error")
-        return False, f"Connection error. Debug info: {debug_info}"
+        return False, omdb_failure("Connection error", debug_info, transient=True)
     except Exception as e:
         print(f"💥 Unexpected error: {str(e)}")
-        return False, f"Error: {str(e)}. Debug info: {debug_info}"
+        return False, omdb_failure(f"Error: {str(e)}", debug_info)
+
+# Optional process pool for CPU-bound page parsing, so regex scans of large pages don't hold the GIL
+# that Flask request threads need. Workers are forked and only ever receive raw bytes and patterns.
+PARSE_PROCESSES = int(os.getenv('PARSE_PROCESSES', '0'))
+parse_pool = None
+parse_pool_lock = threading.Lock()
+parse_stats = {'offloaded': 0, 'inline': 0, 'fallbacks': 0}
+
+def parse_offload_enabled():
+    return PARSE_PROCESSES > 0 and hasattr(os, 'fork')
+
+def init_parse_worker():
+    """Forked workers leave Ctrl+C to the server (which drains, then stops the pool) and die on a plain SIGTERM"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def get_parse_pool():
+    """Return the parse process pool, starting it on first use; None when offload is disabled"""
+    global parse_pool
+    if not parse_offload_enabled():
+        return None
+    with parse_pool_lock:
+        if parse_pool is None:
+            parse_pool = ProcessPoolExecutor(max_workers=PARSE_PROCESSES, initializer=init_parse_worker,
+                                             mp_context=multiprocessing.get_context('fork'))
+        return parse_pool
+
+def start_parse_pool():
+    """Fork the parse workers up front, before the server starts its threads"""
+    pool = get_parse_pool()
+    if pool:
+        pool.submit(int).result()
+        print(f"🧮 Page parsing offloaded to {PARSE_PROCESSES} worker process(es)")
+
+def shutdown_parse_pool():
+    global parse_pool
+    with parse_pool_lock:
+        pool, parse_pool = parse_pool, None
+    if pool:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def count_parse(outcome):
+    with parse_pool_lock:
+        parse_stats[outcome] += 1
+
+def run_parser(parser, *args):
+    """Run a pure parsing function on the parse pool when enabled, otherwise (or if the pool broke) inline"""
+    global parse_pool
+    pool = get_parse_pool()
+    if pool:
+        try:
+            result = pool.submit(parser, *args).result()
+            count_parse('offloaded')
+            return result
+        except (BrokenProcessPool, RuntimeError) as e:
+            # A crashed worker breaks the whole pool; start a fresh one next time
+            print(f"⚠️ Parse pool unavailable ({e}); parsing inline")
+            count_parse('fallbacks')
+            with parse_pool_lock:
+                if parse_pool is pool:
+                    parse_pool = None
+    count_parse('inline')
+    return parser(*args)
+
+# Streaming page scanner for YouTube probes
+PROBE_MAX_BYTES = int(os.getenv('PROBE_MAX_BYTES', str(2 * 1024 * 1024)))
+PROBE_CHUNK_SIZE = 64 * 1024
+PROBE_OVERLAP_BYTES = 4096
+
+def stream_scan(url, fields, required=None, timeout=10, headers=None, max_bytes=None):
+    """
+    Stream a page in chunks and run byte patterns over it incrementally.
+    fields: {name: [compiled bytes patterns in priority order]}
+    Stops downloading once every field in `required` (default: all fields) has matched,
+    or after max_bytes. Matches must be shorter than PROBE_OVERLAP_BYTES to survive chunk boundaries.
+    Returns: (status_code, {name: {pattern_index: matched bytes}})
+    """
+    max_bytes = max_bytes or PROBE_MAX_BYTES
+    required = list(fields) if required is None else required
+    found = {name: {} for name in fields}
+
+    # The slot is held while the body streams, since that is when the upstream is busy
+    with youtube_limiter.slot():
+        response = http_get(url, headers=headers, timeout=timeout, stream=True)
+        try:
+            if response.status_code != 200:
+                return response.status_code, found
+
+            tail = b''
+            bytes_read = 0
+            for chunk in response.iter_content(chunk_size=PROBE_CHUNK_SIZE):
+                window = tail + chunk
+                bytes_read += len(chunk)
+
+                # Only the patterns that have not matched yet are sent to the parser
+                pending = {name: [(index, pattern) for index, pattern in enumerate(patterns) if index not in found[name]]
+                           for name, patterns in fields.items()}
+                for name, matches in run_parser(scan_window, window, pending).items():
+                    found[name].update(matches)
+
+                if all(found[name] for name in required):
+                    break
+                if bytes_read >= max_bytes:
+                    print(f"✂️ Stopped scanning {url} after {bytes_read} bytes (cap {max_bytes})")
+                    break
+                tail = window[-PROBE_OVERLAP_BYTES:]
+
+            return response.status_code, found
+        finally:
+            response.close()
+
+def scan_window(window, pending):
+    """
+    Run byte patterns over one window of a page (runs in a parse worker when offload is enabled).
+    pending: {name: [(pattern_index, compiled bytes pattern)]}
+    Returns: {name: {pattern_index: matched bytes}}
+    """
+    found = {}
+    for name, patterns in pending.items():
+        for index, pattern in patterns:
+            match = pattern.search(window)
+            if match:
+                found.setdefault(name, {})[index] = match.group(1) if pattern.groups else match.group(0)
+    return found
+
+def matches_in_priority_order(field_matches):
+    """Decode the matches for one field, highest-priority pattern first"""
+    return [field_matches[index].decode('utf-8', errors='replace') for index in sorted(field_matches)]
+
+def youtube_page_url(url):
+    """Map a stored YouTube URL onto the configured YOUTUBE_BASE_URL (unchanged for the real site)"""
+    video_id = extract_youtube_video_id(url)
+    if not video_id or YOUTUBE_BASE_URL == 'https://www.youtube.com':
+        return url
+    return f"{YOUTUBE_BASE_URL}/watch?v={video_id}"
+
+# Lightweight probe tiers: oEmbed JSON (title/availability) and embed page (age gate)
+PROBE_EMBED_MAX_BYTES = int(os.getenv('PROBE_EMBED_MAX_BYTES', str(256 * 1024)))
+
+def fetch_oembed(url, timeout=10):
+    """
+    Fetch YouTube's oEmbed JSON for a video (a few hundred bytes).
+    Returns: (status_code, data dict or None). 404 = removed; 401 = private *or* embedding disabled,
+    so a 401 says nothing about whether the video plays on YouTube itself.
+    """
+    video_id = extract_youtube_video_id(url)
+    if not video_id:
+        return None, None
+    watch_url = f"https://www.youtube.com/watch?v={video_id}"
+    with youtube_limiter.slot():
+        response = http_get(f'{YOUTUBE_BASE_URL}/oembed', params={'url': watch_url, 'format': 'json'},
+                            headers={'User-Agent': 'Mozilla/5.0'}, timeout=timeout)
+    if response.status_code != 200:
+        return response.status_code, None
+    try:
+        return 200, response.json()
+    except ValueError:
+        return 200, None
+
+def probe_oembed(url, timeout=10):
+    """fetch_oembed for a result shared between checks; (None, None) when the request itself failed"""
+    try:
+        return fetch_oembed(url, timeout)
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ oEmbed lookup failed, falling back to the watch page: {e}")
+        return None, None
+
+YOUTUBE_TITLE_PATTERNS = [
+    # Standard title tag
+    re.compile(rb'<title>(.+?) - YouTube</title>', re.IGNORECASE),
+    # Video title in meta property
+    re.compile(rb'<meta property="og:title" content="([^"]+)"', re.IGNORECASE),
+    # Alternative JSON pattern
+    re.compile(rb'"videoDetails":{"videoId":"[^"]+","title":"([^"]+)"', re.IGNORECASE),
+    # Another JSON pattern
+    re.compile(rb'"title":{"runs":\[{"text":"([^"]+)"}', re.IGNORECASE),
+    # YouTube's current structure
+    re.compile(rb'<meta name="title" content="([^"]+)"', re.IGNORECASE),
+]
+
+# Fetch YouTube video title (oEmbed first, watch page as fallback)
+def fetch_youtube_title(url, timeout=10, oembed=None):
+    """oembed: a (status_code, data) result from probe_oembed to reuse instead of fetching it again"""
+    status_code, data = oembed or probe_oembed(url, timeout)
+    if data and data.get('title'):
+        print(f"📝 Title (oEmbed): {data['title']}")
+        return True, data['title']
+    if status_code == 404:
+        return False, "HTTP 404"
 
-# Fetch YouTube video title
-def fetch_youtube_title(url, timeout=10):
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=timeout)
-        
-        if response.status_code == 200:
-            html = response.text
-            
-            # Try multiple extraction methods
-            patterns = [
-                # Standard title tag
-                r'<title>(.+?) - YouTube</title>',
-                # JSON-LD structured data
-                r'"name":"([^"]+)".*?"@type":"VideoObject"',
-                # Video title in meta property
-                r'<meta property="og:title" content="([^"]+)"',
-                # Alternative JSON pattern
-                r'"videoDetails":{"videoId":"[^"]+","title":"([^"]+)"',
-                # Another JSON pattern
-                r'"title":{"runs":\[{"text":"([^"]+)"}',
-                # Simpler JSON title pattern
-                r'"title":"([^"]+)".*?"lengthSeconds"',
-                # YouTube's current structure
-                r'<meta name="title" content="([^"]+)"',
-            ]
-            
-            for pattern in patterns:
-                title_match = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
-                if title_match:
-                    title = title_match.group(1)
-                    
-                    # Clean up HTML entities and unicode escapes
-                    title = title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
-                    title = title.replace('\\u0026', '&').replace('\\u003c', '<').replace('\\u003e', '>')
-                    
-                    # Remove common suffixes that might indicate it's not the actual title
-                    if not any(suffix in title.lower() for suffix in ['comments', 'subscribers', 'views', 'likes']):
-                        print(f"✅ Extracted title using pattern: {pattern}")
-                        print(f"📝 Title: {title}")
-                        return True, title
-                    else:
-                        print(f"⚠️ Skipped suspicious title: {title}")
-            
+        status_code, found = stream_scan(youtube_page_url(url), {'title': YOUTUBE_TITLE_PATTERNS},
+                                         timeout=timeout, headers=headers)
+
+        if status_code == 200:
+            for title in matches_in_priority_order(found['title']):
+                # Clean up HTML entities and unicode escapes
+                title = title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
+                title = title.replace('\\u0026', '&').replace('\\u003c', '<').replace('\\u003e', '>')
+
+                # Remove common suffixes that might indicate it's not the actual title
+                if not any(suffix in title.lower() for suffix in ['comments', 'subscribers', 'views', 'likes']):
+                    print(f"📝 Title: {title}")
+                    return True, title
+                else:
+                    print(f"⚠️ Skipped suspicious title: {title}")
+
             return False, "Could not extract video title from any pattern"
         else:
-            return False, f"HTTP {response.status_code}"
+            return False, f"HTTP {status_code}"
     except requests.exceptions.Timeout:
         return False, "Request timeout"
     except requests.exceptions.ConnectionError:
@@ -699,6 +2640,17 @@ def fetch_youtube_title(url, timeout=10):
         return False, f"Error: {str(e)}"
 
 # Check for YouTube age restrictions
+AGE_RESTRICTION_PATTERN = re.compile(
+    rb'this video may be inappropriate for some users|sign in to confirm your age|this video is not available'
+    rb'|age-restricted|content warning|age_gated|confirm your age|restricted content|content_age_gate',
+    re.IGNORECASE
+)
+UNAVAILABLE_PATTERN = re.compile(rb'video is not available|private video', re.IGNORECASE)
+# Embed player config marks age-gated videos as needing sign-in
+EMBED_AGE_GATE_PATTERN = re.compile(rb'"status":"(?:LOGIN_REQUIRED|AGE_CHECK_REQUIRED|AGE_VERIFICATION_REQUIRED)"')
+# Any player verdict; without one the embed page (e.g. a consent or error shell) proves nothing
+PLAYABILITY_STATUS_PATTERN = re.compile(rb'"playabilityStatus":\{"status":"([A-Z_]+)"')
+
 def check_age_restriction(url, timeout=10):
     """
     Check if a YouTube video is age-restricted.
@@ -706,32 +2658,32 @@ def check_age_restriction(url, timeout=10):
     """
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=timeout)
-        
-        if response.status_code != 200:
-            return False, f"Could not check age restriction (HTTP {response.status_code})"
-        
-        content = response.text.lower()
-        
-        # Check for various age restriction indicators
-        age_indicators = [
-            'this video may be inappropriate for some users',
-            'sign in to confirm your age',
-            'this video is not available',
-            'age-restricted',
-            'content warning',
-            'age_gated',
-            'confirm your age',
-            'restricted content',
-            'content_age_gate'
-        ]
-        
-        for indicator in age_indicators:
-            if indicator in content:
-                return True, "Age-restricted content detected"
-        
+        fields = {'age': [AGE_RESTRICTION_PATTERN, EMBED_AGE_GATE_PATTERN], 'unavailable': [UNAVAILABLE_PATTERN],
+                  'playability': [PLAYABILITY_STATUS_PATTERN]}
+
+        # Try the much smaller embed page first; the full watch page is only a fallback
+        status_code, found = None, None
+        video_id = extract_youtube_video_id(url)
+        if video_id:
+            status_code, found = stream_scan(
+                f"{YOUTUBE_BASE_URL}/embed/{video_id}", fields,
+                required=['playability'], timeout=timeout, headers=headers, max_bytes=PROBE_EMBED_MAX_BYTES
+            )
+
+        # The embed page only settles it when it flagged an age gate or carried the player's verdict
+        if status_code != 200 or not (found['age'] or found['playability']):
+            # Only an age indicator ends the scan early; availability hints are collected along the way
+            status_code, found = stream_scan(youtube_page_url(url), fields, required=['age'],
+                                             timeout=timeout, headers=headers)
+
+        if status_code != 200:
+            return False, f"Could not check age restriction (HTTP {status_code})"
+
+        if found['age']:
+            return True, "Age-restricted content detected"
+
         # Check for embed restrictions (another indicator)
-        if 'video is not available' in content or 'private video' in content:
+        if found['unavailable']:
             return True, "Content not publicly available"
             
         return False, "No age restrictions detected"
@@ -743,14 +2695,25 @@ def check_age_restriction(url, timeout=10):
     except Exception as e:
         return False, f"Error checking age restriction: {str(e)}"
 
-def validate_url(url, timeout=10):
+def validate_url(url, timeout=10, oembed=None):
+    """oembed: a (status_code, data) result from probe_oembed to reuse instead of fetching it again"""
     try:
         parsed = urlparse(url)
         if not parsed.netloc or ('youtube.com' not in parsed.netloc and 'youtu.be' not in parsed.netloc):
             return False, "Invalid YouTube URL format"
 
+        # oEmbed reports removed videos, which the watch page HEAD does not. A 401 may just mean
+        # embedding is disabled, so that (like any other answer) falls through to the watch page.
+        status_code, _ = oembed or probe_oembed(url, timeout)
+        if status_code == 200:
+            return True, "OK"
+        elif status_code == 404:
+            return False, "Video not found (404)"
+
         headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        page_url = youtube_page_url(url)
+        response = upstream_ledger.track(page_url, lambda: requests.head(page_url, headers=headers, timeout=timeout,
+                                                                         allow_redirects=True), stream=True)
 
         if response.status_code == 200:
             return True, "OK"
@@ -765,23 +2728,167 @@ def validate_url(url, timeout=10):
     except Exception as e:
         return False, f"Error: {str(e)}"
 
+# Adaptive re-verification: every check is recorded, and a movie whose availability keeps
+# coming back the same is re-checked exponentially less often
+VERIFY_BASE_INTERVAL_HOURS = float(os.getenv('VERIFY_BASE_INTERVAL_HOURS', '24'))
+VERIFY_MAX_INTERVAL_DAYS = float(os.getenv('VERIFY_MAX_INTERVAL_DAYS', '60'))
+VERIFY_BUDGET = int(os.getenv('VERIFY_BUDGET', '50'))
+VERIFY_SCHEDULE_MINUTES = float(os.getenv('VERIFY_SCHEDULE_MINUTES', '60'))
+AVAILABILITY_HISTORY_PER_MOVIE = 20
+
+def availability_unknown(message):
+    """True when a failed validate_url check says nothing about the video (timeouts, rate limits, upstream 5xx)"""
+    return message in ("Request timeout", "Connection error") or bool(re.match(r'HTTP (429|5\d\d)', str(message)))
+
+def record_availability_check(conn, movie, available, method, detail=None):
+    """
+    Append a check to the movie's history and schedule its next one.
+    available: True/False, or None when the check was inconclusive (the verified flag is left alone).
+    The interval doubles for each consecutive check with the same result, so a video that flips
+    (or was never checked) is looked at again soon, and a long-stable one backs off up to VERIFY_MAX_INTERVAL_DAYS.
+    Returns the next check time.
+    """
+    now = datetime.now()
+    conn.execute('INSERT INTO availability_checks (movie_id, checked_at, available, method, detail) VALUES (?, ?, ?, ?, ?)',
+                 (movie['id'], now.isoformat(), None if available is None else int(available), method, detail))
+    conn.execute('DELETE FROM availability_checks WHERE movie_id = ? AND id NOT IN '
+                 '(SELECT id FROM availability_checks WHERE movie_id = ? ORDER BY id DESC LIMIT ?)',
+                 (movie['id'], movie['id'], AVAILABILITY_HISTORY_PER_MOVIE))
+
+    streak = movie['verify_streak'] or 0
+    if available is None:
+        next_check = now + timedelta(hours=VERIFY_BASE_INTERVAL_HOURS)
+        conn.execute('UPDATE movies SET next_verify_at = ? WHERE id = ?', (next_check.isoformat(), movie['id']))
+        return next_check
+
+    checked_before = movie['last_verified'] is not None
+    streak = streak + 1 if checked_before and bool(movie['verified']) == available else 0
+    interval_hours = min(VERIFY_BASE_INTERVAL_HOURS * 2 ** streak, VERIFY_MAX_INTERVAL_DAYS * 24)
+    next_check = now + timedelta(hours=interval_hours)
+    conn.execute('UPDATE movies SET verified = ?, last_verified = ?, verify_streak = ?, next_verify_at = ? WHERE id = ?',
+                 (int(available), now.isoformat(), streak, next_check.isoformat(), movie['id']))
+    return next_check
+
+def movies_due_for_verification(conn, budget):
+    """Movies whose next check is due: never-checked first, then recently flipped (low streak), then most overdue"""
+    return conn.execute('''
+        SELECT * FROM movies
+        WHERE next_verify_at IS NULL OR next_verify_at <= ?
+        ORDER BY next_verify_at IS NOT NULL, COALESCE(verify_streak, 0), next_verify_at
+        LIMIT ?
+    ''', (datetime.now().isoformat(), budget)).fetchall()
+
+def verification_schedule_stats(conn):
+    now = datetime.now().isoformat()
+    return {
+        'due': conn.execute('SELECT COUNT(*) FROM movies WHERE next_verify_at IS NULL OR next_verify_at <= ?',
+                            (now,)).fetchone()[0],
+        'never_checked': conn.execute('SELECT COUNT(*) FROM movies WHERE next_verify_at IS NULL').fetchone()[0],
+        'next_due_at': conn.execute('SELECT MIN(next_verify_at) FROM movies WHERE next_verify_at > ?',
+                                    (now,)).fetchone()[0],
+        'budget': VERIFY_BUDGET,
+        'schedule_minutes': VERIFY_SCHEDULE_MINUTES
+    }
+
+verify_schedule = {'timer': None}
+
+def schedule_verification_sweep():
+    """Every VERIFY_SCHEDULE_MINUTES, re-check up to VERIFY_BUDGET due movies (joins a running verification)"""
+    if VERIFY_SCHEDULE_MINUTES <= 0:
+        return
+
+    def run():
+        if not job_registry.accepting:
+            return
+        # Every worker runs this timer. Another worker's due pass or full sweep (which covers every
+        # movie anyway) means there is nothing for this one to do
+        if not any(job_leases.held_elsewhere(name) for name in ('library:verify:due', 'library:verify')):
+            start_verification('scheduled_verification', budget=VERIFY_BUDGET)
+        schedule_verification_sweep()
+
+    timer = threading.Timer(VERIFY_SCHEDULE_MINUTES * 60, run)
+    timer.daemon = True
+    verify_schedule['timer'] = timer
+    timer.start()
+
+def start_verification(name, budget=None):
+    """
+    Start or join a library verification: a full sweep ('library:verify'), or with `budget` a pass over
+    at most that many due movies ('library:verify:due'). They use separate keys and leases, so a full
+    sweep is never answered with a smaller pass. A full sweep stops a running budgeted pass after its
+    current movie, and a budgeted pass joins a running full sweep, which checks every movie anyway.
+    Returns: (job, started)
+    """
+    if budget is not None:
+        full = job_registry.active('library:verify')
+        if full:
+            return full, False
+        target = lambda job: test_urls_background(job, budget=budget)
+        return job_registry.single_flight('library:verify:due', name, run_exclusively(
+            'library:verify:due', in_lane(PRIORITY_BULK, target)))
+
+    budgeted = job_registry.active('library:verify:due')
+    if budgeted:
+        budgeted.stop_requested.set()
+    return job_registry.single_flight('library:verify', name, run_exclusively(
+        'library:verify', in_lane(PRIORITY_BULK, test_urls_background)))
+
 # Background URL testing
-def test_urls_background():
+def test_urls_background(job, budget=None):
+    """Check availability of every movie, or with `budget`, of at most that many movies that are due"""
     conn = get_db_connection()
-    movies = conn.execute('SELECT * FROM movies').fetchall()
+    if budget is None:
+        movies = conn.execute('SELECT * FROM movies').fetchall()
+    else:
+        movies = movies_due_for_verification(conn, budget)
+    job.set_total(len(movies))
+
+    # With a YouTube API key, check availability in batches of 50 and backfill missing durations
+    details = fetch_youtube_video_details([movie['video_id'] for movie in movies])
+    remaining = []
     for movie in movies:
-        is_valid, _ = validate_url(movie['url'])
-        last_verified = datetime.now().isoformat()
-        conn.execute('UPDATE movies SET verified = ?, last_verified = ? WHERE id = ?', 
-                     (int(is_valid), last_verified, movie['id']))
-        time.sleep(0.5)
+        if movie['video_id'] not in details:
+            remaining.append(movie)
+            continue
+        info = details[movie['video_id']]
+        is_valid = bool(info and info['available'])
+        record_availability_check(conn, movie, is_valid, 'api', None if info else 'Not returned by the YouTube API')
+        if info and info['duration'] and not movie['duration']:
+            conn.execute('UPDATE movies SET duration = ? WHERE id = ?', (info['duration'], movie['id']))
+        job.advance(is_valid)
     conn.commit()
+
+    for movie in remaining:
+        if job.should_stop():
+            break
+        is_valid, message = validate_url(movie['url'])
+        record_availability_check(conn, movie, None if availability_unknown(message) else is_valid, 'probe', message)
+        conn.commit()
+        job.advance(is_valid)
+        time.sleep(0.5)
     conn.close()
 
 # YouTube Duration Extraction
+YOUTUBE_DURATION_PATTERNS = [
+    re.compile(rb'"lengthSeconds":"(\d+)"'),
+    re.compile(rb'"length":"(\d+)"'),
+    re.compile(rb'approxDurationMs":"(\d+)"')
+]
+
+def format_duration(seconds):
+    """Convert seconds to HH:MM:SS or MM:SS format"""
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    secs = seconds % 60
+
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes}:{secs:02d}"
+
 def extract_youtube_duration(url, timeout=10):
     """
-    Extract video duration from YouTube URL by scraping the video page
+    Extract video duration from YouTube URL by scanning the video page
     Returns: duration string (e.g., "1:32:45") or None if extraction fails
     """
     try:
@@ -789,39 +2896,87 @@ def extract_youtube_duration(url, timeout=10):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
 
-        response = requests.get(url, headers=headers, timeout=timeout)
+        status_code, found = stream_scan(youtube_page_url(url), {'duration': YOUTUBE_DURATION_PATTERNS},
+                                         timeout=timeout, headers=headers)
 
-        if response.status_code != 200:
+        if status_code != 200:
             return None
 
-        html = response.text
-
-        # Try to extract duration from various JSON patterns in the page
-        duration_patterns = [
-            r'"lengthSeconds":"(\d+)"',
-            r'"length":"(\d+)"',
-            r'approxDurationMs":"(\d+)"'
-        ]
-
-        for pattern in duration_patterns:
-            match = re.search(pattern, html)
-            if match:
-                seconds = int(match.group(1))
-                # Convert seconds to HH:MM:SS or MM:SS format
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
-                secs = seconds % 60
-
-                if hours > 0:
-                    return f"{hours}:{minutes:02d}:{secs:02d}"
-                else:
-                    return f"{minutes}:{secs:02d}"
+        for value in matches_in_priority_order(found['duration']):
+            return format_duration(int(value))
 
         return None
     except Exception as e:
         print(f"⚠️ Error extracting duration from {url}: {e}")
         return None
 
+# YouTube search page parsing (ytInitialData)
+YT_INITIAL_DATA_MARKERS = ['var ytInitialData = ', 'window["ytInitialData"] = ', 'ytInitialData = ']
+
+def extract_yt_initial_data(html):
+    """
+    Find the ytInitialData JSON object embedded in a YouTube page and decode it.
+    Uses raw_decode from the opening brace so the page is scanned once, without regex backtracking.
+    Returns: decoded dict or None if not present
+    """
+    decoder = json.JSONDecoder()
+    for marker in YT_INITIAL_DATA_MARKERS:
+        index = html.find(marker)
+        if index == -1:
+            continue
+        start = html.find('{', index + len(marker))
+        if start == -1:
+            continue
+        try:
+            data, _ = decoder.raw_decode(html, start)
+            return data
+        except ValueError as e:
+            print(f"⚠️ Could not decode ytInitialData after '{marker.strip()}': {e}")
+    return None
+
+def iter_video_renderers(data):
+    """Yield videoRenderer nodes from decoded ytInitialData in page order"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            renderer = node.get('videoRenderer')
+            if isinstance(renderer, dict) and renderer.get('videoId'):
+                yield renderer
+            stack.extend(reversed([value for key, value in node.items() if key != 'videoRenderer']))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+def yt_text(value):
+    """Flatten a YouTube text object ({"simpleText": ...} or {"runs": [...]}) into a string"""
+    if not isinstance(value, dict):
+        return ''
+    if 'simpleText' in value:
+        return value['simpleText']
+    return ''.join(run.get('text', '') for run in value.get('runs', []))
+
+def parse_video_renderer(renderer):
+    """Extract id, title, duration, channel and view count from a videoRenderer node"""
+    return {
+        'video_id': renderer['videoId'],
+        'title': yt_text(renderer.get('title')),
+        'duration': yt_text(renderer.get('lengthText')) or 'Unknown',
+        'channel': yt_text(renderer.get('ownerText')) or yt_text(renderer.get('longBylineText')),
+        'views': yt_text(renderer.get('viewCountText'))
+    }
+
+def parse_search_page(page):
+    """
+    Parse a YouTube search page (str, or raw bytes when sent to a parse worker) into result dicts.
+    Returns: list of parsed videoRenderer dicts, or None if the page has no ytInitialData
+    """
+    if isinstance(page, bytes):
+        page = page.decode('utf-8', errors='replace')
+    initial_data = extract_yt_initial_data(page)
+    if initial_data is None:
+        return None
+    return [parse_video_renderer(renderer) for renderer in iter_video_renderers(initial_data)]
+
 # YouTube Search Functions
 def search_youtube_videos(query, max_results=10, timeout=10):
     """
@@ -833,62 +2988,35 @@ def search_youtube_videos(query, max_results=10, timeout=10):
         
         # Encode the search query for URL
         encoded_query = quote_plus(query + " full movie")
-        search_url = f"https://www.youtube.com/results?search_query={encoded_query}"
+        search_url = f"{YOUTUBE_BASE_URL}/results?search_query={encoded_query}"
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(search_url, headers=headers, timeout=timeout)
+        response = http_get(search_url, headers=headers, timeout=timeout)
         
         if response.status_code != 200:
             return False, f"Failed to search YouTube (HTTP {response.status_code})"
         
-        html = response.text
-        
-        # Extract video data from the page
-        results = []
-        
-        # Pattern to match video data in the YouTube search results
-        # YouTube embeds video data in JSON within script tags
-        video_pattern = r'"videoId":"([^"]+)".*?"title":{"runs":\[{"text":"([^"]+)"}.*?"lengthText":{"simpleText":"([^"]*)"}'
-        
-        # Alternative patterns for different YouTube layouts
-        patterns = [
-            # Standard pattern
-            r'"videoId":"([^"]+)".*?"title":{"runs":\[{"text":"([^"]+)"}.*?"lengthText":{"simpleText":"([^"]+)"}',
-            # Alternative pattern
-            r'"videoId":"([^"]+)".*?"title":{"simpleText":"([^"]+)"}.*?"lengthText":{"simpleText":"([^"]+)"}',
-            # More flexible pattern
-            r'"videoId":"([^"]+)"[^}]*"title":\{"[^}]*"text":"([^"]+)"[^}]*\}[^}]*"lengthText":\{"simpleText":"([^"]+)"',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.DOTALL)
-            if matches:
-                print(f"✅ Found {len(matches)} videos using pattern")
-                break
-        
+        # Parse the embedded ytInitialData JSON once and walk its videoRenderer nodes;
+        # a parse worker gets the raw bytes so decoding happens off the request thread too
+        matches = run_parser(parse_search_page, response.content if parse_offload_enabled() else response.text)
         if not matches:
-            # Try a simpler approach - look for video IDs and titles separately
-            video_ids = re.findall(r'"videoId":"([^"]+)"', html)
-            titles = re.findall(r'"title":{"runs":\[{"text":"([^"]+)"}', html)
-            
-            if video_ids and titles:
-                matches = list(zip(video_ids, titles, ['Unknown'] * len(video_ids)))
-                print(f"✅ Found {len(matches)} videos using fallback method")
-            else:
-                return False, "Could not extract video information from YouTube search results"
-        
+            return False, "Could not extract video information from YouTube search results"
+        print(f"✅ Found {len(matches)} videos in ytInitialData")
+
+        results = []
+
         # Process the matches
         seen_video_ids = set()
         for match in matches[:max_results * 2]:  # Get more than needed to filter duplicates
             if len(results) >= max_results:
                 break
                 
-            video_id = match[0]
-            title = match[1]
-            duration = match[2] if len(match) > 2 else "Unknown"
+            video_id = match['video_id']
+            title = match['title']
+            duration = match['duration']
             
             # Skip duplicates
             if video_id in seen_video_ids:
@@ -908,8 +3036,7 @@ def search_youtube_videos(query, max_results=10, timeout=10):
                     except ValueError:
                         pass
             
-            # Clean up title
-            title = title.replace('\\u0026', '&').replace('\\u003c', '<').replace('\\u003e', '>')
+            # Clean up title (JSON escapes are already decoded, HTML entities may remain)
             title = title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
             
             # Skip obvious non-movie content
@@ -928,6 +3055,8 @@ def search_youtube_videos(query, max_results=10, timeout=10):
                 'url': url,
                 'duration': duration,
                 'thumbnail': f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg",
+                'channel': match['channel'],
+                'views': match['views'],
                 'has_full_movie': has_full_movie
             })
         
@@ -945,6 +3074,67 @@ def search_youtube_videos(query, max_results=10, timeout=10):
         print(f"❌ YouTube search error: {e}")
         return False, f"Search error: {str(e)}"
 
+# YouTube Data API batch enrichment (videos.list, up to 50 IDs per call)
+YOUTUBE_API_BATCH_SIZE = 50
+
+def parse_iso8601_duration(value):
+    """Convert an ISO 8601 duration like PT1H32M45S to seconds (None if unparseable)"""
+    match = re.fullmatch(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?', value or '')
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+def fetch_youtube_video_details(video_ids, timeout=10):
+    """
+    Look up duration, age rating and availability for many videos via the YouTube Data API.
+    Sends one videos.list request per 50 IDs.
+    Returns: {video_id: details dict, or None if the video is missing/unavailable}.
+    IDs in batches that failed are left out so callers can fall back to scraping them.
+    """
+    api_key = os.getenv('YOUTUBE_API_KEY')
+    if not api_key:
+        return {}
+
+    unique_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+    details = {}
+    for start in range(0, len(unique_ids), YOUTUBE_API_BATCH_SIZE):
+        batch = unique_ids[start:start + YOUTUBE_API_BATCH_SIZE]
+        try:
+            response = http_get(f'{YOUTUBE_API_BASE_URL}/videos', params={
+                'part': 'contentDetails,status',
+                'id': ','.join(batch),
+                'maxResults': YOUTUBE_API_BATCH_SIZE,
+                'key': api_key
+            }, timeout=timeout)
+            if response.status_code != 200:
+                print(f"❌ YouTube API videos.list error (HTTP {response.status_code}) for batch at {start}")
+                continue
+            items = {item['id']: item for item in response.json().get('items', [])}
+        except Exception as e:
+            print(f"❌ YouTube API videos.list error for batch at {start}: {e}")
+            continue
+
+        for video_id in batch:
+            item = items.get(video_id)
+            if not item:
+                # Removed, private or never existed - the API simply omits it
+                details[video_id] = None
+                continue
+            content = item.get('contentDetails', {})
+            status = item.get('status', {})
+            seconds = parse_iso8601_duration(content.get('duration'))
+            details[video_id] = {
+                'duration': format_duration(seconds) if seconds else None,
+                'age_restricted': content.get('contentRating', {}).get('ytRating') == 'ytAgeRestricted',
+                'available': status.get('privacyStatus') != 'private' and status.get('uploadStatus', 'processed') == 'processed',
+                'embeddable': status.get('embeddable', True)
+            }
+
+    print(f"📡 YouTube API enriched {len(details)}/{len(unique_ids)} videos in "
+          f"{(len(unique_ids) + YOUTUBE_API_BATCH_SIZE - 1) // YOUTUBE_API_BATCH_SIZE} calls")
+    return details
+
 def search_youtube_with_api(query, max_results=10):
     """
     Search YouTube using the official API (requires API key)
@@ -958,7 +3148,7 @@ def search_youtube_with_api(query, max_results=10):
         print(f"🔍 Searching YouTube API for: '{query}'")
         
         # YouTube Data API v3 search endpoint
-        search_url = "https://www.googleapis.com/youtube/v3/search"
+        search_url = f"{YOUTUBE_API_BASE_URL}/search"
         
         params = {
             'part': 'snippet',
@@ -970,7 +3160,7 @@ def search_youtube_with_api(query, max_results=10):
             'key': api_key
         }
         
-        response = requests.get(search_url, params=params, timeout=10)
+        response = http_get(search_url, params=params, timeout=10)
         
         if response.status_code != 200:
             return False, f"YouTube API error (HTTP {response.status_code})"
@@ -997,12 +3187,234 @@ def search_youtube_with_api(query, max_results=10):
                 'description': item['snippet']['description'][:200] + '...' if len(item['snippet']['description']) > 200 else item['snippet']['description']
             })
         
+        # search.list has no durations - fill them in with a single videos.list call
+        details = fetch_youtube_video_details([result['video_id'] for result in results])
+        for result in results:
+            info = details.get(result['video_id'])
+            if info and info['duration']:
+                result['duration'] = info['duration']
+
         print(f"✅ YouTube API found {len(results)} results")
         return True, results
         
     except Exception as e:
-        print(f"❌ YouTube API search error: {e}")
-        return False, f"API search error: {str(e)}"
+        print(f"❌ YouTube API search error: {e}")
+        return False, f"API search error: {str(e)}"
+
+# In-memory TTL/LRU cache (YouTube search results, prefetched probes)
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss counters"""
+    def __init__(self, max_entries=256, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+search_cache = TTLCache(
+    max_entries=int(os.getenv('YOUTUBE_SEARCH_CACHE_SIZE', '256')),
+    ttl_seconds=float(os.getenv('YOUTUBE_SEARCH_CACHE_TTL', '300'))
+)
+
+def search_cache_key(query, max_results, method):
+    """Normalize the query so trivial variations share a search cache entry"""
+    return (re.sub(r'\s+', ' ', query).strip().lower(), int(max_results), method)
+
+# Background prefetch of probe data (title, validation, age, duration) for search results
+PROBE_PREFETCH_COUNT = int(os.getenv('PROBE_PREFETCH_COUNT', '3'))
+PROBE_PREFETCH_MAX = int(os.getenv('PROBE_PREFETCH_MAX', '5'))
+PROBE_PREFETCH_WAIT = float(os.getenv('PROBE_PREFETCH_WAIT', '15'))
+
+probe_cache = TTLCache(
+    max_entries=int(os.getenv('PROBE_CACHE_SIZE', '512')),
+    ttl_seconds=float(os.getenv('PROBE_CACHE_TTL', '900'))
+)
+prefetch_executor = ThreadPoolExecutor(max_workers=int(os.getenv('PROBE_PREFETCH_WORKERS', '2')),
+                                       thread_name_prefix='probe-prefetch')
+prefetch_inflight = {}
+prefetch_lock = threading.Lock()
+
+def probe_video(url):
+    """Run every per-video probe an import needs and return the results as a dict"""
+    oembed = probe_oembed(url)
+    title_success, title_result = fetch_youtube_title(url, oembed=oembed)
+    is_valid, validation_message = validate_url(url, oembed=oembed)
+    is_age_restricted, age_message = check_age_restriction(url)
+    return {
+        'title_success': title_success,
+        'title': title_result,
+        'valid': is_valid,
+        'validation_message': validation_message,
+        'age_restricted': is_age_restricted,
+        'age_message': age_message,
+        'duration': extract_youtube_duration(url),
+        'probed_at': datetime.now().isoformat()
+    }
+
+def prefetch_probe(video_id, url):
+    """Background task: probe one video and store the result by video_id"""
+    try:
+        probe_cache.put(video_id, probe_video(url))
+        print(f"📦 Prefetched probe data for {video_id}")
+    except Exception as e:
+        print(f"❌ Prefetch failed for {video_id}: {e}")
+    finally:
+        with prefetch_lock:
+            prefetch_inflight.pop(video_id, None)
+
+def queue_prefetch(results, limit):
+    """Queue background probes for the top `limit` results that are not cached or already running"""
+    queued = 0
+    for result in results[:limit]:
+        video_id = result.get('video_id')
+        if not video_id or probe_cache.get(video_id):
+            continue
+        with prefetch_lock:
+            if video_id in prefetch_inflight:
+                continue
+            prefetch_inflight[video_id] = prefetch_executor.submit(in_lane(PRIORITY_PREFETCH, prefetch_probe),
+                                                                   video_id, result['url'])
+        queued += 1
+    return queued
+
+def get_prefetched_probe(video_id, wait=PROBE_PREFETCH_WAIT):
+    """Return prefetched probe data, waiting briefly for a probe that is still running"""
+    if not video_id:
+        return None
+    with prefetch_lock:
+        future = prefetch_inflight.get(video_id)
+    if future:
+        try:
+            future.result(timeout=wait)
+        except Exception:
+            pass
+    return probe_cache.get(video_id)
+
+# Hedged multi-source YouTube search (Data API and scraping raced or merged)
+SEARCH_HEDGE_MODE = os.getenv('SEARCH_HEDGE_MODE', 'off').lower()
+SEARCH_HEDGE_DELAY = float(os.getenv('SEARCH_HEDGE_DELAY', '0.5'))
+SEARCH_METHOD_NAMES = {'api': 'YouTube Data API v3', 'scrape': 'Web Scraping'}
+
+search_executor = ThreadPoolExecutor(max_workers=int(os.getenv('SEARCH_HEDGE_WORKERS', '4')),
+                                     thread_name_prefix='search-hedge')
+
+def run_search_source(source, query, max_results):
+    if source == 'api':
+        return search_youtube_with_api(query, max_results)
+    return search_youtube_videos(query, max_results)
+
+def merge_search_results(primary, secondary, max_results):
+    """Merge two result lists, deduplicated by video_id, filling unknown durations from the other source"""
+    merged = {}
+    for result in primary + secondary:
+        existing = merged.get(result['video_id'])
+        if not existing:
+            merged[result['video_id']] = dict(result)
+            continue
+        for key, value in result.items():
+            if value and existing.get(key) in (None, '', 'Unknown'):
+                existing[key] = value
+    return list(merged.values())[:max_results]
+
+def hedged_youtube_search(query, max_results, use_api, mode='first', delay=None):
+    """
+    Search both sources so tail latency is set by the faster backend.
+    mode 'first': start the preferred source, start the other after `delay` seconds (or as soon as
+    the first fails) and return whichever succeeds first.
+    mode 'merge': run both at once and merge the results by video_id.
+    Returns: (success, results or error message, search_method)
+    """
+    delay = SEARCH_HEDGE_DELAY if delay is None else delay
+    primary, secondary = ('api', 'scrape') if use_api else ('scrape', 'api')
+
+    if mode == 'merge':
+        futures = {source: search_executor.submit(run_search_source, source, query, max_results)
+                   for source in (primary, secondary)}
+        outcomes = {source: future.result() for source, future in futures.items()}
+        succeeded = [source for source in (primary, secondary) if outcomes[source][0]]
+        if not succeeded:
+            return False, outcomes[primary][1], f"{SEARCH_METHOD_NAMES[primary]} + {SEARCH_METHOD_NAMES[secondary]}"
+        results = merge_search_results(*[outcomes[source][1] if source in succeeded else []
+                                         for source in (primary, secondary)], max_results)
+        return True, results, ' + '.join(SEARCH_METHOD_NAMES[source] for source in succeeded) + ' (merged)'
+
+    pending = {search_executor.submit(run_search_source, primary, query, max_results): primary}
+    done, _ = wait(pending, timeout=delay)
+    if not done or not next(iter(done)).result()[0]:
+        print(f"⏱️ Hedging search with {SEARCH_METHOD_NAMES[secondary]}")
+        pending[search_executor.submit(run_search_source, secondary, query, max_results)] = secondary
+
+    last_error = None
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            source = pending.pop(future)
+            success, results = future.result()
+            if success:
+                # Any still-running source finishes in the background and is discarded
+                return True, results, f"{SEARCH_METHOD_NAMES[source]} (hedged)"
+            last_error = results
+    return False, last_error, "Hedged search"
+
+# Signed search-result tokens so imports can reuse facts the search already extracted
+SEARCH_TOKEN_MAX_AGE = int(os.getenv('SEARCH_TOKEN_MAX_AGE', '900'))
+search_token_serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='search-result')
+
+def with_search_tokens(results):
+    """Return copies of the results, each carrying a short-lived signed token of its known facts"""
+    signed = []
+    for result in results:
+        facts = {key: result.get(key) for key in ('video_id', 'title', 'duration', 'channel')}
+        signed.append(dict(result, search_token=search_token_serializer.dumps(facts)))
+    return signed
+
+def load_search_token(token, video_id):
+    """Verify a search token and return its facts if it is fresh and matches video_id"""
+    if not token or not video_id:
+        return None
+    try:
+        facts = search_token_serializer.loads(token, max_age=SEARCH_TOKEN_MAX_AGE)
+    except (BadSignature, SignatureExpired) as e:
+        print(f"⚠️ Ignoring search token: {e}")
+        return None
+    if facts.get('video_id') != video_id:
+        print(f"⚠️ Ignoring search token for {facts.get('video_id')} (importing {video_id})")
+        return None
+    return facts
 
 # YouTube Search and Import API Endpoints
 
@@ -1034,6 +3446,17 @@ def search_youtube_with_api(query, max_results=10):
                     'type': 'boolean',
                     'description': 'Use YouTube API instead of web scraping (requires YOUTUBE_API_KEY)',
                     'default': False
+                },
+                'hedge': {
+                    'type': 'string',
+                    'enum': ['off', 'first', 'merge'],
+                    'description': 'Query the Data API and scraping together: first success wins, or merge both (requires YOUTUBE_API_KEY)',
+                    'default': 'off'
+                },
+                'prefetch': {
+                    'type': 'integer',
+                    'description': 'Probe the top N results in the background for faster import (true = PROBE_PREFETCH_COUNT, capped at PROBE_PREFETCH_MAX)',
+                    'default': 0
                 }
             }
         }
@@ -1056,12 +3479,16 @@ def search_youtube_with_api(query, max_results=10):
                                 'duration': {'type': 'string'},
                                 'thumbnail': {'type': 'string'},
                                 'channel': {'type': 'string'},
-                                'has_full_movie': {'type': 'boolean'}
+                                'views': {'type': 'string'},
+                                'has_full_movie': {'type': 'boolean'},
+                                'search_token': {'type': 'string'}
                             }
                         }
                     },
                     'search_method': {'type': 'string'},
-                    'total_found': {'type': 'integer'}
+                    'total_found': {'type': 'integer'},
+                    'from_cache': {'type': 'boolean'},
+                    'prefetch_queued': {'type': 'integer'}
                 }
             }
         },
@@ -1090,11 +3517,29 @@ def search_youtube_endpoint():
         
         max_results = data.get('max_results', 10)
         use_api = data.get('use_api', False)
+        prefetch = data.get('prefetch', False)
+        hedge = data.get('hedge', SEARCH_HEDGE_MODE)
+        hedge = 'first' if hedge is True else str(hedge or 'off').lower()
+        prefetch_count = PROBE_PREFETCH_COUNT if prefetch is True else int(prefetch or 0)
+        prefetch_count = max(0, min(prefetch_count, PROBE_PREFETCH_MAX))
         
         print(f"🔍 Searching YouTube for: '{query}' (max_results: {max_results}, use_api: {use_api})")
-        
+
+        # Serve repeat searches from the in-memory cache
+        cache_key = search_cache_key(query, max_results, f"{'api' if use_api else 'scrape'}:{hedge}")
+        cached = search_cache.get(cache_key)
+        if cached:
+            print(f"💾 Search cache hit for: '{query}'")
+            prefetch_queued = queue_prefetch(cached['results'], prefetch_count) if prefetch_count else 0
+            return jsonify(dict(cached, results=with_search_tokens(cached['results']), query=query,
+                                from_cache=True, prefetch_queued=prefetch_queued))
+
+        # Race or merge both sources when hedging is requested and an API key is available
+        hedged = hedge in ('first', 'merge') and bool(os.getenv('YOUTUBE_API_KEY'))
+        if hedged:
+            success, results, search_method = hedged_youtube_search(query, max_results, use_api, hedge)
         # Try API first if requested and available
-        if use_api:
+        elif use_api:
             success, results = search_youtube_with_api(query, max_results)
             search_method = "YouTube Data API v3"
         else:
@@ -1102,7 +3547,7 @@ def search_youtube_endpoint():
             search_method = "Web Scraping"
         
         # If API failed and use_api was True, fall back to scraping
-        if not success and use_api:
+        if not success and use_api and not hedged:
             print(f"⚠️ API search failed: {results}. Falling back to web scraping...")
             success, results = search_youtube_videos(query, max_results)
             search_method = "Web Scraping (API fallback)"
@@ -1114,13 +3559,19 @@ def search_youtube_endpoint():
                 'search_method': search_method
             }), 400
         
-        return jsonify({
+        payload = {
             'success': True,
             'results': results,
             'search_method': search_method,
-            'total_found': len(results),
-            'query': query
-        })
+            'total_found': len(results)
+        }
+        search_cache.put(cache_key, payload)
+
+        # Probe the likely picks in the background so a later import is a single DB write
+        prefetch_queued = queue_prefetch(results, prefetch_count) if prefetch_count else 0
+
+        return jsonify(dict(payload, results=with_search_tokens(results), query=query,
+                            from_cache=False, prefetch_queued=prefetch_queued))
         
     except Exception as e:
         print(f"❌ YouTube search endpoint error: {e}")
@@ -1161,6 +3612,10 @@ def search_youtube_endpoint():
                     'type': 'boolean',
                     'description': 'Automatically fetch OMDb metadata in background',
                     'default': True
+                },
+                'search_token': {
+                    'type': 'string',
+                    'description': 'Token from a search result; its title and duration are reused instead of re-scraping'
                 }
             }
         }
@@ -1178,6 +3633,8 @@ def search_youtube_endpoint():
                     'title_extracted': {'type': 'boolean'},
                     'verified': {'type': 'boolean'},
                     'age_restricted': {'type': 'boolean'},
+                    'prefetched': {'type': 'boolean'},
+                    'reused_search_data': {'type': 'boolean'},
                     'message': {'type': 'string'},
                     'warnings': {
                         'type': 'array',
@@ -1228,6 +3685,24 @@ def import_from_search():
                 'details': {'url': url, 'parsed_netloc': parsed.netloc}
             }), 400
         
+        # Reuse probe data prefetched by /api/search-youtube when available
+        probe = get_prefetched_probe(extract_youtube_video_id(url))
+        if probe:
+            print(f"📦 Using prefetched probe data from {probe['probed_at']}")
+
+        # Reuse facts the search already extracted (only missing ones get fetched)
+        search_facts = load_search_token(data.get('search_token'), extract_youtube_video_id(url))
+        if search_facts:
+            print(f"🎟️ Reusing search result data for {search_facts['video_id']}")
+        known_duration = search_facts.get('duration') if search_facts else None
+        if known_duration == 'Unknown':
+            known_duration = None
+
+        # Title lookup and validation share one oEmbed request when both need it
+        oembed = None
+        if not probe and not search_facts and auto_verify and not custom_title:
+            oembed = probe_oembed(url)
+
         # Extract title if not provided
         title_extracted = False
         if custom_title:
@@ -1235,7 +3710,12 @@ def import_from_search():
             print(f"📝 Using custom title: {final_title}")
         else:
             print("🔍 Extracting title from YouTube...")
-            title_success, title_result = fetch_youtube_title(url)
+            if probe:
+                title_success, title_result = probe['title_success'], probe['title']
+            elif search_facts and search_facts.get('title'):
+                title_success, title_result = True, search_facts['title']
+            else:
+                title_success, title_result = fetch_youtube_title(url, oembed=oembed)
             if title_success:
                 extracted_title = title_result
                 final_title = extracted_title
@@ -1257,7 +3737,12 @@ def import_from_search():
         verified = False
         if auto_verify:
             print("🔍 Verifying URL...")
-            is_valid, validation_message = validate_url(url)
+            if probe:
+                is_valid, validation_message = probe['valid'], probe['validation_message']
+            elif search_facts:
+                is_valid, validation_message = True, "Listed in YouTube search results"
+            else:
+                is_valid, validation_message = validate_url(url, oembed=oembed)
             if is_valid:
                 verified = True
                 print(f"✅ URL verified: {validation_message}")
@@ -1267,7 +3752,10 @@ def import_from_search():
         
         # Check for age restrictions
         print("🔍 Checking age restrictions...")
-        is_age_restricted, age_message = check_age_restriction(url)
+        if probe:
+            is_age_restricted, age_message = probe['age_restricted'], probe['age_message']
+        else:
+            is_age_restricted, age_message = check_age_restriction(url)
         if is_age_restricted:
             warnings.append(f"Age-restricted content: {age_message}")
             print(f"🔞 Age restriction detected: {age_message}")
@@ -1276,7 +3764,10 @@ def import_from_search():
 
         # Extract duration
         print("🔍 Extracting video duration...")
-        duration = extract_youtube_duration(url)
+        if probe:
+            duration = probe['duration']
+        else:
+            duration = known_duration or extract_youtube_duration(url)
         if duration:
             print(f"⏱️ Duration extracted: {duration}")
         else:
@@ -1321,38 +3812,17 @@ def import_from_search():
                 }
             }), 400
 
-        # Add movie to database
-        movie_id = add_movie(final_title, url, verified, None, duration)
-        
-        # Update age restriction info
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE movies 
-            SET age_restricted = ?, age_checked_at = ? 
-            WHERE id = ?
-        ''', (int(is_age_restricted), datetime.now().isoformat(), movie_id))
-        conn.commit()
         conn.close()
+
+        # Add movie to database (age restriction info included in the same write)
+        movie_id = add_movie(final_title, url, verified, None, duration, is_age_restricted)
         
         print(f"✅ Movie added with ID: {movie_id}")
         
         # Fetch metadata in background if requested
         if fetch_metadata:
-            def fetch_metadata_background():
-                try:
-                    print(f"🎭 Fetching OMDb metadata for: {final_title}")
-                    success, info = fetch_movie_info(final_title)
-                    if success and isinstance(info, dict):
-                        save_movie_info_cache(movie_id, info)
-                        print(f"✅ Cached OMDb info for movie ID {movie_id}")
-                    else:
-                        print(f"❌ Failed to fetch OMDb info: {info}")
-                except Exception as e:
-                    print(f"❌ Error fetching metadata: {e}")
-            
-            thread = threading.Thread(target=fetch_metadata_background)
-            thread.daemon = True
-            thread.start()
+            task_id, job = enqueue_task('enrich_movie', {'movie_id': movie_id, 'title': final_title, 'url': url,
+                                                         'duration': duration})
         
         return jsonify({
             'success': True,
@@ -1364,6 +3834,10 @@ def import_from_search():
             'verified': verified,
             'age_restricted': is_age_restricted,
             'duration': duration,
+            'task_id': task_id if fetch_metadata else None,
+            'job_id': job.id if fetch_metadata else None,
+            'prefetched': bool(probe),
+            'reused_search_data': bool(search_facts),
             'message': 'Movie imported successfully!' + (' OMDb metadata is being fetched in background.' if fetch_metadata else ''),
             'warnings': warnings
         })
@@ -1529,46 +4003,14 @@ def create_movie():
     # Create the movie first
     movie_id = add_movie(title, url, verified, None)
     
-    # Immediately fetch OMDb info and check age restrictions in background
-    def fetch_movie_data_background():
-        try:
-            print(f"🎬 Fetching movie data for new movie: {title}")
-            
-            # Fetch OMDb info
-            success, info = fetch_movie_info(title)
-            if success and isinstance(info, dict):
-                save_movie_info_cache(movie_id, info)
-                print(f"✅ Cached OMDb info for: {title}")
-            else:
-                print(f"❌ Failed to fetch OMDb info for: {title}")
-            
-            # Check age restrictions
-            is_age_restricted, message = check_age_restriction(url)
-            
-            # Update movie with age restriction info
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE movies 
-                SET age_restricted = ?, age_checked_at = ? 
-                WHERE id = ?
-            ''', (int(is_age_restricted), datetime.now().isoformat(), movie_id))
-            conn.commit()
-            conn.close()
-            
-            print(f"{'🔞' if is_age_restricted else '👍'} Age restriction check for {title}: {message}")
-            
-        except Exception as e:
-            print(f"❌ Error fetching movie data for {title}: {e}")
-    
-    # Start background task
-    thread = threading.Thread(target=fetch_movie_data_background)
-    thread.daemon = True
-    thread.start()
+    # Queue a durable task to fetch OMDb info and check age restrictions
+    task_id, job = enqueue_task('enrich_movie', {'movie_id': movie_id, 'title': title, 'url': url, 'check_age': True})
     
     return jsonify({
         'success': True, 
         'id': movie_id,
+        'task_id': task_id,
+        'job_id': job.id,
         'message': 'Movie added successfully! OMDb info and age restrictions are being checked in the background.'
     })
 
@@ -1669,64 +4111,17 @@ def edit_movie(movie_id):
     
     # If title or URL changed, refresh all associated data in background
     if title_changed or url_changed:
-        def refresh_movie_data_background():
-            try:
-                print(f"🔄 Refreshing data for updated movie: {title}")
-                
-                # Clear existing cache if title changed (since we'll search with new title)
-                if title_changed:
-                    conn = get_db_connection()
-                    cursor = conn.cursor()
-                    cursor.execute('DELETE FROM movie_info_cache WHERE movie_id = ?', (movie_id,))
-                    conn.commit()
-                    conn.close()
-                    print(f"🗑️ Cleared cache for movie {movie_id} due to title change")
-                
-                # Re-fetch OMDb info (especially important if title changed)
-                success, info = fetch_movie_info(title)
-                if success and isinstance(info, dict):
-                    save_movie_info_cache(movie_id, info)
-                    print(f"✅ Refreshed OMDb info for: {title}")
-                else:
-                    print(f"❌ Failed to refresh OMDb info for: {title} - {info}")
-                
-                # Re-verify URL (especially important if URL changed)
-                is_valid, message = validate_url(url)
-                if is_valid:
-                    conn = get_db_connection()
-                    cursor = conn.cursor()
-                    cursor.execute('UPDATE movies SET verified = 1, last_verified = ? WHERE id = ?', 
-                                 (datetime.now().isoformat(), movie_id))
-                    conn.commit()
-                    conn.close()
-                    print(f"✅ URL re-verified for: {title}")
-                else:
-                    print(f"❌ URL verification failed for: {title} - {message}")
-                
-                # Re-check age restrictions
-                is_age_restricted, age_message = check_age_restriction(url)
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE movies 
-                    SET age_restricted = ?, age_checked_at = ? 
-                    WHERE id = ?
-                ''', (int(is_age_restricted), datetime.now().isoformat(), movie_id))
-                conn.commit()
-                conn.close()
-                
-                print(f"{'🔞' if is_age_restricted else '👍'} Age restriction re-checked for {title}: {age_message}")
-                
-            except Exception as e:
-                print(f"❌ Error refreshing movie data for {title}: {e}")
-        
-        # Start background refresh
-        thread = threading.Thread(target=refresh_movie_data_background)
-        thread.daemon = True
-        thread.start()
+        # Queue a durable refresh of all associated data
+        task_id, job = enqueue_task('enrich_movie', {
+            'movie_id': movie_id, 'title': title, 'url': url,
+            'previous_title': current_title if title_changed else None,
+            'verify': True, 'check_age': True
+        })
         
         return jsonify({
             'success': True, 
+            'task_id': task_id,
+            'job_id': job.id,
             'message': f'Movie {movie_id} updated. Data refresh started in background.',
             'data_refresh_triggered': True
         })
@@ -2106,43 +4501,33 @@ def get_movie_info(movie_id):
     """
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT title FROM movies WHERE id = ?", (movie_id,))
+    cursor.execute("SELECT title, duration FROM movies WHERE id = ?", (movie_id,))
     row = cursor.fetchone()
     conn.close()
     
     if not row:
         return jsonify({'success': False, 'error': 'Movie not found'}), 404
     
-    # Check cache first
-    cached_info = get_movie_info_cache(movie_id)
+    # Check cache first; expired entries are served while a background task revalidates them
+    cached_info = get_movie_info_cache(movie_id, allow_stale=True)
     if cached_info:
+        revalidating = cached_info['stale'] and revalidate_movie_info(movie_id, row[0], row[1])
         return jsonify({
             'success': True,
             'info': cached_info,
             'from_cache': True,
+            'stale': cached_info['stale'],
+            'revalidating': bool(revalidating),
             'searched_title': 'N/A (cached)',
             'original_title': row[0]
         })
     
-    # Clean up title for better search results, but be less aggressive
-    title = row[0]
-    original_title = title
-    
-    # Remove common YouTube suffixes that might interfere with search
-    title = re.sub(r'\s*-\s*Official Trailer.*$', '', title, flags=re.IGNORECASE)
-    title = re.sub(r'\s*-\s*Trailer.*$', '', title, flags=re.IGNORECASE)
-    title = re.sub(r'\s*-\s*Full Movie.*$', '', title, flags=re.IGNORECASE)
-    title = re.sub(r'\s*\[.*?\]\s*$', '', title)  # Remove [anything] at end
-    title = re.sub(r'\s*\(.*?trailer.*?\)\s*$', '', title, flags=re.IGNORECASE)  # Remove (trailer) at end
-    
-    # Only remove year if it's clearly at the end and in parentheses
-    title = re.sub(r'\s*\(19\d{2}\)\s*$', '', title)  # 1900s years
-    title = re.sub(r'\s*\(20\d{2}\)\s*$', '', title)  # 2000s years
-    
-    title = title.strip()
+    # Year hints and uploader noise are split off the title before searching
+    original_title = row[0]
+    title, year = parse_title_hints(original_title)
     
     print(f"🔍 No cache found, fetching from API for movie ID {movie_id}")
-    success, info = fetch_movie_info(title)
+    success, info = fetch_movie_info(original_title, duration=row[1])
     
     # If successful, cache the result
     if success and isinstance(info, dict):
@@ -2153,7 +4538,7 @@ def get_movie_info(movie_id):
         'success': success,
         'info': info if success else None,
         'error': info if not success else None,
-        'searched_title': title,
+        'searched_title': f"{title} ({year})" if year else title,
         'original_title': original_title,
         'from_cache': False
     })
@@ -2163,9 +4548,18 @@ def clear_movie_cache(movie_id):
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
+        row = cursor.execute('SELECT title FROM movies WHERE id = ?', (movie_id,)).fetchone()
+        # Also drop the shared OMDb result this movie points to, so the next view refetches it
+        cursor.execute('''
+            DELETE FROM omdb_result_cache WHERE query_key IN (
+                SELECT omdb_query_key FROM movie_info_cache WHERE movie_id = ?
+            )
+        ''', (movie_id,))
         cursor.execute('DELETE FROM movie_info_cache WHERE movie_id = ?', (movie_id,))
         conn.commit()
         conn.close()
+        if row:
+            clear_omdb_miss(row[0])
         return jsonify({'success': True, 'message': f'Cache cleared for movie {movie_id}'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2291,10 +4685,25 @@ def validate_url_endpoint():
 
 @app.route('/api/verify-all-movies', methods=['POST'])
 def verify_all_movies():
-    """Start background verification of all movie URLs
+    """Start background verification of all movie URLs (or only those due for a re-check)
     ---
     tags:
       - admin
+    parameters:
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            due_only:
+              type: boolean
+              description: Only check movies whose adaptive re-check is due, most urgent first
+              example: true
+            budget:
+              type: integer
+              description: Maximum number of movies to check when due_only is set (default VERIFY_BUDGET)
+              example: 50
     responses:
       200:
         description: Verification process started successfully
@@ -2304,21 +4713,88 @@ def verify_all_movies():
             success:
               type: boolean
               example: true
+            job_id:
+              type: string
+              example: "c27b9e04f1d3"
+            attached:
+              type: boolean
+              description: True when a verification covering this request was already running and this request joined it
+            scope:
+              type: string
+              enum: [all, due]
+              description: What the returned job checks - every movie, or only movies that are due
             message:
               type: string
               example: "Verification of all movies started in background"
     """
-    thread = threading.Thread(target=test_urls_background)
-    thread.daemon = True
-    thread.start()
-    return jsonify({'success': True, 'message': 'Verification of all movies started in background'})
+    data = request.get_json(silent=True) or {}
+    if data.get('due_only'):
+        try:
+            budget = max(1, int(data.get('budget') or VERIFY_BUDGET))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'budget must be an integer'}), 400
+        elsewhere = (running_elsewhere_response('library:verify', 'Verification of all movies')
+                     or running_elsewhere_response('library:verify:due', 'Verification of due movies'))
+        if elsewhere:
+            return elsewhere
+        job, started = start_verification('verify_due_movies', budget=budget)
+    else:
+        elsewhere = running_elsewhere_response('library:verify', 'Verification of all movies')
+        if elsewhere:
+            return elsewhere
+        job, started = start_verification('verify_all_movies')
+
+    what = 'Verification of all movies' if job.key == 'library:verify' else 'Verification of due movies'
+    return jsonify({'success': True, 'job_id': job.id, 'attached': not started,
+                    'scope': 'all' if job.key == 'library:verify' else 'due',
+                    'message': f"{what} {'started in background' if started else 'is already running'}"})
+
+@app.route('/api/movies/<int:movie_id>/availability', methods=['GET'])
+def movie_availability(movie_id):
+    """Availability check history and next scheduled re-check for one movie
+    ---
+    tags:
+      - movies
+    parameters:
+      - name: movie_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Recent checks (newest first), current streak and next check time
+      404:
+        description: Movie not found
+    """
+    conn = get_db_connection()
+    movie = conn.execute('SELECT id, verified, last_verified, verify_streak, next_verify_at FROM movies WHERE id = ?',
+                         (movie_id,)).fetchone()
+    if not movie:
+        conn.close()
+        return jsonify({'success': False, 'error': 'Movie not found'}), 404
+    checks = conn.execute('SELECT checked_at, available, method, detail FROM availability_checks '
+                          'WHERE movie_id = ? ORDER BY id DESC', (movie_id,)).fetchall()
+    conn.close()
+    return jsonify({
+        'success': True,
+        'movie_id': movie_id,
+        'verified': bool(movie['verified']),
+        'last_verified': movie['last_verified'],
+        'stable_streak': movie['verify_streak'] or 0,
+        'next_verify_at': movie['next_verify_at'],
+        'checks': [dict(check, available=None if check['available'] is None else bool(check['available']))
+                   for check in checks]
+    })
 
 @app.route('/api/test-urls', methods=['POST'])
 def test_urls():
-    thread = threading.Thread(target=test_urls_background)
-    thread.daemon = True
-    thread.start()
-    return jsonify({'success': True, 'message': 'URL testing started'})
+    # Same full scan as verify-all-movies, so both endpoints share one running job (and one lease)
+    elsewhere = running_elsewhere_response('library:verify', 'URL testing')
+    if elsewhere:
+        return elsewhere
+    job, started = start_verification('test_urls')
+    return jsonify({'success': True, 'job_id': job.id, 'attached': not started,
+                    'message': 'URL testing started' if started else 'URL testing is already running'})
 
 @app.route("/movie/<int:movie_id>/verify", methods=['POST'])
 def verify_movie(movie_id):
@@ -2371,6 +4847,32 @@ def movie_detail(movie_id):
 def admin():
     return render_template('admin.html')
 
+@app.route('/api/admin/upstream-usage', methods=['GET'])
+def get_upstream_usage():
+    """Outbound upstream calls from the ledger: rolling totals per endpoint, daily history and the OMDb budget
+    ---
+    tags:
+      - admin
+    parameters:
+      - name: hours
+        in: query
+        type: integer
+        required: false
+        default: 24
+        description: Length of the rolling window for the totals
+    responses:
+      200:
+        description: Call counts, errors, bytes and latency per upstream and endpoint
+    """
+    hours = request.args.get('hours', 24, type=int) or 24
+    return jsonify({
+        'success': True,
+        'window_hours': hours,
+        'totals': upstream_ledger.totals(hours, by_endpoint=True),
+        'daily': upstream_ledger.daily(),
+        'omdb_budget': omdb_budget()
+    })
+
 @app.route('/api/admin/stats', methods=['GET'])
 def get_admin_stats():
     """Get comprehensive database statistics
@@ -2409,6 +4911,23 @@ def get_admin_stats():
                   type: integer
                   description: Number of cached movie info entries
                   example: 135
+                omdb_miss_entries:
+                  type: integer
+                  description: Number of titles OMDb recently reported as not found
+                  example: 4
+                omdb_result_entries:
+                  type: integer
+                  description: Number of distinct OMDb results shared across the library
+                  example: 120
+                search_cache:
+                  type: object
+                  description: YouTube search cache size, TTL and hit/miss counters
+                jobs:
+                  type: object
+                  description: Background job pool size and job counts by status
+                tasks:
+                  type: object
+                  description: Durable task counts by status (pending, leased, done, dead)
                 oldest_cache:
                   type: string
                   description: Timestamp of oldest cache entry
@@ -2458,6 +4977,23 @@ def get_admin_stats():
         oldest_cache = cursor.execute('SELECT MIN(cached_at) FROM movie_info_cache WHERE cached_at IS NOT NULL').fetchone()[0]
         stats['oldest_cache'] = oldest_cache
 
+        # Get OMDb miss cache statistics (unexpired entries only)
+        stats['omdb_miss_entries'] = cursor.execute('SELECT COUNT(*) FROM omdb_miss_cache WHERE expires_at > ?',
+                                                    (datetime.now().isoformat(),)).fetchone()[0]
+        stats['omdb_result_entries'] = cursor.execute('SELECT COUNT(*) FROM omdb_result_cache').fetchone()[0]
+
+        # In-memory YouTube search cache counters
+        stats['search_cache'] = search_cache.stats()
+        stats['jobs'] = job_registry.stats()
+        stats['tasks'] = task_queue.counts()
+        stats['events'] = event_bus.stats()
+        stats['upstreams'] = {'omdb': omdb_limiter.stats(), 'youtube': youtube_limiter.stats()}
+        stats['verification'] = verification_schedule_stats(conn)
+        stats['upstream_usage'] = upstream_ledger.totals()
+        stats['omdb_budget'] = omdb_budget()
+        stats['leases'] = job_leases.list()
+        stats['parsing'] = dict(parse_stats, processes=PARSE_PROCESSES if parse_offload_enabled() else 0)
+
         # Get last verification date (global)
         last_verified = cursor.execute('SELECT MAX(last_verified) FROM movies WHERE last_verified IS NOT NULL').fetchone()[0]
         stats['last_verification'] = last_verified
@@ -2509,12 +5045,62 @@ def clear_all_cache():
         conn = get_db_connection()
         cursor = conn.cursor()
         cursor.execute('DELETE FROM movie_info_cache')
+        cursor.execute('DELETE FROM omdb_miss_cache')
+        cursor.execute('DELETE FROM omdb_result_cache')
         conn.commit()
         conn.close()
         return jsonify({'success': True, 'message': 'All cache cleared successfully'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def start_library_refresh():
+    """Join the active refresh run or queue a new one; called while holding the library:refresh lease"""
+    # A refresh that is still queued (possibly from before a restart) is joined, not restarted
+    run_id = task_queue.active_group('refresh_movie_info')
+    if run_id:
+        job = kick_task_queue()
+        return jsonify({'success': True, 'job_id': job.id, 'run_id': run_id, 'attached': True,
+                        'progress': task_queue.counts(run_id), 'message': 'Cache refresh is already running'})
+
+    refresh_started = datetime.now()
+    run_id = f"refresh:{refresh_started.isoformat()}"
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    # Films resolved before are refreshed by IMDb ID (one call each) instead of a title search
+    resolved = {row[0]: (row[1], row[2]) for row in cursor.execute(
+        "SELECT movie_id, imdb_id, omdb_query_key FROM movie_info_cache WHERE imdb_id IS NOT NULL AND imdb_id != ''"
+    ).fetchall()}
+    
+    # Existing entries keep being served and are replaced one by one as each refresh succeeds.
+    # One durable task per movie, so a restart continues where the refresh stopped
+    movies = cursor.execute('SELECT id, title, duration FROM movies').fetchall()
+    conn.close()
+
+    # Plan against the OMDb budget: what fits now runs now, the rest waits for the rolling window
+    budget = omdb_budget()
+    estimated_calls = sum(1 if movie_id in resolved else OMDB_CALLS_PER_TITLE_REFRESH for movie_id, _, _ in movies)
+    overflow = max(0, estimated_calls - budget['bulk_remaining'])
+    per_window = max(1, budget['limit'] - budget['interactive_reserve'])
+    plan = {'estimated_calls': estimated_calls, 'budget': budget, 'fits_in_budget': overflow == 0,
+            'windows_needed': 1 + -(-overflow // per_window)}
+
+    task_queue.enqueue_many('refresh_movie_info', [{
+        'movie_id': movie_id, 'title': title, 'duration': duration,
+        'imdb_id': resolved.get(movie_id, (None, None))[0], 'query_key': resolved.get(movie_id, (None, None))[1],
+        'fresh_since': refresh_started.isoformat()
+    } for movie_id, title, duration in movies], group=run_id)
+    print(f"🔄 Queued cache refresh for {len(movies)} movies ({run_id}), ~{estimated_calls} OMDb calls, "
+          f"{budget['bulk_remaining']} left in today's budget")
+    job = kick_task_queue()
+
+    message = 'Cache refresh started in background'
+    if not plan['fits_in_budget']:
+        message += (f"; about {estimated_calls} OMDb calls are needed but {budget['bulk_remaining']} remain in the "
+                    f"24h budget, so the refresh will continue as the window frees up")
+    return jsonify({'success': True, 'job_id': job.id, 'run_id': run_id, 'attached': False, 'queued': len(movies),
+                    'plan': plan, 'message': message})
+
 @app.route('/api/admin/refresh-all-cache', methods=['POST'])
 def refresh_all_cache():
     """Start background refresh of all cached movie information
@@ -2530,53 +5116,184 @@ def refresh_all_cache():
             success:
               type: boolean
               example: true
+            job_id:
+              type: string
+              example: "c27b9e04f1d3"
+            attached:
+              type: boolean
+              description: True when an identical library-wide job was already running and this request joined it
             message:
               type: string
               example: "Cache refresh started in background"
     """
-    def refresh_cache_background():
+    # Deciding whether to join or queue is guarded across workers, so two requests can't both queue a run
+    if not job_leases.acquire('library:refresh'):
+        return jsonify({'success': True, 'job_id': None, 'attached': True,
+                        'message': 'Cache refresh is being queued by another worker'})
+    try:
+        return start_library_refresh()
+    finally:
+        job_leases.release('library:refresh')
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """List recent background jobs, newest first
+    ---
+    tags:
+      - admin
+    parameters:
+      - name: status
+        in: query
+        type: string
+        enum: [queued, running, succeeded, failed, cancelled, skipped]
+        required: false
+        description: Only return jobs with this status
+    responses:
+      200:
+        description: Recent jobs with progress counters and timings
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            jobs:
+              type: array
+              items:
+                type: object
+            stats:
+              type: object
+    """
+    return jsonify({
+        'success': True,
+        'jobs': job_registry.list(request.args.get('status')),
+        'stats': job_registry.stats()
+    })
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status, progress and timings of one background job
+    ---
+    tags:
+      - admin
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Job details
+      404:
+        description: Unknown or expired job ID
+    """
+    job = job_registry.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+def format_sse_event(event):
+    """Serialize a bus event as a Server-Sent Events frame"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Server-Sent Events stream of job progress, movie enrichment and library changes
+    ---
+    tags:
+      - admin
+    produces:
+      - text/event-stream
+    parameters:
+      - name: types
+        in: query
+        type: string
+        required: false
+        description: Comma-separated event types or prefixes to receive (e.g. job,library.changed)
+      - name: Last-Event-ID
+        in: header
+        type: integer
+        required: false
+        description: Replay buffered events newer than this ID (sent automatically by EventSource on reconnect)
+    responses:
+      200:
+        description: "Event stream; event types are job.queued, job.started, job.progress, job.finished, movie.enriched, library.changed and task.dead"
+    """
+    types = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()]
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    def wanted(event):
+        return not types or any(event['type'] == t or event['type'].startswith(t + '.') for t in types)
+
+    subscriber = event_bus.subscribe(last_event_id)
+
+    def generate():
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Clear all existing cache
-            cursor.execute('DELETE FROM movie_info_cache')
-            conn.commit()
-            
-            # Get all movies
-            movies = cursor.execute('SELECT id, title FROM movies').fetchall()
-            conn.close()
-            
-            print(f"🔄 Starting cache refresh for {len(movies)} movies")
-            
-            for i, movie in enumerate(movies, 1):
-                movie_id, title = movie
+            yield "retry: 3000\n\n"
+            while job_registry.accepting:
                 try:
-                    print(f"🔍 Refreshing cache {i}/{len(movies)}: {title}")
-                    
-                    success, info = fetch_movie_info(title)
-                    if success and isinstance(info, dict):
-                        save_movie_info_cache(movie_id, info)
-                        print(f"✅ Cached info for: {title}")
-                    else:
-                        print(f"❌ Failed to fetch info for: {title}")
-                    
-                    # Small delay to be respectful to OMDb API
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    print(f"❌ Error refreshing {title}: {e}")
-            
-            print("✅ Cache refresh completed")
-            
-        except Exception as e:
-            print(f"❌ Cache refresh error: {e}")
-    
-    thread = threading.Thread(target=refresh_cache_background)
-    thread.daemon = True
-    thread.start()
-    
-    return jsonify({'success': True, 'message': 'Cache refresh started in background'})
+                    event = subscriber.get(timeout=EVENTS_HEARTBEAT_SECONDS)
+                except Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if wanted(event):
+                    yield format_sse_event(event)
+        finally:
+            event_bus.unsubscribe(subscriber)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/tasks', methods=['GET'])
+def list_tasks():
+    """Durable task queue status and dead-lettered tasks
+    ---
+    tags:
+      - admin
+    parameters:
+      - name: group
+        in: query
+        type: string
+        required: false
+        description: Only count tasks in this group (e.g. a refresh run_id)
+    responses:
+      200:
+        description: Task counts by status and the most recent dead letters
+    """
+    return jsonify({
+        'success': True,
+        'counts': task_queue.counts(request.args.get('group')),
+        'dead_letters': task_queue.dead_letters()
+    })
+
+@app.route('/api/tasks/retry-dead', methods=['POST'])
+def retry_dead_tasks():
+    """Move dead-lettered tasks back to the queue
+    ---
+    tags:
+      - admin
+    parameters:
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            task_id:
+              type: integer
+              description: Retry only this task (default all dead letters)
+    responses:
+      200:
+        description: Number of tasks requeued
+    """
+    data = request.get_json(silent=True) or {}
+    count = task_queue.retry_dead(data.get('task_id'))
+    job = kick_task_queue() if count else None
+    return jsonify({'success': True, 'requeued': count, 'job_id': job.id if job else None})
 
 @app.route('/api/check-age-restrictions', methods=['POST'])
 def check_age_restrictions():
@@ -2593,22 +5310,47 @@ def check_age_restrictions():
             success:
               type: boolean
               example: true
+            job_id:
+              type: string
+              example: "8d41e07c5a12"
+            attached:
+              type: boolean
+              description: True when an age check was already running and this request joined it
             message:
               type: string
               example: "Age restriction check started in background"
     """
-    def check_age_restrictions_background():
+    def check_age_restrictions_background(job):
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
             
             # Get all movies
-            movies = cursor.execute('SELECT id, title, url FROM movies').fetchall()
+            movies = cursor.execute('SELECT id, title, url, video_id FROM movies').fetchall()
+
+            # With a YouTube API key, read age ratings in batches of 50 instead of scraping each page
+            job.set_total(len(movies))
+            details = fetch_youtube_video_details([movie[3] for movie in movies])
+            for movie_id, title, url, video_id in movies:
+                if video_id in details:
+                    info = details[video_id]
+                    is_age_restricted = bool(info and info['age_restricted'])
+                    cursor.execute('''
+                        UPDATE movies 
+                        SET age_restricted = ?, age_checked_at = ? 
+                        WHERE id = ?
+                    ''', (int(is_age_restricted), datetime.now().isoformat(), movie_id))
+                    job.advance()
+            conn.commit()
+            movies = [movie[:3] for movie in movies if movie[3] not in details]
             conn.close()
             
             print(f"🔞 Starting age restriction check for {len(movies)} movies")
             
             for i, movie in enumerate(movies, 1):
+                if job.should_stop():
+                    print("⏹️ Age restriction check stopped for shutdown")
+                    break
                 movie_id, title, url = movie
                 try:
                     print(f"🔍 Checking age restrictions {i}/{len(movies)}: {title}")
@@ -2627,23 +5369,32 @@ def check_age_restrictions():
                     conn.close()
                     
                     print(f"{'🔞' if is_age_restricted else '👍'} {title}: {message}")
+                    job.advance()
                     
                     # Small delay to be respectful
                     time.sleep(0.5)
                     
                 except Exception as e:
                     print(f"❌ Error checking {title}: {e}")
+                    job.advance(False)
             
             print("✅ Age restriction check completed")
             
         except Exception as e:
             print(f"❌ Age restriction check error: {e}")
+            raise
     
-    thread = threading.Thread(target=check_age_restrictions_background)
-    thread.daemon = True
-    thread.start()
+    elsewhere = running_elsewhere_response('library:age_check', 'Age restriction check')
+    if elsewhere:
+        return elsewhere
+    job, started = job_registry.single_flight('library:age_check', 'check_age_restrictions', run_exclusively(
+        'library:age_check', in_lane(PRIORITY_BULK, check_age_restrictions_background)))
+    if not started:
+        return jsonify({'success': True, 'job_id': job.id, 'attached': True,
+                        'message': 'Age restriction check is already running'})
     
-    return jsonify({'success': True, 'message': 'Age restriction check started in background'})
+    return jsonify({'success': True, 'job_id': job.id, 'attached': False,
+                    'message': 'Age restriction check started in background'})
 
 @app.route('/genres')
 def genres():
@@ -2859,5 +5610,20 @@ if __name__ == '__main__':
     print(f"🎬 Starting YouTube Movie Picker on {host}:{port}")
     print(f"📡 API Documentation: http://{host}:{port}/api/docs/")
     print(f"🗂️ Database: {get_db_path()}")
-    
-    app.run(host=host, port=port, debug=debug)
+
+    # Container stops send SIGTERM; turn it into a normal exit so background jobs can drain
+    def handle_sigterm(signum, frame):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)  # a second SIGTERM exits immediately
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    start_parse_pool()
+    resume_tasks()
+    schedule_verification_sweep()
+    try:
+        app.run(host=host, port=port, debug=debug)
+    except KeyboardInterrupt:
+        print("🛑 Shutting down")
+    finally:
+        job_registry.shutdown()
+        shutdown_parse_pool()
@@ -0,0 +1,329 @@
+"""
+Local stand-in for YouTube, the YouTube Data API and OMDb.
+
+Serves recorded pages from a fixtures directory when present and synthetic
+pages otherwise, with configurable latency, error rate and 429 injection, so
+import, verify and refresh jobs can be benchmarked offline.
+
+Usage:
+    python fake_upstream.py --port 8099 --latency-ms 150 --error-rate 0.02 --rate-limit-rate 0.05
+
+Then point the app at it:
+    OMDB_BASE_URL=http://127.0.0.1:8099
+    YOUTUBE_BASE_URL=http://127.0.0.1:8099
+    YOUTUBE_API_BASE_URL=http://127.0.0.1:8099/youtube/v3
+
+Fixtures layout (all optional):
+    <fixtures>/watch/<video_id>.html     recorded watch pages
+    <fixtures>/embed/<video_id>.html     recorded embed pages
+    <fixtures>/search/<query-slug>.html  recorded search result pages
+    <fixtures>/omdb/<title-slug>.json    recorded OMDb responses
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def slugify(value):
+    """Turn a title or query into a fixture file name"""
+    return re.sub(r'[^a-z0-9]+', '-', (value or '').lower()).strip('-')
+
+
+def fake_video_id(seed):
+    """Deterministic 11-character video ID for a seed string"""
+    return hashlib.sha1(seed.encode('utf-8')).hexdigest()[:11]
+
+
+def fake_length_seconds(video_id):
+    """Deterministic feature-length duration (80-150 minutes) for a video ID"""
+    return 4800 + int(video_id[:4], 16) % 4200
+
+
+class UpstreamStats:
+    """Thread-safe request counters reported at /__stats"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, route, status):
+        with self._lock:
+            key = f"{route} {status}"
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    server_version = "FakeUpstream/1.0"
+
+    # ----- plumbing -----
+
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+    def do_HEAD(self):
+        self.handle_request(head_only=True)
+
+    def do_GET(self):
+        self.handle_request()
+
+    def handle_request(self, head_only=False):
+        options = self.server.options
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        route = self.route_name(parsed.path, query)
+
+        if parsed.path == '/__stats':
+            return self.send_body(200, 'application/json', json.dumps(self.server.stats.snapshot()).encode(), route)
+
+        # Simulated network latency
+        delay = max(0.0, random.gauss(options.latency_ms, options.jitter_ms)) / 1000
+        if delay:
+            time.sleep(delay)
+
+        # Fault injection
+        roll = random.random()
+        if roll < options.rate_limit_rate:
+            return self.send_body(429, 'text/plain', b'Too Many Requests', route, head_only)
+        if roll < options.rate_limit_rate + options.error_rate:
+            return self.send_body(503, 'text/plain', b'Service Unavailable', route, head_only)
+
+        handler = {
+            'watch': self.serve_watch,
+            'embed': self.serve_embed,
+            'oembed': self.serve_oembed,
+            'search': self.serve_search,
+            'api-videos': self.serve_api_videos,
+            'api-search': self.serve_api_search,
+            'omdb': self.serve_omdb,
+        }.get(route)
+        if not handler:
+            return self.send_body(404, 'text/plain', b'Not Found', route, head_only)
+
+        status, content_type, body = handler(parsed.path, query)
+        self.send_body(status, content_type, body, route, head_only)
+
+    def route_name(self, path, query):
+        if path == '/watch':
+            return 'watch'
+        if path.startswith('/embed/'):
+            return 'embed'
+        if path == '/oembed':
+            return 'oembed'
+        if path == '/results':
+            return 'search'
+        if path.endswith('/youtube/v3/videos'):
+            return 'api-videos'
+        if path.endswith('/youtube/v3/search'):
+            return 'api-search'
+        if path in ('', '/') and any(key in query for key in ('t', 'i', 's')):
+            return 'omdb'
+        return 'unknown'
+
+    def send_body(self, status, content_type, body, route, head_only=False):
+        self.server.stats.record(route, status)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def read_fixture(self, *parts):
+        if not self.server.options.fixtures:
+            return None
+        path = os.path.join(self.server.options.fixtures, *parts)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        return None
+
+    def is_missing(self, video_id):
+        """Video IDs starting with 'gone' behave like removed videos"""
+        return video_id.startswith('gone')
+
+    def is_age_restricted(self, video_id):
+        """Video IDs starting with 'age' behave like age-restricted videos"""
+        return video_id.startswith('age')
+
+    # ----- YouTube pages -----
+
+    def serve_watch(self, path, query):
+        video_id = query.get('v', '')
+        recorded = self.read_fixture('watch', f"{video_id}.html")
+        if recorded:
+            return 200, 'text/html; charset=utf-8', recorded
+
+        # YouTube answers 200 for removed videos too - only the page content differs
+        title = "Video unavailable" if self.is_missing(video_id) else f"Fake Movie {video_id}"
+        gate = 'Sign in to confirm your age' if self.is_age_restricted(video_id) else ''
+        head = (
+            f'<html><head><title>{title} - YouTube</title>'
+            f'<meta property="og:title" content="{title}"></head><body>'
+        )
+        # Pad like a real ~1 MB page, with the interesting fields near the end as YouTube does
+        padding = 'x' * max(0, self.server.options.page_bytes - 600)
+        tail = (
+            f'<script>{padding}</script>'
+            f'<script>var ytInitialPlayerResponse = {{"videoDetails":{{"videoId":"{video_id}",'
+            f'"title":"{title}","lengthSeconds":"{fake_length_seconds(video_id)}"}}}};</script>'
+            f'{gate}</body></html>'
+        )
+        return 200, 'text/html; charset=utf-8', (head + tail).encode('utf-8')
+
+    def serve_embed(self, path, query):
+        video_id = path.rsplit('/', 1)[-1]
+        recorded = self.read_fixture('embed', f"{video_id}.html")
+        if recorded:
+            return 200, 'text/html; charset=utf-8', recorded
+        status = 'LOGIN_REQUIRED' if self.is_age_restricted(video_id) else 'OK'
+        body = f'<html><script>{{"playabilityStatus":{{"status":"{status}"}}}}</script>{"y" * 20000}</html>'
+        return 200, 'text/html; charset=utf-8', body.encode('utf-8')
+
+    def serve_oembed(self, path, query):
+        video_id = parse_qs(urlparse(query.get('url', '')).query).get('v', [''])[0]
+        if not video_id or self.is_missing(video_id):
+            return 404, 'text/plain', b'Not Found'
+        body = {'title': f"Fake Movie {video_id}", 'author_name': 'Fake Channel', 'type': 'video'}
+        return 200, 'application/json', json.dumps(body).encode('utf-8')
+
+    def serve_search(self, path, query):
+        search_query = query.get('search_query', '')
+        recorded = self.read_fixture('search', f"{slugify(search_query)}.html")
+        if recorded:
+            return 200, 'text/html; charset=utf-8', recorded
+
+        renderers = []
+        for i in range(20):
+            video_id = fake_video_id(f"{search_query}-{i}")
+            seconds = fake_length_seconds(video_id)
+            renderers.append({'videoRenderer': {
+                'videoId': video_id,
+                'title': {'runs': [{'text': f"{search_query.title()} Part {i + 1} Full Movie"}]},
+                'lengthText': {'simpleText': f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"},
+                'ownerText': {'runs': [{'text': 'Fake Channel'}]},
+                'viewCountText': {'simpleText': f"{1000 * (i + 1):,} views"}
+            }})
+        initial_data = {'contents': {'twoColumnSearchResultsRenderer': {'primaryContents': {
+            'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': renderers}}]}}}}}
+        body = f'<html><script>var ytInitialData = {json.dumps(initial_data)};</script></html>'
+        return 200, 'text/html; charset=utf-8', body.encode('utf-8')
+
+    # ----- YouTube Data API -----
+
+    def serve_api_videos(self, path, query):
+        items = []
+        for video_id in filter(None, query.get('id', '').split(',')):
+            if self.is_missing(video_id):
+                continue
+            seconds = fake_length_seconds(video_id)
+            content = {'duration': f"PT{seconds // 3600}H{seconds % 3600 // 60}M{seconds % 60}S"}
+            if self.is_age_restricted(video_id):
+                content['contentRating'] = {'ytRating': 'ytAgeRestricted'}
+            items.append({'id': video_id, 'contentDetails': content,
+                          'status': {'privacyStatus': 'public', 'uploadStatus': 'processed', 'embeddable': True}})
+        return 200, 'application/json', json.dumps({'items': items}).encode('utf-8')
+
+    def serve_api_search(self, path, query):
+        search_query = query.get('q', '')
+        items = []
+        for i in range(int(query.get('maxResults', 10))):
+            video_id = fake_video_id(f"{search_query}-{i}")
+            items.append({'id': {'videoId': video_id}, 'snippet': {
+                'title': f"{search_query.title()} Part {i + 1}",
+                'thumbnails': {'high': {'url': f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"}},
+                'channelTitle': 'Fake Channel',
+                'publishedAt': '2020-01-01T00:00:00Z',
+                'description': 'Synthetic search result'
+            }})
+        return 200, 'application/json', json.dumps({'items': items}).encode('utf-8')
+
+    # ----- OMDb -----
+
+    def serve_omdb(self, path, query):
+        title = query.get('t') or query.get('s') or query.get('i') or ''
+        recorded = self.read_fixture('omdb', f"{slugify(title)}.json")
+        if recorded:
+            return 200, 'application/json', recorded
+
+        # Titles containing "unknown" are never found, like obscure uploads
+        if 'unknown' in title.lower():
+            return 200, 'application/json', json.dumps({'Response': 'False', 'Error': 'Movie not found!'}).encode()
+
+        # i= lookups resolve IDs handed out by earlier t= / s= responses
+        year = query.get('y') or '1999'
+        if 'i' in query:
+            title, year = self.server.omdb_ids.get(query['i'], (title, year))
+        imdb_id = query.get('i') or 'tt' + str(int(hashlib.sha1(title.lower().encode()).hexdigest()[:7], 16)).zfill(7)[:7]
+        self.server.omdb_ids[imdb_id] = (title, year)
+        movie = {
+            'Title': title.title(), 'Year': year, 'Runtime': '120 min',
+            'Genre': 'Drama', 'Director': 'Fake Director', 'Actors': 'Actor One, Actor Two',
+            'Plot': 'A synthetic plot for offline benchmarking.', 'Poster': 'N/A',
+            'imdbRating': '7.0', 'imdbID': imdb_id, 'Type': 'movie', 'Response': 'True'
+        }
+        if 's' in query:
+            body = {'Search': [{key: movie[key] for key in ('Title', 'Year', 'imdbID', 'Type', 'Poster')}],
+                    'totalResults': '1', 'Response': 'True'}
+        else:
+            body = movie
+        return 200, 'application/json', json.dumps(body).encode('utf-8')
+
+
+def create_server(host='127.0.0.1', port=8099, **options):
+    """Build (but do not start) a fake upstream server; handy for tests and scripts"""
+    defaults = {
+        'latency_ms': 0.0, 'jitter_ms': 0.0, 'error_rate': 0.0, 'rate_limit_rate': 0.0,
+        'page_bytes': 1024 * 1024, 'fixtures': None, 'verbose': False
+    }
+    defaults.update(options)
+    server = ThreadingHTTPServer((host, port), FakeUpstreamHandler)
+    server.daemon_threads = True
+    server.options = argparse.Namespace(**defaults)
+    server.stats = UpstreamStats()
+    server.omdb_ids = {}
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake YouTube/OMDb upstream for offline benchmarking')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency-ms', type=float, default=100.0, help='Mean added latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=30.0, help='Standard deviation of added latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--page-bytes', type=int, default=1024 * 1024, help='Size of synthetic watch pages')
+    parser.add_argument('--fixtures', default=None, help='Directory with recorded pages (see module docstring)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                           page_bytes=args.page_bytes, fixtures=args.fixtures, verbose=args.verbose)
+    print(f"🧪 Fake upstream listening on http://{args.host}:{args.port}")
+    print(f"   OMDB_BASE_URL=http://{args.host}:{args.port}")
+    print(f"   YOUTUBE_BASE_URL=http://{args.host}:{args.port}")
+    print(f"   YOUTUBE_API_BASE_URL=http://{args.host}:{args.port}/youtube/v3")
+    print(f"📊 Request counts: http://{args.host}:{args.port}/__stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Fake upstream stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
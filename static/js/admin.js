@@ -98,6 +98,11 @@ async function loadStatistics() {
         document.getElementById('lastVerification').textContent = 'Never';
       }
       
+      if (stats.data.omdb_budget) {
+        const budget = stats.data.omdb_budget;
+        document.getElementById('omdbUsage').textContent = `${budget.used_24h} / ${budget.limit}`;
+      }
+      
       if (stats.data.last_age_check) {
         document.getElementById('lastAgeCheck').textContent = new Date(stats.data.last_age_check).toLocaleString();
       } else {
@@ -109,6 +114,76 @@ async function loadStatistics() {
   }
 }
 
+let statsReloadTimer = null;
+let eventsConnected = false;
+
+// Coalesce bursts of events into a single stats reload
+function scheduleStatisticsReload() {
+  clearTimeout(statsReloadTimer);
+  statsReloadTimer = setTimeout(loadStatistics, 1000);
+}
+
+function describeJob(job) {
+  const label = job.meta && job.meta.run_id ? `${job.name} (${job.meta.run_id})` : job.name;
+  return job.total ? `${label}: ${job.done}/${job.total}` : label;
+}
+
+function connectEvents() {
+  if (!window.EventSource) {
+    return;
+  }
+
+  const source = new EventSource('/api/events?types=job,library,task');
+
+  source.onopen = () => { eventsConnected = true; };
+  source.onerror = () => { eventsConnected = false; };  // EventSource reconnects by itself
+
+  // Queue drain workers start and stop constantly; only library jobs are worth logging
+  const isQueueWorker = (job) => job.key && job.key.startsWith('tasks:');
+
+  source.addEventListener('job.started', (e) => {
+    const job = JSON.parse(e.data);
+    if (!isQueueWorker(job)) {
+      addToLog(`Started ${describeJob(job)}`, 'info');
+    }
+  });
+
+  source.addEventListener('job.progress', (e) => {
+    const job = JSON.parse(e.data);
+    const statusId = job.name.includes('age') ? 'ageCheckStatus' : 'verificationStatus';
+    const status = document.getElementById(statusId);
+    if (job.total && job.key && job.key.startsWith('library:')) {
+      status.textContent = `Progress: ${job.done}/${job.total}${job.failed ? ` (${job.failed} failed)` : ''}`;
+      status.classList.remove('hidden');
+    }
+  });
+
+  source.addEventListener('job.finished', (e) => {
+    const job = JSON.parse(e.data);
+    scheduleStatisticsReload();
+    if (isQueueWorker(job)) {
+      return;
+    }
+    const type = job.status === 'succeeded' ? (job.failed ? 'warning' : 'success')
+      : job.status === 'skipped' ? 'warning' : 'error';
+    addToLog(`Finished ${describeJob(job)} - ${job.status}${job.error ? `: ${job.error}` : ''}`, type);
+    if (job.key && job.key.startsWith('library:')) {
+      document.getElementById(job.name.includes('age') ? 'ageCheckStatus' : 'verificationStatus').classList.add('hidden');
+    }
+  });
+
+  source.addEventListener('library.changed', (e) => {
+    const change = JSON.parse(e.data);
+    addToLog(`Movie ${change.action}: ${change.title || `#${change.movie_id}`}`, 'info');
+    scheduleStatisticsReload();
+  });
+
+  source.addEventListener('task.dead', (e) => {
+    const task = JSON.parse(e.data);
+    addToLog(`Task ${task.kind} #${task.task_id} gave up after ${task.attempts} attempts: ${task.error}`, 'error');
+  });
+}
+
 // Initialize admin functionality
 document.addEventListener('DOMContentLoaded', function() {
   // Verify All Movies
@@ -156,10 +231,9 @@ document.addEventListener('DOMContentLoaded', function() {
       
       const result = await response.json();
       if (result.success) {
-        const restrictedCount = result.results.filter(r => r.age_restricted).length;
-        showMessage(`🔍 Age restriction check complete! Found ${restrictedCount} age-restricted videos.`, 'success');
-        addToLog(`Age restriction check completed: ${restrictedCount} restricted videos found`, 'success');
-        loadStatistics(); // Refresh stats
+        showMessage(result.attached
+          ? '🔍 An age restriction check is already running; following it.'
+          : '🔍 Age restriction check started! Progress appears in the activity log.', 'success');
       } else {
         showMessage('Error checking age restrictions', 'error');
       }
@@ -220,9 +294,14 @@ document.addEventListener('DOMContentLoaded', function() {
     }
   });
 
-  // Load initial data
+  // Load initial data and follow live updates
   loadStatistics();
+  connectEvents();
   
-  // Refresh stats every 30 seconds
-  setInterval(loadStatistics, 30000);
+  // Fall back to polling every 30 seconds while the event stream is down
+  setInterval(() => {
+    if (!eventsConnected) {
+      loadStatistics();
+    }
+  }, 30000);
 });
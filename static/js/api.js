@@ -147,9 +147,10 @@ const SearchAPI = {
   },
   
   // Import a movie from search results
-  async importFromSearch(url, title = null, autoVerify = true, fetchMetadata = true) {
+  async importFromSearch(url, title = null, autoVerify = true, fetchMetadata = true, searchToken = null) {
     const data = { url, auto_verify: autoVerify, fetch_metadata: fetchMetadata };
     if (title) data.title = title;
+    if (searchToken) data.search_token = searchToken;
     return api.post('/import-from-search', data);
   }
 };
@@ -479,7 +480,7 @@ async function addMovie(title, url, verified = false) {
  * @returns {Promise<Object>} Search results
  */
 async function searchYouTube(query, options = {}) {
-  const { maxResults = 10, useApi = false } = options;
+  const { maxResults = 10, useApi = false, prefetch = 0 } = options;
   
   try {
     const response = await fetch('/api/search-youtube', {
@@ -490,7 +491,8 @@ async function searchYouTube(query, options = {}) {
       body: JSON.stringify({ 
         query, 
         max_results: maxResults, 
-        use_api: useApi 
+        use_api: useApi,
+        prefetch
       })
     });
     
@@ -508,7 +510,7 @@ async function searchYouTube(query, options = {}) {
  * @returns {Promise<Object>} Import result
  */
 async function importMovieFromSearch(title, url, options = {}) {
-  const { autoVerify = true, fetchMetadata = true } = options;
+  const { autoVerify = true, fetchMetadata = true, searchToken = null } = options;
   
   try {
     const response = await fetch('/api/import-from-search', {
@@ -520,7 +522,8 @@ async function importMovieFromSearch(title, url, options = {}) {
         title, 
         url, 
         auto_verify: autoVerify, 
-        fetch_metadata: fetchMetadata 
+        fetch_metadata: fetchMetadata,
+        search_token: searchToken
       })
     });
     
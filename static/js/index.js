@@ -224,7 +224,8 @@ class MovieGridManager {
       <a href="${result.url}" target="_blank" class="text-blue-400 text-xs mb-2">View on YouTube</a>
       <button class="import-btn bg-green-600 text-white px-3 py-1 rounded hover:bg-green-700 transition text-sm mt-auto" 
               data-title="${encodeURIComponent(result.title)}" 
-              data-url="${encodeURIComponent(result.url)}">
+              data-url="${encodeURIComponent(result.url)}"
+              data-token="${result.search_token || ''}">
         Import
       </button>
     `;
@@ -234,11 +235,12 @@ class MovieGridManager {
     importBtn.addEventListener('click', async () => {
       const title = decodeURIComponent(importBtn.getAttribute('data-title'));
       const url = decodeURIComponent(importBtn.getAttribute('data-url'));
+      const searchToken = importBtn.getAttribute('data-token') || null;
       
       importBtn.disabled = true;
       importBtn.textContent = 'Importing...';
       
-      const resp = await importMovieFromSearch(title, url);
+      const resp = await importMovieFromSearch(title, url, { searchToken });
       
       if (resp.success) {
         importBtn.textContent = 'Imported!';
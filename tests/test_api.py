@@ -8,7 +8,12 @@ import pytest
 import json
 import tempfile
 import os
+import re
+import time
+import threading
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
+from urllib.parse import parse_qsl, urlparse
 
 # Import the Flask app
 import sys
@@ -290,6 +295,1436 @@ class TestMovieInfo:
         assert f'Cache cleared for movie {movie_id}' in data['message']
 
 
+class TestOmdbMissCache:
+    """Test negative caching of OMDb lookups."""
+
+    @patch('app.time.sleep')
+    @patch('app.requests.get')
+    def test_repeat_miss_skips_network(self, mock_get, mock_sleep, client):
+        """A definitive miss is remembered and not looked up again."""
+        from app import fetch_movie_info, clear_omdb_miss
+
+        mock_get.return_value = MagicMock(status_code=200, headers={},
+                                          json=lambda: {'Response': 'False', 'Error': 'Movie not found!'})
+        clear_omdb_miss('No Such Film 12345')
+
+        success, _ = fetch_movie_info('No Such Film 12345')
+        assert success is False
+        assert mock_get.call_count > 0
+
+        mock_get.reset_mock()
+        success, message = fetch_movie_info('  no such   film 12345 ')
+        assert success is False
+        assert 'cached miss' in message
+        mock_get.assert_not_called()
+
+    @patch('app.time.sleep')
+    @patch('app.requests.get')
+    def test_rate_limit_is_not_cached(self, mock_get, mock_sleep, client):
+        """Transient failures must not be remembered as misses."""
+        from app import fetch_movie_info, get_omdb_miss, clear_omdb_miss
+
+        mock_get.return_value = MagicMock(status_code=429, headers={}, text='')
+        clear_omdb_miss('Rate Limited Film')
+
+        fetch_movie_info('Rate Limited Film')
+        assert get_omdb_miss('Rate Limited Film') is None
+
+
+class TestTitleVariants:
+    """Test concurrent OMDb title variant probing."""
+
+    @patch('app.requests.get')
+    def test_variants_deduplicated_and_best_hit_wins(self, mock_get, client):
+        """Whitespace-only variants cost one call and the first variant outranks faster later ones."""
+        from app import query_omdb
+
+        def omdb(url, **kwargs):
+            if 't=Tom & Jerry' in url:
+                time.sleep(0.2)
+            return MagicMock(status_code=200, headers={},
+                             json=lambda: {'Response': 'True', 'Title': 'Tom & Jerry'})
+
+        mock_get.side_effect = omdb
+        with patch('app.OMDB_VARIANT_STAGGER', 0.05):
+            success, info = query_omdb('  Tom   &  Jerry ')
+        assert success is True
+        assert info['found_with'] == 'Tom & Jerry'
+        searched = [call.args[0] for call in mock_get.call_args_list if '?t=' in call.args[0]]
+        assert len(searched) == len(set(searched)) == 2
+
+    def _omdb(self, delay):
+        """s= is inconclusive; only the first variant ('Fast & Furious') matches, after `delay` seconds"""
+        def omdb(url, **kwargs):
+            if '?t=Fast & Furious&' in url:
+                time.sleep(delay)
+                data = {'Response': 'True', 'Title': 'Fast & Furious'}
+            elif '?t=' in url:
+                data = {'Response': 'False', 'Error': 'Movie not found!'}
+            else:
+                data = {'Response': 'False', 'Error': 'Too many results.'}
+            return MagicMock(status_code=200, headers={}, json=lambda: data)
+        return omdb
+
+    @patch('app.requests.get')
+    def test_first_variant_hit_sends_one_call(self, mock_get, client):
+        """A quick match on the first variant means no other variant is sent."""
+        from app import query_omdb, clear_omdb_miss
+
+        mock_get.side_effect = self._omdb(0.0)
+        clear_omdb_miss('Fast & Furious (2009) Full Movie HD')
+        success, info = query_omdb('Fast & Furious (2009) Full Movie HD')
+
+        assert success is True and info['found_with'] == 'Fast & Furious'
+        assert len([call for call in mock_get.call_args_list if '?t=' in call.args[0]]) == 1
+
+    @patch('app.requests.get')
+    def test_variants_waiting_for_a_slot_are_not_sent_after_a_hit(self, mock_get, client):
+        """Variants queued behind the limiter are dropped once a higher-ranked variant matches."""
+        from app import PriorityLimiter, query_omdb, clear_omdb_miss
+
+        mock_get.side_effect = self._omdb(0.3)
+        clear_omdb_miss('Fast & Furious (2009) Full Movie HD')
+        with patch('app.omdb_limiter', PriorityLimiter('omdb', 1)), patch('app.OMDB_VARIANT_STAGGER', 0.02):
+            success, info = query_omdb('Fast & Furious (2009) Full Movie HD')
+
+        assert success is True and info['found_with'] == 'Fast & Furious'
+        assert len([call for call in mock_get.call_args_list if '?t=' in call.args[0]]) == 1
+
+
+class TestOmdbQueryDerivation:
+    """Test title hint parsing and ranked OMDb search."""
+
+    def test_parse_title_hints(self):
+        """Years and uploader noise are split off YouTube titles."""
+        from app import parse_title_hints
+
+        assert parse_title_hints('The Matrix (1999) Full Movie HD') == ('The Matrix', '1999')
+        assert parse_title_hints('Heat [1080p] | Classic Cinema') == ('Heat', None)
+        assert parse_title_hints('2001: A Space Odyssey 1968') == ('2001: A Space Odyssey', '1968')
+        assert parse_title_hints('1917') == ('1917', None)
+
+    @patch('app.requests.get')
+    def test_search_scores_candidates_by_year_and_runtime(self, mock_get, client):
+        """The candidate matching the year and the video duration wins over a same-titled remake."""
+        from app import query_omdb, clear_omdb_miss
+
+        details = {
+            'tt1': {'Response': 'True', 'Title': 'Solaris', 'Year': '2002', 'Runtime': '99 min', 'imdbID': 'tt1'},
+            'tt2': {'Response': 'True', 'Title': 'Solaris', 'Year': '1972', 'Runtime': '167 min', 'imdbID': 'tt2'},
+        }
+
+        def omdb(url, **kwargs):
+            params = dict(parse_qsl(urlparse(url).query))
+            if 's' in params:
+                data = {'Response': 'True', 'Search': [
+                    {'Title': 'Solaris', 'Year': '2002', 'imdbID': 'tt1', 'Type': 'movie'},
+                    {'Title': 'Solaris', 'Year': '1972', 'imdbID': 'tt2', 'Type': 'movie'}]}
+            else:
+                data = details[params['i']]
+            return MagicMock(status_code=200, headers={}, json=lambda: data)
+
+        mock_get.side_effect = omdb
+        clear_omdb_miss('Solaris Full Movie')
+        success, info = query_omdb('Solaris Full Movie', duration='2:46:40')
+        assert success is True
+        assert info['year'] == '1972'
+        assert mock_get.call_count == 3
+
+    @pytest.mark.parametrize('status_code, body', [
+        (429, {}),
+        (503, {}),
+        (401, {'Response': 'False', 'Error': 'Request limit reached!'}),
+    ])
+    @patch('app.requests.get')
+    def test_transient_search_failure_skips_variants(self, mock_get, status_code, body, client):
+        """A rate-limited or failing search does not fan out t= variant calls."""
+        from app import query_omdb, get_omdb_miss
+
+        mock_get.return_value = MagicMock(status_code=status_code, headers={}, json=lambda: body)
+        success, _ = query_omdb('Throttled Film')
+
+        assert success is False
+        assert mock_get.call_count == 1
+        assert get_omdb_miss('Throttled Film') is None
+
+
+class TestImdbIdRefresh:
+    """Test that resolved films are refreshed by IMDb ID."""
+
+    @patch('app.requests.get')
+    def test_refresh_uses_stored_imdb_id(self, mock_get, client):
+        """A library refresh makes one i= call for a resolved film and never searches its title."""
+        from app import save_movie_info_cache, get_movie_info_cache
+
+        conn = get_db_connection()
+        movie_id = conn.execute('INSERT INTO movies (title, url) VALUES (?, ?)',
+                                ('Matrix Upload Title 777', 'https://www.youtube.com/watch?v=imdbRefrsh1')).lastrowid
+        conn.commit()
+        conn.close()
+        save_movie_info_cache(movie_id, {'plot': 'Old plot', 'imdb_id': 'tt0133093'})
+        mock_get.return_value = MagicMock(status_code=200, headers={},
+                                          json=lambda: {'Response': 'True', 'Title': 'The Matrix', 'Year': '1999',
+                                                        'imdbID': 'tt0133093', 'Plot': 'New plot'})
+
+        from app import drain_tasks
+
+        wait_for_idle_task_workers()
+        with patch('app.kick_task_queue', return_value=MagicMock(id='unit-test-job')):
+            response = client.post('/api/admin/refresh-all-cache')
+        assert json.loads(response.data)['queued'] >= 1
+        assert get_movie_info_cache(movie_id)['plot'] == 'Old plot'  # still served until replaced
+        drain_tasks()
+
+        urls = [call.args[0] for call in mock_get.call_args_list]
+        assert len([url for url in urls if 'i=tt0133093' in url]) == 1
+        assert not any('Matrix+Upload' in url for url in urls)
+        info = get_movie_info_cache(movie_id)
+        assert info['plot'] == 'New plot'
+        assert info['imdb_id'] == 'tt0133093'
+
+        conn = get_db_connection()
+        conn.execute('DELETE FROM movies WHERE id = ?', (movie_id,))
+        conn.execute('DELETE FROM movie_info_cache WHERE movie_id = ?', (movie_id,))
+        conn.commit()
+        conn.close()
+
+
+def wait_for_idle_task_workers(timeout=30):
+    """Let drain jobs started by earlier tests finish so they don't lease this test's tasks."""
+    from app import job_registry
+
+    for job in job_registry.list():
+        if (job['key'] or '').startswith('tasks:drain') and not job['finished_at']:
+            job_registry.wait(job['id'], timeout=timeout)
+
+
+class TestTaskQueue:
+    """Test the durable SQLite task queue."""
+
+    def test_retry_then_dead_letter(self, client):
+        """Failing tasks are retried with backoff and dead-lettered after max attempts."""
+        from app import TaskQueue
+
+        wait_for_idle_task_workers()
+        queue = TaskQueue(lease_seconds=60, max_attempts=2, retry_base_seconds=0)
+        task_id = queue.enqueue('unit_test_kind', {'n': 1}, group='unit-test-dead', priority=99)
+
+        task = queue.lease()
+        assert task['id'] == task_id and task['attempts'] == 1 and task['payload'] == {'n': 1}
+        queue.fail(task, 'boom')
+        assert queue.counts('unit-test-dead') == {'pending': 1}
+
+        task = queue.lease()
+        queue.fail(task, 'boom again')
+        assert queue.counts('unit-test-dead') == {'dead': 1}
+        assert queue.lease() is None or queue.lease()['kind'] != 'unit_test_kind'
+
+        assert queue.retry_dead(task_id) == 1
+        queue.complete(queue.lease()['id'])
+        assert queue.counts('unit-test-dead') == {'done': 1}
+
+    def test_expired_lease_is_resumed(self, client):
+        """A task leased by a process that died is picked up again once its lease expires."""
+        from app import TaskQueue
+
+        wait_for_idle_task_workers()
+        crashed = TaskQueue(lease_seconds=-1)
+        task_id = crashed.enqueue('unit_test_kind', {}, group='unit-test-lease', priority=99)
+        assert crashed.lease()['id'] == task_id
+
+        restarted = TaskQueue(lease_seconds=60)
+        task = restarted.lease()
+        assert task['id'] == task_id and task['attempts'] == 2
+        restarted.complete(task_id)
+
+    @patch.dict(os.environ, {'OMDB_API_KEY': 'sekrit-key'})
+    @patch('app.requests.get')
+    def test_failures_classified_from_attempts_not_message(self, mock_get, client):
+        """A title that reads like a rate limit is still a plain miss, and the API key is masked."""
+        from app import query_omdb, is_transient_failure, clear_omdb_miss
+
+        mock_get.return_value = MagicMock(status_code=200, headers={},
+                                          json=lambda: {'Response': 'False', 'Error': 'Movie not found!'})
+        clear_omdb_miss('Too Many Girls (1940)')
+        success, message = query_omdb('Too Many Girls (1940)')
+        assert success is False
+        assert is_transient_failure(message) is False
+        assert 'sekrit-key' not in message and 'apikey=***' in message
+
+        mock_get.return_value = MagicMock(status_code=429, headers={}, json=lambda: {})
+        success, message = query_omdb('Some Other Film')
+        assert success is False
+        assert is_transient_failure(message) is True
+
+    @patch('app.check_age_restriction', return_value=(True, 'Age-restricted content detected'))
+    @patch('app.validate_url', return_value=(True, 'OK'))
+    @patch('app.fetch_movie_info')
+    def test_url_checks_run_while_omdb_is_failing(self, mock_info, mock_validate, mock_age, client):
+        """A transient OMDb failure still verifies and age-checks the movie; only the lookup is retried."""
+        from app import OmdbFailure, TaskQueue, run_task, TASK_PRIORITY_INTERACTIVE
+
+        conn = get_db_connection()
+        movie_id = conn.execute('INSERT INTO movies (title, url) VALUES (?, ?)',
+                                ('Flaky Upstream Film', 'https://www.youtube.com/watch?v=flaky000001')).lastrowid
+        conn.commit()
+        conn.close()
+
+        wait_for_idle_task_workers()
+        queue = TaskQueue(lease_seconds=60, retry_base_seconds=0)
+        group = f'unit-test-flaky:{time.time()}'
+        queue.enqueue('enrich_movie', {'movie_id': movie_id, 'title': 'Flaky Upstream Film',
+                                       'url': 'https://www.youtube.com/watch?v=flaky000001',
+                                       'verify': True, 'check_age': True}, group=group, priority=99)
+        mock_info.return_value = (False, OmdbFailure('OMDb unavailable: Rate limited (429)', transient=True))
+        with patch('app.task_queue', queue):
+            assert run_task(queue.lease()) is False
+            mock_age.assert_called_once()
+            mock_validate.assert_called_once()
+
+            conn = get_db_connection()
+            movie = conn.execute('SELECT age_restricted, verified FROM movies WHERE id = ?', (movie_id,)).fetchone()
+            conn.close()
+            assert (movie['age_restricted'], movie['verified']) == (1, 1)
+
+            mock_info.return_value = (True, {'plot': 'Recovered', 'genre': 'Drama'})
+            retry = queue.lease()
+            assert retry['payload']['verify'] is False and retry['payload']['check_age'] is False
+            assert run_task(retry) is True
+        assert queue.counts(group) == {'done': 1}
+        assert mock_age.call_count == 1 and mock_validate.call_count == 1
+
+
+class TestPriorityLanes:
+    """Test lane-ordered upstream limiting and lane propagation."""
+
+    def test_freed_slot_goes_to_highest_lane(self):
+        """A queued interactive call overtakes bulk calls that were waiting first."""
+        from app import PriorityLimiter, PRIORITY_BULK, PRIORITY_INTERACTIVE
+
+        limiter = PriorityLimiter('unit', limit=1)
+        order = []
+        holder = limiter.slot(PRIORITY_INTERACTIVE)
+        holder.__enter__()
+
+        def call(name, priority):
+            with limiter.slot(priority):
+                order.append(name)
+
+        threads = [threading.Thread(target=call, args=('bulk', PRIORITY_BULK))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=call, args=('interactive', PRIORITY_INTERACTIVE)))
+        threads[1].start()
+        while limiter.stats()['waiting'] != {'bulk': 1, 'interactive': 1}:
+            time.sleep(0.01)
+
+        holder.__exit__(None, None, None)
+        for thread in threads:
+            thread.join(5)
+        assert order == ['interactive', 'bulk']
+
+    def test_bulk_cannot_take_the_last_slot(self):
+        """Bulk work is capped below the limit so an interactive call gets a slot immediately."""
+        from app import PriorityLimiter, PRIORITY_BULK, PRIORITY_INTERACTIVE
+
+        limiter = PriorityLimiter('unit', limit=2)
+        assert limiter.bulk_limit == 1
+        with limiter.slot(PRIORITY_BULK):
+            blocked = threading.Thread(target=lambda: limiter.slot(PRIORITY_BULK).__enter__(), daemon=True)
+            blocked.start()
+            time.sleep(0.05)
+            assert limiter.stats()['waiting'] == {'bulk': 1}
+            with limiter.slot(PRIORITY_INTERACTIVE):
+                assert limiter.stats()['in_use'] == 2
+
+    def test_lane_follows_tasks_and_executor_hops(self, client):
+        """Task handlers run in their task's lane, and submit_in_lane carries it to worker threads."""
+        from app import (TASK_HANDLERS, current_priority, omdb_executor, run_task, submit_in_lane,
+                         PRIORITY_INTERACTIVE, PRIORITY_PREFETCH)
+
+        seen = {}
+
+        def handler(payload):
+            seen['task'] = current_priority()
+            seen['worker'] = submit_in_lane(omdb_executor, current_priority).result(5)
+
+        with patch('app.task_queue') as queue, patch.dict(TASK_HANDLERS, {'unit_lane': handler}):
+            assert run_task({'id': 1, 'kind': 'unit_lane', 'payload': {}, 'priority': PRIORITY_PREFETCH, 'attempts': 1})
+            queue.complete.assert_called_once_with(1)
+
+        assert seen == {'task': PRIORITY_PREFETCH, 'worker': PRIORITY_PREFETCH}
+        assert current_priority() == PRIORITY_INTERACTIVE
+
+    def test_interactive_tasks_get_a_dedicated_drain_job(self, client):
+        """Interactive enrichment is drained by its own job even while the shared workers are busy."""
+        from app import TASK_HANDLERS, enqueue_task, task_queue, TASK_PRIORITY_BULK
+
+        wait_for_idle_task_workers()
+        group = f'unit-test-lane:{time.time()}'
+        with patch.dict(TASK_HANDLERS, {'unit_lane': MagicMock()}):
+            _, interactive_job = enqueue_task('unit_lane', {}, group=group)
+            _, bulk_job = enqueue_task('unit_lane', {}, group=group, priority=TASK_PRIORITY_BULK)
+            assert interactive_job.key == 'tasks:drain:interactive'
+            assert bulk_job.key.startswith('tasks:drain:') and bulk_job.key != interactive_job.key
+            wait_for_idle_task_workers()
+        assert task_queue.counts(group) == {'done': 2}
+
+    def test_interactive_drain_runs_while_shared_pool_is_full(self, client):
+        """Long library jobs filling every shared worker do not hold up interactive tasks."""
+        from app import TASK_HANDLERS, enqueue_task, job_registry, task_queue
+
+        wait_for_idle_task_workers()
+        group = f'unit-test-pool:{time.time()}'
+        release = threading.Event()
+        blockers = [job_registry.submit('unit_long_job', lambda job: release.wait(10))
+                    for _ in range(job_registry.max_workers)]
+        try:
+            with patch.dict(TASK_HANDLERS, {'unit_pool': MagicMock()}):
+                _, drain_job = enqueue_task('unit_pool', {}, group=group)
+                job_registry.wait(drain_job.id, timeout=5)
+                assert task_queue.counts(group) == {'done': 1}
+                assert all(not blocker.finished_at for blocker in blockers)
+        finally:
+            release.set()
+            for blocker in blockers:
+                job_registry.wait(blocker.id, timeout=5)
+            wait_for_idle_task_workers()
+
+
+class TestStaleWhileRevalidate:
+    """Test that refreshes replace cache entries in place and serve stale ones meanwhile."""
+
+    def _movie_with_cache(self, cached_at):
+        from app import save_movie_info_cache
+
+        conn = get_db_connection()
+        movie_id = conn.execute('INSERT INTO movies (title, url) VALUES (?, ?)',
+                                ('Stale Film 4242', 'https://www.youtube.com/watch?v=staleFilm01')).lastrowid
+        conn.commit()
+        save_movie_info_cache(movie_id, {'plot': 'Old plot', 'genre': 'Drama'})
+        conn.execute('UPDATE movie_info_cache SET cached_at = ? WHERE movie_id = ?', (cached_at, movie_id))
+        conn.commit()
+        conn.close()
+        return movie_id
+
+    def _cleanup(self, movie_id):
+        conn = get_db_connection()
+        conn.execute('DELETE FROM movies WHERE id = ?', (movie_id,))
+        conn.execute('DELETE FROM movie_info_cache WHERE movie_id = ?', (movie_id,))
+        conn.commit()
+        conn.close()
+
+    def test_stale_entry_served_while_revalidating(self, client):
+        """An expired entry is returned immediately and a background refresh is queued once."""
+        movie_id = self._movie_with_cache('2000-01-01T00:00:00')
+        with patch('app.enqueue_task', return_value=(1, MagicMock(id='job'))) as mock_enqueue:
+            data = json.loads(client.get(f'/api/movie-info/{movie_id}').data)
+        assert data['info']['plot'] == 'Old plot'
+        assert data['stale'] is True and data['revalidating'] is True
+        assert mock_enqueue.call_args.args[0] == 'revalidate_movie_info'
+        self._cleanup(movie_id)
+
+    def test_queued_revalidation_does_not_block_library_refresh(self, client):
+        """A deferred revalidation is not mistaken for a running library refresh."""
+        from app import revalidate_movie_info, task_queue
+
+        movie_id = self._movie_with_cache('2000-01-01T00:00:00')
+        wait_for_idle_task_workers()
+        try:
+            with patch('app.kick_task_queue', return_value=MagicMock(id='unit-test-job')):
+                assert revalidate_movie_info(movie_id, 'Stale Film 4242') is True
+                data = json.loads(client.post('/api/admin/refresh-all-cache').data)
+            assert data['success'] is True
+            assert data.get('attached') is not True
+            assert data['run_id'].startswith('refresh:')
+            assert task_queue.counts(f'revalidate:{movie_id}') == {'pending': 1}
+        finally:
+            conn = get_db_connection()
+            conn.execute("DELETE FROM tasks WHERE task_group = ? OR task_group LIKE 'refresh:%'",
+                         (f'revalidate:{movie_id}',))
+            conn.commit()
+            conn.close()
+            self._cleanup(movie_id)
+
+    @patch('app.requests.get')
+    def test_rate_limited_refresh_keeps_entry_and_pauses_bulk(self, mock_get, client):
+        """A rate-limited refresh leaves the old row in place and backs off the bulk lane."""
+        from app import refresh_movie_info_task, get_movie_info_cache, task_queue, TaskRetry
+
+        movie_id = self._movie_with_cache('2000-01-01T00:00:00')
+        mock_get.return_value = MagicMock(status_code=429, headers={}, text='')
+        try:
+            with patch('app.time.sleep'), pytest.raises(TaskRetry):
+                refresh_movie_info_task({'movie_id': movie_id, 'title': 'Stale Film 4242', 'imdb_id': 'tt7654321',
+                                         'fresh_since': datetime.now().isoformat()})
+            assert get_movie_info_cache(movie_id, allow_stale=True)['plot'] == 'Old plot'
+            assert task_queue.bulk_paused_for() > 0
+        finally:
+            task_queue.bulk_paused_until = 0.0
+            self._cleanup(movie_id)
+
+
+class TestOmdbResultCache:
+    """Test the title-keyed shared OMDb result cache."""
+
+    @patch('app.time.sleep')
+    @patch('app.requests.get')
+    def test_same_title_costs_one_call(self, mock_get, mock_sleep, client):
+        """Repeat titles across the library reuse the first OMDb response."""
+        from app import fetch_movie_info, omdb_query_key
+
+        mock_get.return_value = MagicMock(status_code=200, headers={},
+                                          json=lambda: {'Response': 'True', 'Title': 'Shared Film',
+                                                        'Genre': 'Drama', 'Year': '2001'})
+
+        conn = get_db_connection()
+        conn.execute('DELETE FROM omdb_result_cache WHERE query_key = ?', (omdb_query_key('Shared Film'),))
+        conn.commit()
+        conn.close()
+
+        success, info = fetch_movie_info('Shared Film')
+        assert success is True
+        assert info['omdb_query_key'] == omdb_query_key('shared film')
+        calls = mock_get.call_count
+
+        success, info = fetch_movie_info('  SHARED   film')
+        assert success is True
+        assert info['from_shared_cache'] is True
+        assert info['genre'] == 'Drama'
+        assert mock_get.call_count == calls
+
+
+class TestYouTubeSearchParsing:
+    """Test ytInitialData parsing of YouTube search pages."""
+
+    def _renderer(self, video_id, title, length):
+        return {'videoRenderer': {
+            'videoId': video_id,
+            'title': {'runs': [{'text': title}]},
+            'lengthText': {'simpleText': length},
+            'ownerText': {'runs': [{'text': 'Classic Cinema'}]},
+            'viewCountText': {'simpleText': '1,234 views'}
+        }}
+
+    @patch('app.requests.get')
+    def test_search_extracts_renderers_in_order(self, mock_get, client):
+        """Each result keeps its own id, title, duration, channel and views."""
+        from app import search_youtube_videos
+
+        initial_data = {'contents': {'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': [
+            self._renderer('aaaaaaaaaaa', 'Night of the Living Dead (1968) Full Movie', '1:35:59'),
+            {'shelfRenderer': {}},
+            self._renderer('bbbbbbbbbbb', 'Short Clip', '0:45'),
+            self._renderer('ccccccccccc', 'His Girl Friday &amp; More', '1:32:00'),
+        ]}}]}}}
+        html = f'<html><script>var ytInitialData = {json.dumps(initial_data)};</script></html>'
+        mock_get.return_value = MagicMock(status_code=200, text=html)
+
+        success, results = search_youtube_videos('classic', max_results=10)
+        assert success is True
+        assert [r['video_id'] for r in results] == ['aaaaaaaaaaa', 'ccccccccccc']
+        assert results[0]['duration'] == '1:35:59'
+        assert results[0]['channel'] == 'Classic Cinema'
+        assert results[0]['views'] == '1,234 views'
+        assert results[1]['title'] == 'His Girl Friday & More'
+
+    @patch('app.requests.get')
+    def test_search_without_initial_data_fails(self, mock_get, client):
+        """Pages without ytInitialData are reported as unparseable."""
+        from app import search_youtube_videos
+
+        mock_get.return_value = MagicMock(status_code=200, text='<html>"videoId":"x"</html>')
+        success, error = search_youtube_videos('classic')
+        assert success is False
+        assert 'Could not extract' in error
+
+
+class TestStreamingProbes:
+    """Test streaming page probes with early termination."""
+
+    def _streamed(self, chunks):
+        consumed = []
+
+        def iter_content(chunk_size=None):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        response = MagicMock(status_code=200)
+        response.iter_content.side_effect = iter_content
+        return response, consumed
+
+    @patch('app.fetch_oembed', return_value=(None, None))
+    @patch('app.requests.get')
+    def test_title_split_across_chunks_stops_early(self, mock_get, mock_oembed, client):
+        """A title spanning a chunk boundary is found and the rest is never read."""
+        from app import fetch_youtube_title
+
+        chunks = [b'<html><head><title>The General (19', b'26) - YouTube</title>', b'x' * 1000, b'y' * 1000]
+        mock_get.return_value, consumed = self._streamed(chunks)
+
+        success, title = fetch_youtube_title('https://www.youtube.com/watch?v=abc')
+        assert success is True
+        assert title == 'The General (1926)'
+        assert len(consumed) == 2
+        assert mock_get.call_args.kwargs['stream'] is True
+
+    @patch('app.requests.get')
+    def test_age_check_respects_byte_cap(self, mock_get, client):
+        """The embed scan stops at its byte cap, and finding nothing there falls back to the watch page."""
+        from app import check_age_restriction
+
+        with patch('app.PROBE_EMBED_MAX_BYTES', 2048):
+            mock_get.return_value, consumed = self._streamed([b'a' * 1024] * 10 + [b'Sign in to confirm your age'])
+            is_restricted, message = check_age_restriction('https://www.youtube.com/watch?v=abc')
+
+        assert is_restricted is True
+        assert len(consumed) == 2 + 11
+        assert [c.args[0] for c in mock_get.call_args_list] == ['https://www.youtube.com/embed/abc',
+                                                                'https://www.youtube.com/watch?v=abc']
+
+    @patch('app.requests.get')
+    def test_duration_from_stream(self, mock_get, client):
+        """Duration is parsed from bytes and formatted."""
+        from app import extract_youtube_duration
+
+        mock_get.return_value, _ = self._streamed([b'{"videoDetails":{"lengthSeconds":"5492"}}'])
+        assert extract_youtube_duration('https://www.youtube.com/watch?v=abc') == '1:31:32'
+
+
+class TestParseOffload:
+    """Test optional process-pool offload of page parsing."""
+
+    @patch('app.fetch_oembed', return_value=(None, None))
+    @patch('app.requests.get')
+    def test_probe_and_search_parse_in_worker_process(self, mock_get, mock_oembed, client):
+        """With PARSE_PROCESSES set, scans and search pages are parsed by a worker from raw bytes."""
+        import app as app_module
+        from app import fetch_youtube_title, search_youtube_videos, shutdown_parse_pool
+
+        initial_data = {'contents': [{'videoRenderer': {
+            'videoId': 'aaaaaaaaaaa', 'title': {'runs': [{'text': 'Nosferatu (1922) Full Movie'}]},
+            'lengthText': {'simpleText': '1:34:00'}}}]}
+        page = f'<script>var ytInitialData = {json.dumps(initial_data)};</script>'.encode()
+
+        with patch('app.PARSE_PROCESSES', 1), patch.dict(app_module.parse_stats, {'offloaded': 0}):
+            try:
+                mock_get.return_value = MagicMock(status_code=200, content=page)
+                success, results = search_youtube_videos('nosferatu')
+                assert success is True and results[0]['video_id'] == 'aaaaaaaaaaa'
+
+                streamed = MagicMock(status_code=200)
+                streamed.iter_content.return_value = iter([b'<title>Nosferatu (19', b'22) - YouTube</title>'])
+                mock_get.return_value = streamed
+                assert fetch_youtube_title('https://www.youtube.com/watch?v=abc') == (True, 'Nosferatu (1922)')
+
+                assert app_module.parse_stats['offloaded'] == 3
+            finally:
+                shutdown_parse_pool()
+
+    def test_broken_pool_falls_back_inline(self):
+        """If the worker pool is unusable, parsing still happens in-process."""
+        import app as app_module
+        from app import run_parser, scan_window
+
+        broken = MagicMock()
+        broken.submit.side_effect = RuntimeError('cannot schedule new futures after shutdown')
+        pattern = re.compile(rb'id=(\d+)')
+        with patch('app.PARSE_PROCESSES', 1), patch('app.parse_pool', broken):
+            assert run_parser(scan_window, b'x id=42 y', {'id': [(0, pattern)]}) == {'id': {0: b'42'}}
+            assert app_module.parse_pool is None
+
+
+class TestSearchCache:
+    """Test the YouTube search result cache."""
+
+    @patch('app.search_youtube_videos')
+    def test_repeat_search_served_from_cache(self, mock_search, client):
+        """A repeated query does not hit YouTube again."""
+        from app import search_cache
+
+        search_cache.clear()
+        mock_search.return_value = (True, [{'video_id': 'abc', 'title': 'Cached Film'}])
+
+        first = client.post('/api/search-youtube', data=json.dumps({'query': 'Cached Film'}),
+                            content_type='application/json')
+        second = client.post('/api/search-youtube', data=json.dumps({'query': '  cached   FILM '}),
+                             content_type='application/json')
+
+        assert json.loads(first.data)['from_cache'] is False
+        assert json.loads(second.data)['from_cache'] is True
+        assert json.loads(second.data)['results'][0]['video_id'] == 'abc'
+        assert mock_search.call_count == 1
+
+    def test_expired_entry_is_a_miss(self):
+        """Entries older than the TTL are dropped."""
+        from app import TTLCache, search_cache_key
+
+        cache = TTLCache(max_entries=2, ttl_seconds=0)
+        key = search_cache_key('Film', 10, 'scrape')
+        cache.put(key, {'success': True})
+        with patch('app.time.monotonic', return_value=10 ** 9):
+            assert cache.get(key) is None
+        assert cache.stats()['misses'] == 1
+
+
+class TestHedgedSearch:
+    """Test hedged multi-source YouTube search."""
+
+    @patch('app.search_youtube_videos')
+    @patch('app.search_youtube_with_api')
+    def test_first_success_wins(self, mock_api, mock_scrape):
+        """A slow primary source is overtaken by the hedged one."""
+        from app import hedged_youtube_search
+
+        def slow_api(query, max_results):
+            time.sleep(0.5)
+            return True, [{'video_id': 'api1'}]
+
+        mock_api.side_effect = slow_api
+        mock_scrape.return_value = (True, [{'video_id': 'web1'}])
+
+        success, results, method = hedged_youtube_search('Film', 5, use_api=True, mode='first', delay=0.01)
+        assert success
+        assert results[0]['video_id'] == 'web1'
+        assert method.startswith('Web Scraping')
+
+    @patch('app.search_youtube_videos')
+    @patch('app.search_youtube_with_api')
+    def test_merge_dedupes_by_video_id(self, mock_api, mock_scrape):
+        """Merged results keep one entry per video and fill unknown fields."""
+        from app import hedged_youtube_search
+
+        mock_api.return_value = (True, [{'video_id': 'a', 'duration': '1:30:00'}])
+        mock_scrape.return_value = (True, [{'video_id': 'a', 'duration': 'Unknown', 'channel': 'Chan'},
+                                           {'video_id': 'b', 'duration': '2:00:00'}])
+
+        success, results, method = hedged_youtube_search('Film', 5, use_api=True, mode='merge')
+        assert success
+        assert [r['video_id'] for r in results] == ['a', 'b']
+        assert results[0]['duration'] == '1:30:00'
+        assert results[0]['channel'] == 'Chan'
+        assert 'merged' in method
+
+
+class TestProbePrefetch:
+    """Test background probe prefetch for search results."""
+
+    @patch('app.extract_youtube_duration', return_value='1:40:00')
+    @patch('app.check_age_restriction', return_value=(False, 'No age restrictions detected'))
+    @patch('app.validate_url', return_value=(True, 'OK'))
+    @patch('app.fetch_youtube_title', return_value=(True, 'Prefetched Film'))
+    def test_prefetched_probe_is_reused(self, mock_title, mock_validate, mock_age, mock_duration):
+        """Queued probes run once and are served from the probe cache afterwards."""
+        from app import queue_prefetch, get_prefetched_probe, probe_cache
+
+        probe_cache.clear()
+        results = [{'video_id': 'pfx00000001', 'url': 'https://www.youtube.com/watch?v=pfx00000001'}]
+        assert queue_prefetch(results, 3) == 1
+
+        probe = get_prefetched_probe('pfx00000001')
+        assert probe['title'] == 'Prefetched Film'
+        assert probe['duration'] == '1:40:00'
+
+        assert queue_prefetch(results, 3) == 0
+        assert mock_title.call_count == 1
+
+    @patch('app.queue_prefetch', return_value=0)
+    @patch('app.search_youtube_videos')
+    def test_prefetch_count_is_clamped(self, mock_search, mock_queue, client):
+        """A client cannot ask for more background probes than PROBE_PREFETCH_MAX."""
+        from app import search_cache, PROBE_PREFETCH_MAX
+
+        search_cache.clear()
+        mock_search.return_value = (True, [{'video_id': 'clamp1', 'title': 'Clamped Film'}])
+
+        client.post('/api/search-youtube', data=json.dumps({'query': 'Clamped Film', 'prefetch': 500}),
+                    content_type='application/json')
+        assert mock_queue.call_args[0][1] == PROBE_PREFETCH_MAX
+
+        mock_queue.reset_mock()
+        client.post('/api/search-youtube', data=json.dumps({'query': 'Unprefetched Film'}),
+                    content_type='application/json')
+        mock_queue.assert_not_called()
+
+
+class TestSearchTokens:
+    """Test reuse of search-result data on import."""
+
+    @patch('app.add_movie', return_value=1)
+    @patch('app.extract_youtube_duration')
+    @patch('app.validate_url')
+    @patch('app.fetch_youtube_title')
+    @patch('app.check_age_restriction', return_value=(False, 'No age restrictions detected'))
+    @patch('app.search_youtube_videos')
+    def test_import_with_token_skips_rescrape(self, mock_search, mock_age, mock_title, mock_validate,
+                                              mock_duration, mock_add, client):
+        """Title, duration and validity come from the token; only age status is fetched."""
+        from app import search_cache
+
+        search_cache.clear()
+        mock_search.return_value = (True, [{
+            'video_id': 'tok00000001', 'title': 'Token Film', 'duration': '1:45:00',
+            'url': 'https://www.youtube.com/watch?v=tok00000001'
+        }])
+        search = json.loads(client.post('/api/search-youtube', data=json.dumps({'query': 'Token Film'}),
+                                        content_type='application/json').data)
+        token = search['results'][0]['search_token']
+
+        response = client.post('/api/import-from-search', content_type='application/json', data=json.dumps({
+            'url': 'https://www.youtube.com/watch?v=tok00000001', 'search_token': token, 'fetch_metadata': False
+        }))
+        data = json.loads(response.data)
+
+        assert data['success'] is True
+        assert data['reused_search_data'] is True
+        assert data['title'] == 'Token Film'
+        assert data['duration'] == '1:45:00'
+        mock_title.assert_not_called()
+        mock_validate.assert_not_called()
+        mock_duration.assert_not_called()
+        mock_age.assert_called_once()
+
+    def test_token_for_other_video_is_ignored(self):
+        """A token only applies to the video it was issued for."""
+        from app import with_search_tokens, load_search_token
+
+        token = with_search_tokens([{'video_id': 'aaaaaaaaaaa', 'title': 'A'}])[0]['search_token']
+        assert load_search_token(token, 'aaaaaaaaaaa')['title'] == 'A'
+        assert load_search_token(token, 'bbbbbbbbbbb') is None
+        assert load_search_token(token + 'x', 'aaaaaaaaaaa') is None
+
+
+class TestYouTubeApiEnrichment:
+    """Test batched YouTube Data API enrichment."""
+
+    def test_parse_iso8601_duration(self):
+        from app import parse_iso8601_duration
+
+        assert parse_iso8601_duration('PT1H32M45S') == 5565
+        assert parse_iso8601_duration('PT45M') == 2700
+        assert parse_iso8601_duration('P0D') == 0
+        assert parse_iso8601_duration('garbage') is None
+
+    @patch.dict(os.environ, {'YOUTUBE_API_KEY': 'test-key'})
+    @patch('app.requests.get')
+    def test_details_are_fetched_fifty_at_a_time(self, mock_get):
+        """120 IDs take three videos.list calls; missing IDs are reported as unavailable."""
+        from app import fetch_youtube_video_details
+
+        def videos_list(url, params, timeout):
+            items = [{
+                'id': video_id,
+                'contentDetails': {'duration': 'PT1H30M', 'contentRating': {'ytRating': 'ytAgeRestricted'}},
+                'status': {'privacyStatus': 'public', 'uploadStatus': 'processed'}
+            } for video_id in params['id'].split(',') if video_id != 'vid5']
+            return MagicMock(status_code=200, json=lambda: {'items': items})
+
+        mock_get.side_effect = videos_list
+        details = fetch_youtube_video_details([f'vid{i}' for i in range(120)] + ['vid1'])
+
+        assert mock_get.call_count == 3
+        assert len(details) == 120
+        assert details['vid5'] is None
+        assert details['vid1'] == {'duration': '1:30:00', 'age_restricted': True, 'available': True, 'embeddable': True}
+
+
+class TestLightweightProbes:
+    """Test oEmbed-based validation and title lookup."""
+
+    @patch('app.requests.head')
+    @patch('app.requests.get')
+    def test_removed_video_fails_validation_without_head(self, mock_get, mock_head):
+        """oEmbed 404 marks the video as gone even though the watch page would return 200."""
+        from app import validate_url
+
+        mock_get.return_value = MagicMock(status_code=404)
+        is_valid, message = validate_url('https://www.youtube.com/watch?v=gone0000001')
+
+        assert is_valid is False
+        assert '404' in message
+        assert 'oembed' in mock_get.call_args.args[0]
+        mock_head.assert_not_called()
+
+    @patch('app.requests.head')
+    @patch('app.requests.get')
+    def test_oembed_401_falls_back_to_watch_page(self, mock_get, mock_head):
+        """A 401 can mean embedding is disabled, so the watch page decides."""
+        from app import validate_url
+
+        mock_get.return_value = MagicMock(status_code=401)
+        mock_head.return_value = MagicMock(status_code=200)
+        assert validate_url('https://www.youtube.com/watch?v=noembed0001') == (True, 'OK')
+        mock_head.assert_called_once()
+
+    @patch('app.stream_scan')
+    @patch('app.requests.get')
+    def test_title_after_oembed_401_comes_from_watch_page(self, mock_get, mock_scan):
+        """A non-embeddable video still gets its title."""
+        from app import fetch_youtube_title
+
+        mock_get.return_value = MagicMock(status_code=401)
+        mock_scan.return_value = (200, {'title': {0: b'Night of the Living Dead'}})
+        assert fetch_youtube_title('https://youtu.be/noembed0002') == (True, 'Night of the Living Dead')
+
+    @patch('app.stream_scan')
+    def test_embed_page_with_playability_status_is_conclusive(self, mock_scan):
+        """A player verdict on the embed page settles the check without fetching the watch page."""
+        from app import check_age_restriction
+
+        mock_scan.return_value = (200, {'age': {}, 'unavailable': {}, 'playability': {0: b'OK'}})
+        assert check_age_restriction('https://youtu.be/playable001')[0] is False
+        assert mock_scan.call_count == 1
+
+    @patch('app.extract_youtube_duration', return_value='1:30:00')
+    @patch('app.check_age_restriction', return_value=(False, 'No age restrictions detected'))
+    @patch('app.requests.get')
+    def test_probe_fetches_oembed_once(self, mock_get, mock_age, mock_duration):
+        """Title lookup and validation share a single oEmbed response."""
+        from app import probe_video
+
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {'title': 'His Girl Friday'})
+        probe = probe_video('https://www.youtube.com/watch?v=oneoembed01')
+
+        assert probe['title'] == 'His Girl Friday'
+        assert probe['valid'] is True
+        assert mock_get.call_count == 1
+
+    @patch('app.requests.get')
+    def test_title_from_oembed(self, mock_get):
+        """The title comes from the small oEmbed JSON."""
+        from app import fetch_youtube_title
+
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {'title': 'Charade (1963)'})
+        assert fetch_youtube_title('https://youtu.be/char0000001') == (True, 'Charade (1963)')
+        assert mock_get.call_count == 1
+
+
+class TestFakeUpstream:
+    """Test probes against the bundled fake upstream server."""
+
+    @pytest.fixture
+    def upstream(self):
+        import threading
+        from fake_upstream import create_server
+
+        server = create_server(port=0, page_bytes=200 * 1024)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def test_probes_use_configured_base_urls(self, upstream):
+        from app import query_omdb, extract_youtube_duration, validate_url, check_age_restriction
+
+        with patch('app.OMDB_BASE_URL', upstream), patch('app.YOUTUBE_BASE_URL', upstream):
+            success, info = query_omdb('Heat')
+            assert success is True
+            assert info['genre'] == 'Drama'
+
+            assert extract_youtube_duration('https://www.youtube.com/watch?v=abc12345678') is not None
+            assert validate_url('https://www.youtube.com/watch?v=gone0000001')[0] is False
+            assert check_age_restriction('https://www.youtube.com/watch?v=age00000001')[0] is True
+
+
+class TestHTTPDiskCache:
+    """Test the on-disk HTTP response cache."""
+
+    @patch('app.requests.get')
+    def test_fresh_stale_and_replay(self, mock_get, tmp_path):
+        from app import HTTPDiskCache
+        import requests
+
+        mock_get.return_value = MagicMock(status_code=200, content=b'{"Title": "Heat"}',
+                                          headers={'Content-Type': 'application/json', 'ETag': '"v1"'})
+        cache = HTTPDiskCache(str(tmp_path), ttl_seconds=60)
+
+        first = cache.get('http://omdb.test/', params={'t': 'Heat', 'apikey': 'secret'})
+        second = cache.get('http://omdb.test/', params={'t': 'Heat', 'apikey': 'other'})
+        assert first.json() == second.json() == {'Title': 'Heat'}
+        assert mock_get.call_count == 1
+
+        # Stale entries are revalidated with the stored ETag; 304 keeps the cached body
+        cache.ttl_seconds = -1
+        mock_get.return_value = MagicMock(status_code=304, headers={})
+        third = cache.get('http://omdb.test/', params={'t': 'Heat'})
+        assert mock_get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+        assert list(third.iter_content(chunk_size=4))[0] == b'{"Ti'
+
+        replay = HTTPDiskCache(str(tmp_path), replay_only=True)
+        assert replay.get('http://omdb.test/', params={'t': 'Heat'}).status_code == 200
+        with pytest.raises(requests.exceptions.ConnectionError):
+            replay.get('http://omdb.test/', params={'t': 'Missing'})
+
+    @patch('app.requests.get')
+    def test_lowercase_validators_are_revalidated(self, mock_get, tmp_path):
+        """Validators stored under lowercase header names still produce conditional requests."""
+        from app import HTTPDiskCache
+
+        mock_get.return_value = MagicMock(status_code=200, content=b'page',
+                                          headers={'etag': '"v2"', 'last-modified': 'Sun, 18 Oct 2026 10:00:00 GMT'})
+        cache = HTTPDiskCache(str(tmp_path), ttl_seconds=-1)
+        cache.get('http://yt.test/watch?v=lower')
+
+        mock_get.return_value = MagicMock(status_code=304, headers={})
+        assert cache.get('http://yt.test/watch?v=lower').content == b'page'
+        sent = mock_get.call_args.kwargs['headers']
+        assert sent['If-None-Match'] == '"v2"'
+        assert sent['If-Modified-Since'] == 'Sun, 18 Oct 2026 10:00:00 GMT'
+
+    @patch('app.requests.get')
+    def test_size_bound_evicts_oldest(self, mock_get, tmp_path):
+        from app import HTTPDiskCache
+
+        mock_get.return_value = MagicMock(status_code=200, content=b'x' * 600, headers={})
+        cache = HTTPDiskCache(str(tmp_path), max_bytes=1000)
+        cache.get('http://yt.test/watch?v=a')
+        cache.get('http://yt.test/watch?v=b')
+
+        bodies = [name for _, _, files in os.walk(tmp_path) for name in files if name.endswith('.body')]
+        assert len(bodies) == 1
+
+    @patch('app.requests.get')
+    def test_concurrent_stores_stay_within_bound(self, mock_get, tmp_path):
+        from app import HTTPDiskCache
+
+        mock_get.return_value = MagicMock(status_code=200, content=b'x' * 300, headers={})
+        cache = HTTPDiskCache(str(tmp_path), max_bytes=1000)
+        threads = [threading.Thread(target=cache.get, args=(f'http://yt.test/watch?v={i}',)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        sizes = [os.path.getsize(os.path.join(root, name))
+                 for root, _, files in os.walk(tmp_path) for name in files if name.endswith('.body')]
+        assert sum(sizes) <= 1000
+        assert cache._total_bytes == sum(sizes)
+
+    @patch('app.requests.get')
+    def test_auth_errors_are_not_cached(self, mock_get, tmp_path):
+        """A 401 for a bad or rotated key goes to the network every time; a 404 is a real negative."""
+        from app import HTTPDiskCache
+
+        cache = HTTPDiskCache(str(tmp_path), ttl_seconds=60)
+        mock_get.return_value = MagicMock(status_code=401, content=b'{"Error": "Invalid API key!"}', headers={})
+        cache.get('http://omdb.test/', params={'t': 'Heat', 'apikey': 'old'})
+        mock_get.return_value = MagicMock(status_code=200, content=b'{"Title": "Heat"}', headers={})
+        assert cache.get('http://omdb.test/', params={'t': 'Heat', 'apikey': 'new'}).json() == {'Title': 'Heat'}
+
+        mock_get.return_value = MagicMock(status_code=404, content=b'Not Found', headers={})
+        cache.get('http://yt.test/oembed?url=gone')
+        assert cache.get('http://yt.test/oembed?url=gone').status_code == 404
+        assert mock_get.call_count == 3
+
+
+class TestAdaptiveVerification:
+    """Test availability history and the adaptive re-verification schedule."""
+
+    def _insert_movie(self, title):
+        conn = get_db_connection()
+        movie_id = conn.execute('INSERT INTO movies (title, url) VALUES (?, ?)',
+                                (title, 'https://www.youtube.com/watch?v=abcdefghijk')).lastrowid
+        conn.commit()
+        conn.close()
+        return movie_id
+
+    def _check(self, movie_id, available, detail=None):
+        from app import record_availability_check
+
+        conn = get_db_connection()
+        movie = conn.execute('SELECT * FROM movies WHERE id = ?', (movie_id,)).fetchone()
+        next_check = record_availability_check(conn, movie, available, 'probe', detail)
+        conn.commit()
+        conn.close()
+        return (next_check - datetime.now()).total_seconds() / 3600
+
+    def test_stable_results_back_off_and_flips_reset(self, client):
+        """Each repeat of the same result doubles the interval; a flip or first check uses the base interval."""
+        movie_id = self._insert_movie('Backoff Movie')
+        with patch('app.VERIFY_BASE_INTERVAL_HOURS', 10), patch('app.VERIFY_MAX_INTERVAL_DAYS', 2):
+            hours = [self._check(movie_id, True) for _ in range(4)]
+            assert [round(h) for h in hours] == [10, 20, 40, 48]
+            assert round(self._check(movie_id, None, 'Request timeout')) == 10
+            assert round(self._check(movie_id, False)) == 10
+
+        history = json.loads(client.get(f'/api/movies/{movie_id}/availability').data)
+        assert history['verified'] is False and history['stable_streak'] == 0
+        assert [c['available'] for c in history['checks']] == [False, None, True, True, True, True]
+        assert client.get('/api/movies/999999/availability').status_code == 404
+
+    @patch('app.time.sleep')
+    @patch('app.fetch_youtube_video_details', return_value={})
+    @patch('app.validate_url', return_value=(True, 'OK'))
+    def test_due_run_respects_budget_and_order(self, mock_validate, mock_details, mock_sleep, client):
+        """A budgeted run checks never-checked movies first, then flaky ones, and skips movies not yet due."""
+        from app import test_urls_background
+
+        conn = get_db_connection()
+        conn.execute("UPDATE movies SET next_verify_at = '9999-01-01'")
+        conn.commit()
+        conn.close()
+
+        stable, flaky, new = (self._insert_movie(title) for title in ('Stable', 'Flaky', 'New'))
+        for movie_id, streak in ((stable, 5), (flaky, 0)):
+            conn = get_db_connection()
+            conn.execute("UPDATE movies SET verify_streak = ?, next_verify_at = '2000-01-01', last_verified = '2000-01-01' "
+                         "WHERE id = ?", (streak, movie_id))
+            conn.commit()
+            conn.close()
+
+        job = MagicMock()
+        job.should_stop.return_value = False
+        test_urls_background(job, budget=2)
+
+        job.set_total.assert_called_once_with(2)
+        checked = [json.loads(client.get(f'/api/movies/{movie_id}/availability').data)['checks']
+                   for movie_id in (new, flaky, stable)]
+        assert [len(checks) for checks in checked] == [1, 1, 0]
+
+    def test_full_sweep_is_not_answered_with_a_budgeted_pass(self, client):
+        """A full sweep requested during a budgeted pass starts its own job and supersedes the pass."""
+        from app import job_registry
+
+        release = threading.Event()
+
+        def verification(job, budget=None):
+            while not (release.is_set() or job.should_stop()):
+                time.sleep(0.01)
+
+        with patch('app.test_urls_background', side_effect=verification):
+            budgeted = json.loads(client.post('/api/verify-all-movies', json={'due_only': True, 'budget': 5}).data)
+            full = json.loads(client.post('/api/verify-all-movies').data)
+            joined = json.loads(client.post('/api/verify-all-movies', json={'due_only': True}).data)
+            assert job_registry.wait(budgeted['job_id'], timeout=5).status == 'cancelled'
+            release.set()
+            job_registry.wait(full['job_id'], timeout=5)
+
+        assert (budgeted['scope'], budgeted['attached']) == ('due', False)
+        assert (full['scope'], full['attached']) == ('all', False)
+        assert full['job_id'] != budgeted['job_id']
+        assert (joined['scope'], joined['attached'], joined['job_id']) == ('all', True, full['job_id'])
+
+
+class TestUpstreamLedger:
+    """Test the upstream call ledger and OMDb budget planning."""
+
+    @patch('app.requests.get')
+    def test_calls_are_recorded_without_secrets(self, mock_get, client):
+        """http_get records upstream, endpoint, status and bytes; failures are recorded too."""
+        import requests
+        from app import OMDB_BASE_URL, http_get
+
+        mock_get.return_value = MagicMock(status_code=200, content=b'{"Response":"True"}', headers={})
+        http_get(f'{OMDB_BASE_URL}/?i=tt0000001&apikey=secret-key', timeout=5)
+        mock_get.side_effect = requests.exceptions.Timeout('slow')
+        with pytest.raises(requests.exceptions.Timeout):
+            http_get(f'{OMDB_BASE_URL}/?t=Unit+Ledger', timeout=5)
+
+        conn = get_db_connection()
+        rows = conn.execute("SELECT * FROM upstream_calls WHERE upstream = 'omdb' ORDER BY id DESC LIMIT 2").fetchall()
+        conn.close()
+        assert [(row['endpoint'], row['status'], row['bytes']) for row in rows] == [('title', None, None), ('id', 200, 19)]
+        assert all('secret' not in str(dict(row)) for row in rows)
+
+        usage = json.loads(client.get('/api/admin/upstream-usage').data)
+        omdb = {row['endpoint']: row for row in usage['totals'] if row['upstream'] == 'omdb'}
+        assert omdb['title']['errors'] >= 1 and omdb['id']['calls'] >= 1
+        assert usage['omdb_budget']['used_24h'] >= 2
+
+    def test_rolling_window_wait(self, client):
+        """The wait is until enough of the oldest calls leave the 24h window."""
+        from app import upstream_ledger
+
+        upstream = f'unit-{time.time()}'
+        now = datetime.now()
+        conn = get_db_connection()
+        for hours_ago in (23, 22, 1):
+            conn.execute('INSERT INTO upstream_calls (upstream, endpoint, status, cached, called_at) VALUES (?, ?, 200, 0, ?)',
+                         (upstream, 'id', (now - timedelta(hours=hours_ago)).isoformat()))
+        conn.commit()
+        conn.close()
+
+        assert upstream_ledger.used(upstream) == 3
+        assert upstream_ledger.seconds_until_free(upstream, limit=4) == 0
+        assert round(upstream_ledger.seconds_until_free(upstream, limit=3) / 3600) == 1
+        assert round(upstream_ledger.seconds_until_free(upstream, limit=3, calls_needed=2) / 3600) == 2
+        assert upstream_ledger.seconds_until_free(upstream, limit=1, calls_needed=2) is None
+
+    def test_background_refresh_defers_when_budget_is_spent(self, client):
+        """A bulk refresh over budget is deferred without using an attempt; interactive lookups are not gated."""
+        from app import TASK_PRIORITY_BULK, TASK_PRIORITY_INTERACTIVE, run_task
+
+        task = {'id': 1, 'kind': 'refresh_movie_info', 'priority': TASK_PRIORITY_BULK, 'attempts': 1,
+                'payload': {'movie_id': 0, 'title': 'Over Budget', 'imdb_id': 'tt0000002',
+                            'fresh_since': datetime.now().isoformat()}}
+        with patch('app.omdb_bulk_wait', return_value=7200), patch('app.task_queue') as queue, \
+                patch('app.fetch_movie_info_by_id') as fetch:
+            assert run_task(task) is True
+            queue.defer.assert_called_once()
+            assert queue.defer.call_args.args[1] == 7200
+            queue.pause_bulk.assert_called_once_with(7200)
+            fetch.assert_not_called()
+
+            fetch.return_value = (False, 'Movie not found')
+            run_task(dict(task, priority=TASK_PRIORITY_INTERACTIVE))
+            fetch.assert_called_once()
+
+    def test_refresh_pauses_bulk_only_for_transient_failures(self, client):
+        """A miss whose title reads like a rate limit does not pause the bulk lane; a real rate limit does."""
+        from app import OmdbFailure, TASK_PRIORITY_BULK, run_task
+
+        task = {'id': 1, 'kind': 'refresh_movie_info', 'priority': TASK_PRIORITY_BULK, 'attempts': 1,
+                'payload': {'movie_id': 0, 'title': 'Too Many Girls', 'fresh_since': datetime.now().isoformat()}}
+        with patch('app.omdb_bulk_wait', return_value=0), patch('app.OMDB_BULK_DELAY', 0), \
+                patch('app.task_queue') as queue, patch('app.fetch_movie_info') as fetch:
+            fetch.return_value = (False, OmdbFailure("Movie not found: 'Too Many Girls'"))
+            assert run_task(task) is True
+            queue.pause_bulk.assert_not_called()
+
+            fetch.return_value = (False, OmdbFailure('OMDb unavailable: Rate limited (429)', transient=True))
+            assert run_task(task) is False
+            queue.pause_bulk.assert_called_once()
+            queue.fail.assert_called_once()
+
+
+class TestJobLeases:
+    """Test cross-process leases for library-wide jobs."""
+
+    def test_lease_exclusion_expiry_and_takeover(self, client):
+        """Only one owner holds a lease; an expired lease is taken over and its old holder learns it lost it."""
+        from app import JobLeases
+
+        name = f'unit-lease-{time.time()}'
+        first, second = JobLeases(lease_seconds=60), JobLeases(lease_seconds=60)
+        assert first.acquire(name)
+        assert not first.acquire(name)
+        assert not second.acquire(name)
+        assert second.held_elsewhere(name)['owner'] == first.owner
+        assert first.heartbeat(name)
+
+        first.lease_seconds = -1
+        assert first.heartbeat(name)  # renewed with an expiry in the past, as if the process had hung
+        assert second.acquire(name)
+        assert not first.heartbeat(name)
+        first.release(name)
+        assert first.held_elsewhere(name)['owner'] == second.owner
+        second.release(name)
+        assert second.held_elsewhere(name) is None and first.held_elsewhere(name) is None
+
+    def test_library_job_runs_in_one_worker_only(self, client):
+        """With the verify lease held by another worker, requests report it and a queued job does nothing."""
+        from app import JobLeases, job_registry, run_exclusively
+
+        other_worker = JobLeases(lease_seconds=60)
+        assert other_worker.acquire('library:verify')
+        try:
+            data = json.loads(client.post('/api/verify-all-movies').data)
+            assert data['attached'] is True and data['job_id'] is None
+            assert data['running_in'] == other_worker.owner
+
+            target = MagicMock()
+            job = job_registry.submit('unit_exclusive', run_exclusively('library:verify', target))
+            job_registry.wait(job.id, timeout=5)
+            target.assert_not_called()
+            assert job.status == 'skipped' and other_worker.owner in job.error
+        finally:
+            other_worker.release('library:verify')
+
+        target = MagicMock()
+        job = job_registry.submit('unit_exclusive', run_exclusively('library:verify', target))
+        job_registry.wait(job.id, timeout=5)
+        target.assert_called_once_with(job)
+        assert other_worker.held_elsewhere('library:verify') is None
+
+    @pytest.mark.parametrize('lease', ['library:verify:due', 'library:verify'])
+    def test_scheduled_pass_skips_while_another_worker_verifies(self, lease, client):
+        """The timer starts no pass while another worker holds the due-pass or the full-sweep lease."""
+        from app import JobLeases, schedule_verification_sweep
+
+        other_worker = JobLeases(lease_seconds=60)
+        assert other_worker.acquire(lease)
+        try:
+            with patch('app.VERIFY_SCHEDULE_MINUTES', 1), patch('app.threading.Timer') as timer, \
+                    patch('app.start_verification') as start:
+                schedule_verification_sweep()
+                timer.call_args.args[1]()
+                start.assert_not_called()
+                other_worker.release(lease)
+                timer.call_args.args[1]()
+                start.assert_called_once()
+        finally:
+            other_worker.release(lease)
+
+    def test_heartbeat_survives_a_locked_database(self, client):
+        """A failed heartbeat is retried; the job only stops once renewals have failed for a whole lease."""
+        import sqlite3
+        from app import Job, JobLeases, keep_lease_alive
+
+        leases = JobLeases(lease_seconds=0.3)
+        locked = sqlite3.OperationalError('database is locked')
+        with patch('app.job_leases', leases):
+            job, stopped = Job('unit_heartbeat'), threading.Event()
+            with patch.object(leases, 'heartbeat', side_effect=[locked, True, True, True, True]) as beat:
+                thread = threading.Thread(target=keep_lease_alive, args=('unit-hb', job, stopped))
+                thread.start()
+                while beat.call_count < 4:
+                    time.sleep(0.01)
+                stopped.set()
+                thread.join(5)
+            assert not job.should_stop()
+
+            job = Job('unit_heartbeat')
+            with patch.object(leases, 'heartbeat', side_effect=locked):
+                keep_lease_alive('unit-hb', job, threading.Event())
+            assert job.should_stop()
+
+
+class TestJobRegistry:
+    """Test the bounded background job executor and the job status API."""
+
+    def test_job_progress_and_status_api(self, client):
+        """Jobs report progress and timings through /api/jobs."""
+        from app import job_registry
+
+        def work(job):
+            job.set_total(2)
+            job.advance()
+            job.advance(ok=False)
+
+        job = job_registry.submit('unit_test_job', work, source='test')
+        job_registry.wait(job.id, timeout=5)
+
+        response = client.get(f'/api/jobs/{job.id}')
+        data = json.loads(response.data)['job']
+        assert data['status'] == 'succeeded'
+        assert (data['total'], data['done'], data['failed']) == (2, 2, 1)
+        assert data['meta'] == {'source': 'test'}
+        assert data['run_seconds'] is not None
+
+        listed = json.loads(client.get('/api/jobs?status=succeeded').data)['jobs']
+        assert job.id in [entry['id'] for entry in listed]
+        assert client.get('/api/jobs/doesnotexist').status_code == 404
+
+    def test_duplicate_library_job_attaches(self, client):
+        """A second verify request (even via /api/test-urls) joins the running scan."""
+        from app import job_registry
+
+        release = threading.Event()
+        with patch('app.test_urls_background', side_effect=lambda job: release.wait(5)):
+            first = json.loads(client.post('/api/verify-all-movies').data)
+            second = json.loads(client.post('/api/test-urls').data)
+            release.set()
+            job_registry.wait(first['job_id'], timeout=5)
+            third = json.loads(client.post('/api/verify-all-movies').data)
+            job_registry.wait(third['job_id'], timeout=5)
+
+        assert first['attached'] is False
+        assert second['attached'] is True
+        assert second['job_id'] == first['job_id']
+        assert third['job_id'] != first['job_id']
+
+    def test_shutdown_drains_and_rejects(self):
+        """Shutdown lets a running job stop between units and refuses new work."""
+        from app import JobRegistry
+
+        registry = JobRegistry(max_workers=1)
+        started = threading.Event()
+
+        def long_job(job):
+            job.set_total(1000)
+            started.set()
+            while not job.should_stop():
+                job.advance()
+                time.sleep(0.01)
+
+        job = registry.submit('long', long_job)
+        queued = registry.submit('queued', lambda job: None)
+        started.wait(5)
+        registry.shutdown(timeout=5)
+
+        assert job.status == 'cancelled'
+        assert queued.status == 'cancelled'
+        with pytest.raises(RuntimeError):
+            registry.submit('late', lambda job: None)
+
+
+class TestEventStream:
+    """Test the in-process event bus and the /api/events SSE endpoint."""
+
+    def test_bus_fanout_and_replay(self):
+        """Subscribers get live events; a Last-Event-ID replays only newer history."""
+        from app import EventBus
+
+        bus = EventBus(history_size=10)
+        live = bus.subscribe()
+        first = bus.publish('library.changed', {'movie_id': 1})
+        second = bus.publish('job.progress', {'done': 1})
+
+        assert live.get_nowait()['id'] == first['id']
+        assert live.get_nowait()['type'] == 'job.progress'
+
+        replay = bus.subscribe(last_event_id=first['id'])
+        assert replay.get_nowait()['id'] == second['id']
+        assert replay.empty()
+
+        bus.unsubscribe(live)
+        bus.unsubscribe(replay)
+        assert bus.stats() == {'subscribers': 0, 'last_event_id': second['id']}
+
+    def test_job_lifecycle_is_published(self):
+        """Jobs publish start, throttled progress (always the final unit) and finish events."""
+        from app import event_bus, job_registry
+
+        subscriber = event_bus.subscribe()
+        try:
+            def work(job):
+                job.set_total(3)
+                for _ in range(3):
+                    job.advance()
+
+            job = job_registry.submit('evented_job', work)
+            job_registry.wait(job.id, timeout=5)
+
+            events = []
+            while not subscriber.empty():
+                event = subscriber.get_nowait()
+                if event['data'].get('id') == job.id:
+                    events.append(event)
+        finally:
+            event_bus.unsubscribe(subscriber)
+
+        types = [event['type'] for event in events]
+        assert types[0] == 'job.queued' and types[-1] == 'job.finished'
+        assert 'job.started' in types
+        progress = [event['data']['done'] for event in events if event['type'] == 'job.progress']
+        assert progress[-1] == 3
+        assert events[-1]['data']['status'] == 'succeeded'
+
+    def test_sse_endpoint_streams_filtered_frames(self, client):
+        """/api/events replays buffered events as SSE frames, honouring the types filter."""
+        from app import event_bus
+
+        marker = event_bus.publish('job.progress', {'done': 0})
+        event_bus.publish('job.progress', {'done': 1})
+        changed = event_bus.publish('library.changed', {'action': 'deleted', 'movie_id': 7})
+
+        response = client.get('/api/events?types=library', headers={'Last-Event-ID': str(marker['id'])})
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+        chunks = response.iter_encoded()
+        assert next(chunks).startswith(b'retry:')
+        frame = next(chunks).decode()
+        response.close()
+
+        assert frame.startswith(f"id: {changed['id']}\nevent: library.changed\n")
+        assert json.loads(frame.split('data: ', 1)[1]) == {'action': 'deleted', 'movie_id': 7}
+
+
 class TestErrorHandling:
     """Test error handling."""
     